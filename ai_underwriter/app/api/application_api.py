@@ -1,18 +1,53 @@
+import asyncio
 import uuid
+import json
 import logging
 import os # Added
-from flask import Blueprint, request, jsonify
-from app.models.data_models import RestaurantApplication, RiskAssessmentOutput
-from app.core import calculate_risk_score, calculate_premium, make_decision
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from app.models.data_models import RestaurantApplication, RiskAssessmentOutput, RiskFactorBreakdown
+from app.core import (calculate_risk_score, calculate_risk_scores_batch, calculate_premium,
+                      calculate_premiums_batch, make_decision, ruleset_fingerprint, load_risk_rules, set_risk_rules,
+                      UnderwritingConfig, current_config, load_underwriting_config, reload_underwriting_config,
+                      set_underwriting_config)
 # Updated to include SimulatedHealthInspectionClient
-from app.clients import SimulatedHealthInspectionClient, MockCrimeStatisticsClient
+from app.clients import (SimulatedHealthInspectionClient, MockCrimeStatisticsClient, SimulatedCrimeStatisticsClient,
+                         EnrichmentExecutor, TTLCache, CachedHealthInspectionClient, CachedCrimeStatisticsClient,
+                         AsyncCachedHealthInspectionClient, AsyncCachedCrimeStatisticsClient, UpstreamLatency,
+                         SlowUpstreamClient, AsyncSimulatedHealthInspectionClient, AsyncMockCrimeStatisticsClient,
+                         PooledHttpTransport, AsyncPooledHttpTransport, RetryPolicy, HttpHealthInspectionClient,
+                         HttpCrimeStatisticsClient, AsyncHttpHealthInspectionClient, AsyncHttpCrimeStatisticsClient,
+                         CircuitBreaker, CircuitBreakerClient, AsyncCircuitBreakerClient, HedgePolicy, HedgedClient,
+                         AsyncHedgedClient)
+from app.clients.enrichment import AsyncSourceFetcher, SourceFetcher
+from app.utils.address import parse_address
+from app.utils.deadline import Deadline
+from app.utils.file_watcher import FileWatcher
+from app.utils.json_stream import iter_json_records, JsonRecord
+from app.utils.worker_pool import BoundedWorkerPool
+from app.storage import InMemoryApplicationStore, create_store
 
 application_bp = Blueprint('application_api', __name__, url_prefix='/applications')
 logger = logging.getLogger(__name__)
 
-# In-memory storage for MVP
+# In-memory storage for MVP (default). Set APPLICATION_STORE_URL=sqlite:///path/to/store.db for a
+# persistent store that survives restarts and can be shared by several worker processes.
 submitted_applications = {}
 assessment_results = {}
+# Progress of assessments submitted in async mode: {"status": "pending" | "complete" | "failed", ...}
+assessment_status = {}
+
+APPLICATION_STORE_URL = os.environ.get('APPLICATION_STORE_URL')
+if APPLICATION_STORE_URL:
+    application_store = create_store(APPLICATION_STORE_URL)
+else:
+    application_store = InMemoryApplicationStore(submitted_applications, assessment_results, assessment_status)
+
+ASSESSMENT_PENDING = "pending"
+ASSESSMENT_COMPLETE = "complete"
+ASSESSMENT_FAILED = "failed"
 
 # --- Client Instantiation with Environment Variable for API Keys ---
 # For SimulatedHealthInspectionClient, an actual key isn't strictly needed for local file access,
@@ -26,119 +61,385 @@ logger.info(f"HEALTH_API_KEY from environment: {'SET' if HEALTH_API_KEY_FROM_ENV
 CRIME_API_KEY_FROM_ENV = os.environ.get('CRIME_API_KEY')
 logger.info(f"CRIME_API_KEY from environment: {'SET' if CRIME_API_KEY_FROM_ENV else 'NOT SET'}")
 
-# Instantiate the new SimulatedHealthInspectionClient
-# The base_url is also conceptual for the simulated client.
-health_inspection_client = SimulatedHealthInspectionClient(
-    base_url="http://simulated.healthdept.api", # Example base URL, not used by file-based sim
-    api_key=HEALTH_API_KEY_FROM_ENV
-    # data_file_path will use its default from __init__
+# HEALTH_DATA_FILE points the client at another dataset (e.g. an absolute path to a large
+# NDJSON dump); HEALTH_DATA_STREAMING forces streaming loads on or off.
+health_client_options: Dict[str, Any] = {}
+if os.environ.get('HEALTH_DATA_FILE'):
+    health_client_options['data_file_path'] = os.environ['HEALTH_DATA_FILE']
+if os.environ.get('HEALTH_DATA_STREAMING'):
+    health_client_options['streaming'] = os.environ['HEALTH_DATA_STREAMING'].lower() in ('1', 'true', 'yes')
+
+# HEALTH_API_URL / CRIME_API_URL point a source at a remote HTTP API (e.g. app/clients/stand_in_server.py)
+# instead of the local simulated data. Both share one pooled keep-alive transport, and the asyncio path
+# one non-blocking transport with the same settings.
+HEALTH_API_URL = os.environ.get('HEALTH_API_URL')
+CRIME_API_URL = os.environ.get('CRIME_API_URL')
+http_transport_options: Dict[str, Any] = dict(
+    max_connections_per_host=int(os.environ.get('HTTP_MAX_CONNECTIONS_PER_HOST', '10')),
+    connect_timeout=float(os.environ.get('HTTP_CONNECT_TIMEOUT_SECONDS', '1.0')),
+    read_timeout=float(os.environ.get('HTTP_READ_TIMEOUT_SECONDS', '3.0')),
+    retry=RetryPolicy(max_retries=int(os.environ.get('HTTP_MAX_RETRIES', '2')),
+                      backoff_base=float(os.environ.get('HTTP_RETRY_BACKOFF_SECONDS', '0.05')))
 )
+http_transport = PooledHttpTransport(**http_transport_options)
+async_http_transport = AsyncPooledHttpTransport(**http_transport_options)
+
+if HEALTH_API_URL:
+    health_inspection_client = HttpHealthInspectionClient(HEALTH_API_URL, api_key=HEALTH_API_KEY_FROM_ENV,
+                                                          transport=http_transport)
+else:
+    # Instantiate the new SimulatedHealthInspectionClient
+    # The base_url is also conceptual for the simulated client.
+    health_inspection_client = SimulatedHealthInspectionClient(
+        base_url="http://simulated.healthdept.api", # Example base URL, not used by file-based sim
+        api_key=HEALTH_API_KEY_FROM_ENV,
+        keep_violations=False, # Only the precomputed summaries are served
+        **health_client_options
+    )
+    # Picks up a refreshed data file without a restart; 0 disables reloading.
+    HEALTH_DATA_RELOAD_SECONDS = float(os.environ.get('HEALTH_DATA_RELOAD_SECONDS', '0'))
+    if HEALTH_DATA_RELOAD_SECONDS > 0:
+        health_inspection_client.start_auto_reload(HEALTH_DATA_RELOAD_SECONDS)
+
+# CRIME_CLIENT=simulated selects the data-backed client (CRIME_DATA_FILE overrides its dataset);
+# otherwise MockCrimeStatisticsClient remains as is, but now uses env var for its key
+if CRIME_API_URL:
+    crime_statistics_client = HttpCrimeStatisticsClient(CRIME_API_URL, api_key=CRIME_API_KEY_FROM_ENV,
+                                                        transport=http_transport)
+elif os.environ.get('CRIME_CLIENT', 'mock').lower() == 'simulated':
+    crime_client_options: Dict[str, Any] = {}
+    if os.environ.get('CRIME_DATA_FILE'):
+        crime_client_options['data_file_path'] = os.environ['CRIME_DATA_FILE']
+    crime_statistics_client = SimulatedCrimeStatisticsClient(
+        api_key=CRIME_API_KEY_FROM_ENV,
+        radius_m=float(os.environ.get('CRIME_RADIUS_METERS', '500')),
+        **crime_client_options
+    )
+else:
+    crime_statistics_client = MockCrimeStatisticsClient(
+        api_key=CRIME_API_KEY_FROM_ENV
+    )
+
+# The clients holding the source datasets, before any wrapping; a dataset that can change at runtime
+# exposes data_version (see _assessment_cache_key).
+data_sources = {"health": health_inspection_client, "crime": crime_statistics_client}
+
+# Each source sits behind a circuit breaker: once too many recent calls fail or are slow, lookups fail
+# fast (as missing data) for CIRCUIT_OPEN_SECONDS instead of tying up enrichment workers, then a trial
+# call decides whether the source has recovered.
+circuit_breakers = {
+    source: CircuitBreaker(
+        source,
+        failure_rate_threshold=float(os.environ.get('CIRCUIT_FAILURE_RATE', '0.5')),
+        slow_call_seconds=float(os.environ.get('CIRCUIT_SLOW_CALL_SECONDS', '2.0')),
+        slow_call_rate_threshold=float(os.environ.get('CIRCUIT_SLOW_CALL_RATE', '0.5')),
+        window_size=int(os.environ.get('CIRCUIT_WINDOW_SIZE', '20')),
+        min_calls=int(os.environ.get('CIRCUIT_MIN_CALLS', '10')),
+        open_seconds=float(os.environ.get('CIRCUIT_OPEN_SECONDS', '30'))
+    )
+    for source in ("health", "crime")
+}
+health_inspection_client = CircuitBreakerClient(health_inspection_client, circuit_breakers["health"])
+crime_statistics_client = CircuitBreakerClient(crime_statistics_client, circuit_breakers["crime"])
+
+# asyncio counterparts for the ASGI entry point (app/api/asgi.py); they share the sync clients' data.
+# SIMULATED_UPSTREAM_LATENCY_SECONDS (plus up to SIMULATED_UPSTREAM_JITTER_SECONDS) makes every lookup, sync or
+# async, wait like a remote call would, to load test both pipelines against slow sources. 0 (default) adds no delay.
+upstream_latency = UpstreamLatency(
+    seconds=float(os.environ.get('SIMULATED_UPSTREAM_LATENCY_SECONDS', '0')),
+    jitter_seconds=float(os.environ.get('SIMULATED_UPSTREAM_JITTER_SECONDS', '0'))
+)
+# The sync HTTP clients block on their socket, so the asyncio path has clients of its own that await the
+# network on the event loop; they report to the same circuit breakers.
+async_health_source: Any = health_inspection_client
+if HEALTH_API_URL:
+    async_health_source = AsyncCircuitBreakerClient(
+        AsyncHttpHealthInspectionClient(HEALTH_API_URL, api_key=HEALTH_API_KEY_FROM_ENV, transport=async_http_transport),
+        circuit_breakers["health"])
+async_crime_source: Any = crime_statistics_client
+if CRIME_API_URL:
+    async_crime_source = AsyncCircuitBreakerClient(
+        AsyncHttpCrimeStatisticsClient(CRIME_API_URL, api_key=CRIME_API_KEY_FROM_ENV, transport=async_http_transport),
+        circuit_breakers["crime"])
+async_health_inspection_client = AsyncSimulatedHealthInspectionClient(async_health_source, latency=upstream_latency)
+async_crime_statistics_client = AsyncMockCrimeStatisticsClient(async_crime_source, latency=upstream_latency)
+if upstream_latency:
+    health_inspection_client = SlowUpstreamClient(health_inspection_client, upstream_latency)
+    crime_statistics_client = SlowUpstreamClient(crime_statistics_client, upstream_latency)
+
+# HEDGE_REQUESTS=1 sends a duplicate lookup when a source has not answered within HEDGE_PERCENTILE of its
+# recent latencies, and uses whichever answer comes first. At most HEDGE_MAX_FRACTION of lookups are
+# hedged, and none before HEDGE_MIN_SAMPLES latencies are known. Off by default.
+HEDGE_REQUESTS = os.environ.get('HEDGE_REQUESTS', '').lower() in ('1', 'true', 'yes')
+hedge_policies = {
+    source: HedgePolicy(
+        source,
+        percentile=float(os.environ.get('HEDGE_PERCENTILE', '0.95')),
+        max_hedge_fraction=float(os.environ.get('HEDGE_MAX_FRACTION', '0.05')),
+        min_samples=int(os.environ.get('HEDGE_MIN_SAMPLES', '50'))
+    )
+    for source in ("health", "crime")
+}
+# Sync attempts run on one pool shared by both sources. HEDGE_MAX_WORKERS (default 32) covers a primary
+# and a hedge for every worker of the two enrichment pools at their default sizes; when it is exhausted,
+# attempts queue, and callers wait for them no longer than the request deadline.
+hedge_executor: Optional[ThreadPoolExecutor] = None
+if HEDGE_REQUESTS:
+    hedge_executor = ThreadPoolExecutor(max_workers=int(os.environ.get('HEDGE_MAX_WORKERS', '32')),
+                                        thread_name_prefix="hedge")
+    health_inspection_client = HedgedClient(health_inspection_client, hedge_policies["health"], hedge_executor)
+    crime_statistics_client = HedgedClient(crime_statistics_client, hedge_policies["crime"], hedge_executor)
+    async_health_inspection_client = AsyncHedgedClient(async_health_inspection_client, hedge_policies["health"])
+    async_crime_statistics_client = AsyncHedgedClient(async_crime_statistics_client, hedge_policies["crime"])
 
-# MockCrimeStatisticsClient remains as is, but now uses env var for its key
-crime_statistics_client = MockCrimeStatisticsClient(
-    api_key=CRIME_API_KEY_FROM_ENV
+# Repeat lookups for the same business/address are answered from a shared TTL + LRU cache, and
+# concurrent lookups of one business/address share a single upstream call.
+# "Not found" results are kept for the (shorter) negative TTL; ENRICHMENT_CACHE_TTL_SECONDS=0 disables caching.
+ENRICHMENT_CACHE_TTL_SECONDS = float(os.environ.get('ENRICHMENT_CACHE_TTL_SECONDS', '300'))
+ENRICHMENT_CACHE_NEGATIVE_TTL_SECONDS = float(os.environ.get('ENRICHMENT_CACHE_NEGATIVE_TTL_SECONDS', '60'))
+enrichment_cache = TTLCache(
+    max_entries=int(os.environ.get('ENRICHMENT_CACHE_SIZE', '10000')),
+    ttl_seconds=ENRICHMENT_CACHE_TTL_SECONDS
 )
+health_inspection_client = CachedHealthInspectionClient(
+    health_inspection_client, enrichment_cache, negative_ttl_seconds=ENRICHMENT_CACHE_NEGATIVE_TTL_SECONDS)
+crime_statistics_client = CachedCrimeStatisticsClient(
+    crime_statistics_client, enrichment_cache, negative_ttl_seconds=ENRICHMENT_CACHE_NEGATIVE_TTL_SECONDS)
+async_health_inspection_client = AsyncCachedHealthInspectionClient(
+    async_health_inspection_client, enrichment_cache, negative_ttl_seconds=ENRICHMENT_CACHE_NEGATIVE_TTL_SECONDS)
+async_crime_statistics_client = AsyncCachedCrimeStatisticsClient(
+    async_crime_statistics_client, enrichment_cache, negative_ttl_seconds=ENRICHMENT_CACHE_NEGATIVE_TTL_SECONDS)
+# Decides, per source, which answers the assessment cache may build on (see _assess_and_store).
+enrichment_clients = {"health": health_inspection_client, "crime": crime_statistics_client}
+
+# Completed assessments keyed on the application's content, the source dataset versions and the ruleset:
+# resubmitting an identical application returns the stored assessment under the new application ID without
+# enrichment or scoring. Only assessments made with every source's data (or "not found" answer) are kept. Entries expire after
+# ASSESSMENT_CACHE_TTL_SECONDS (default: the enrichment cache TTL, which already bounds how stale remote data
+# may be); 0 disables the cache. Hit rate and evictions are available from assessment_cache.stats().
+assessment_cache = TTLCache(
+    max_entries=int(os.environ.get('ASSESSMENT_CACHE_SIZE', '10000')),
+    ttl_seconds=float(os.environ.get('ASSESSMENT_CACHE_TTL_SECONDS', ENRICHMENT_CACHE_TTL_SECONDS))
+)
+
+# Shared pool that queries all external sources for a submission concurrently.
+# Each source gets its own timeout; a source that fails or times out is treated as missing data.
+ENRICHMENT_TIMEOUT_SECONDS = float(os.environ.get('ENRICHMENT_TIMEOUT_SECONDS', '5.0'))
+enrichment_executor = EnrichmentExecutor(
+    max_workers=int(os.environ.get('ENRICHMENT_MAX_WORKERS', '8')),
+    default_timeout=ENRICHMENT_TIMEOUT_SECONDS,
+    source_timeouts={
+        "health": float(os.environ.get('HEALTH_TIMEOUT_SECONDS', ENRICHMENT_TIMEOUT_SECONDS)),
+        "crime": float(os.environ.get('CRIME_TIMEOUT_SECONDS', ENRICHMENT_TIMEOUT_SECONDS))
+    }
+)
+# Bulk submissions enrich on a pool of their own, so a large upload cannot starve single submissions of
+# workers. Each bulk record gets the same per-source timeouts and its own deadline.
+bulk_enrichment_executor = EnrichmentExecutor(
+    max_workers=int(os.environ.get('BULK_ENRICHMENT_MAX_WORKERS', '8')),
+    default_timeout=ENRICHMENT_TIMEOUT_SECONDS,
+    source_timeouts=enrichment_executor.source_timeouts
+)
+# Budget for a submission's enrichment, from arrival. Every source's timeout is capped at what is left, the
+# HTTP clients bound their reads and retries by it, and once it is spent the remaining sources are skipped
+# (the risk engine applies its missing-data penalty). 0 disables the deadline.
+REQUEST_DEADLINE_SECONDS = float(os.environ.get('REQUEST_DEADLINE_SECONDS', '10'))
 # --- End Client Instantiation ---
 
+# RISK_RULES_FILE replaces the built-in scoring rules (app/core/data/risk_rules.json) with another rule file
+# of the same format. An invalid file stops startup rather than scoring with unintended rules.
+if os.environ.get('RISK_RULES_FILE'):
+    set_risk_rules(load_risk_rules(os.environ['RISK_RULES_FILE']))
+
+# UNDERWRITING_CONFIG_FILE replaces the built-in decision thresholds and premium base rates
+# (app/core/data/underwriting_config.json). With UNDERWRITING_CONFIG_RELOAD_SECONDS > 0 the file is
+# polled and every valid change is swapped in without a restart; an invalid edit is logged and the
+# previous config stays in effect (an invalid file at startup stops startup). Each assessment records the config_version it was made with.
+UNDERWRITING_CONFIG_FILE = os.environ.get('UNDERWRITING_CONFIG_FILE')
+underwriting_config_watcher: Optional[FileWatcher] = None
+if UNDERWRITING_CONFIG_FILE:
+    set_underwriting_config(load_underwriting_config(UNDERWRITING_CONFIG_FILE))
+    UNDERWRITING_CONFIG_RELOAD_SECONDS = float(os.environ.get('UNDERWRITING_CONFIG_RELOAD_SECONDS', '0'))
+    if UNDERWRITING_CONFIG_RELOAD_SECONDS > 0:
+        underwriting_config_watcher = FileWatcher(UNDERWRITING_CONFIG_FILE, reload_underwriting_config,
+                                                  interval=UNDERWRITING_CONFIG_RELOAD_SECONDS,
+                                                  name="underwriting-config-reloader")
+        underwriting_config_watcher.start()
+
+
+REQUIRED_FIELDS = [
+    'business_name', 'address', 'cuisine_type', 'alcohol_sales_percentage',
+    'operating_hours', 'square_footage', 'building_age', 'fire_suppression_system_type',
+    'years_in_business', 'management_experience_years', 'has_delivery_operations',
+    'has_catering_operations', 'seating_capacity', 'annual_revenue',
+    'health_inspection_score', 'previous_claims_count'
+]
+
+# Number of bulk-submitted records validated, enriched and scored together.
+BULK_BATCH_SIZE = int(os.environ.get('BULK_BATCH_SIZE', '50'))
+
+# Background workers for submissions made with ?mode=async. When every worker is busy and
+# the backlog is full, new async submissions are rejected with 503 instead of queueing without limit.
+assessment_worker_pool = BoundedWorkerPool(
+    max_workers=int(os.environ.get('ASSESSMENT_WORKERS', '4')),
+    max_queue=int(os.environ.get('ASSESSMENT_QUEUE_SIZE', '100')),
+    thread_name_prefix="assessment"
+)
 
-@application_bp.route('/submit', methods=['POST'])
-def submit_application():
-    data = request.get_json()
 
+# (HTTP status, JSON payload) of an endpoint, shared by the Flask views and the ASGI routes (app/api/asgi.py).
+EndpointResult = Tuple[int, Dict[str, Any]]
+
+
+class ApplicationInputError(Exception):
+    """Raised when a submitted payload cannot be turned into a RestaurantApplication."""
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def _create_application(data: Any) -> RestaurantApplication:
+    """
+    Validates a submitted payload and builds a RestaurantApplication with a fresh ID.
+    Raises ApplicationInputError describing the problem otherwise.
+    """
     if not data:
         logger.warning("Submit attempt with no input data.")
-        return jsonify({"error": "No input data provided"}), 400
-
-    required_fields = [
-        'business_name', 'address', 'cuisine_type', 'alcohol_sales_percentage',
-        'operating_hours', 'square_footage', 'building_age', 'fire_suppression_system_type',
-        'years_in_business', 'management_experience_years', 'has_delivery_operations',
-        'has_catering_operations', 'seating_capacity', 'annual_revenue',
-        'health_inspection_score', 'previous_claims_count'
-    ]
-    missing_fields = [field for field in required_fields if field not in data]
+        raise ApplicationInputError("No input data provided")
+    if not isinstance(data, dict):
+        logger.warning("Submit attempt with a payload that is not a JSON object.")
+        raise ApplicationInputError("Application data must be a JSON object")
+
+    missing_fields = [field for field in REQUIRED_FIELDS if field not in data]
     if missing_fields:
         logger.warning(f"Submit attempt with missing fields: {missing_fields}")
-        return jsonify({"error": f"Missing required fields: {', '.join(missing_fields)}"}), 400
+        raise ApplicationInputError(f"Missing required fields: {', '.join(missing_fields)}")
 
     application_id = uuid.uuid4().hex
     data_with_id = {**data, 'application_id': application_id}
 
     try:
-        app_data = RestaurantApplication(**data_with_id)
+        return RestaurantApplication(**data_with_id)
     except TypeError as e:
         logger.error(f"Error creating RestaurantApplication for ID {application_id}: {e}", exc_info=True)
-        return jsonify({"error": f"Invalid application data format: {str(e)}"}), 400
+        raise ApplicationInputError(f"Invalid application data format: {str(e)}")
     except Exception as e:
         logger.error(f"Unexpected error during application object creation for ID {application_id}: {e}", exc_info=True)
-        return jsonify({"error": f"An unexpected error occurred during application creation: {str(e)}"}), 500
+        raise ApplicationInputError(f"An unexpected error occurred during application creation: {str(e)}", 500)
+
+
+def register_application(data: Any) -> RestaurantApplication:
+    """
+    Validates a submitted payload and stores it as a new application. Raises
+    ApplicationInputError (carrying the HTTP status) if the payload is not valid.
+    """
+    app_data = _create_application(data)
+    application_store.save_application(app_data.application_id, app_data.to_dict())
+    logger.info("Application %s (%s) stored.", app_data.application_id, app_data.business_name)
+    return app_data
+
+
+def application_response(application_id: str) -> EndpointResult:
+    """(status, payload) of GET /applications/<application_id>."""
+    logger.info(f"Attempting to retrieve raw application data for ID: {application_id}")
+    application_data = application_store.get_application(application_id)
+    if application_data:
+        return 200, application_data
+    logger.warning(f"Raw application data for ID: {application_id} not found.")
+    return 404, {"error": "Application not found"}
+
+
+def assessment_response(application_id: str) -> EndpointResult:
+    """(status, payload) of GET /applications/assessment/<application_id>."""
+    logger.info(f"Attempting to retrieve assessment results for ID: {application_id}")
+    result = application_store.get_assessment(application_id)
+    if result:
+        return 200, RiskAssessmentOutput.from_dict(result).to_dict()
+    status = application_store.get_status(application_id)
+    if status and status["status"] == ASSESSMENT_PENDING:
+        return 202, {"application_id": application_id, **status}
+    if status and status["status"] == ASSESSMENT_FAILED:
+        return 500, {"application_id": application_id, **status}
+    logger.warning(f"Assessment results for ID: {application_id} not found.")
+    return 404, {"error": "Assessment not found for this application ID"}
+
+
+T = TypeVar("T")
+
+
+async def store_call(fn: Callable[..., T], *args: Any) -> T:
+    """
+    Runs fn(*args), which uses application_store, for a coroutine. The in-memory store answers in
+    microseconds and is called directly; a persistent store can wait on disk or on another
+    process's write lock (SQLite's busy_timeout), so its calls run on a thread, leaving the event
+    loop free for the other requests in flight.
+    """
+    if isinstance(application_store, InMemoryApplicationStore):
+        return fn(*args)
+    return await asyncio.to_thread(fn, *args)
 
-    submitted_applications[application_id] = app_data.to_dict()
-    logger.info(f"Application {application_id} ({app_data.business_name}) stored.")
 
-    logger.info(f"Fetching external data for application ID: {application_id}...")
-    health_data_summary = None
+def _assessment_error_response(application_id: str, error: Exception) -> EndpointResult:
+    logger.error(f"Error during assessment process for {application_id}: {error}", exc_info=True)
+    return 500, {"error": f"Error during assessment process: {str(error)}", "application_id": application_id}
+
+
+def assess_submission(app_data: RestaurantApplication, deadline: Optional[Deadline]) -> EndpointResult:
+    """(status, payload) of a synchronous POST /applications/submit for a registered application."""
     try:
-        # SimulatedHealthInspectionClient's get_inspection_data might require city, state, zip
-        # For now, passing them as None if not readily available from app_data.
-        # Modify if app_data.address needs parsing or if these fields are added to RestaurantApplication.
-        health_data_summary = health_inspection_client.get_inspection_data(
-            address=app_data.address,
-            business_name=app_data.business_name,
-            city=None, # Assuming city is not directly in app_data.address for now
-            state=None, # Assuming state is not directly in app_data.address
-            zip_code=None # Assuming zip is not directly in app_data.address
-        )
-        logger.info(f"Health data received for {application_id}: {health_data_summary}")
+        assessment_output = _enrich_and_assess(app_data, deadline)
     except Exception as e:
-        logger.error(f"Error fetching health inspection data for {application_id}: {e}", exc_info=True)
+        return _assessment_error_response(app_data.application_id, e)
+    return 201, assessment_output.to_dict()
+
 
-    crime_data_summary = None
+async def assess_submission_async(app_data: RestaurantApplication, deadline: Optional[Deadline]) -> EndpointResult:
+    """asyncio counterpart of assess_submission, for the ASGI entry point (app/api/asgi.py)."""
     try:
-        crime_data_summary = crime_statistics_client.get_crime_data(
-            address=app_data.address
-        )
-        logger.info(f"Crime data received for {application_id}: {crime_data_summary}")
+        assessment_output = await _enrich_and_assess_async(app_data, deadline)
     except Exception as e:
-        logger.error(f"Error fetching crime statistics data for {application_id}: {e}", exc_info=True)
+        return _assessment_error_response(app_data.application_id, e)
+    return 201, assessment_output.to_dict()
 
-    try:
-        logger.info(f"Calculating risk score for {application_id} with external data...")
-        risk_score = calculate_risk_score(
-            application=app_data,
-            health_data=health_data_summary,
-            crime_data=crime_data_summary
+
+def _health_lookup_arguments(app_data: RestaurantApplication) -> Dict[str, Any]:
+    # The free-text address is parsed (memoized across submissions) into canonical components. Called
+    # inside the health fetcher, so an address that cannot be parsed fails that source, not the request.
+    address = parse_address(app_data.address)
+    return {"address": app_data.address, "business_name": app_data.business_name,
+            "city": address.city, "state": address.state, "zip_code": address.zip_code}
+
+
+def _external_data_fetchers(app_data: RestaurantApplication) -> Dict[str, SourceFetcher]:
+    return {
+        "health": lambda: health_inspection_client.get_inspection_data(**_health_lookup_arguments(app_data)),
+        "crime": lambda: crime_statistics_client.get_crime_data(
+            address=app_data.address
         )
-        logger.info(f"Risk score for {application_id}: {risk_score}")
+    }
 
-        premium_details = calculate_premium(app_data, risk_score)
-        logger.info(f"Premium details for {application_id}: {premium_details}")
 
-        decision = make_decision(risk_score)
-        logger.info(f"Decision for {application_id}: {decision}")
+def _async_external_data_fetchers(app_data: RestaurantApplication) -> Dict[str, AsyncSourceFetcher]:
+    return {
+        "health": lambda: async_health_inspection_client.get_inspection_data(**_health_lookup_arguments(app_data)),
+        "crime": lambda: async_crime_statistics_client.get_crime_data(
+            address=app_data.address
+        )
+    }
 
-    except Exception as e:
-        logger.error(f"Error during assessment process for {application_id}: {e}", exc_info=True)
-        return jsonify({"error": f"Error during assessment process: {str(e)}", "application_id": application_id}), 500
-
-    current_explanation_factors = [
-            f"Calculated risk score: {risk_score:.2f}",
-            f"Decision based on risk score: {decision}",
-            f"Cuisine type ({app_data.cuisine_type}) considered.",
-            f"Years in business ({app_data.years_in_business}) considered.",
-            f"Alcohol sales percentage ({app_data.alcohol_sales_percentage*100}%) considered."
-    ]
-    if health_data_summary and not health_data_summary.get("error"): # Add factor if data is valid
-        current_explanation_factors.append(f"Health score from external source: {health_data_summary.get('latest_score', 'N/A')}")
-    elif health_data_summary and health_data_summary.get("error"):
-         current_explanation_factors.append(f"Health data error: {health_data_summary.get('error')}")
-    if crime_data_summary and not crime_data_summary.get("error"): # Add factor if data is valid
-        current_explanation_factors.append(f"Area crime level from external source: {crime_data_summary.get('crime_level_area', 'N/A')}")
-    elif crime_data_summary and crime_data_summary.get("error"):
-        current_explanation_factors.append(f"Crime data error: {crime_data_summary.get('error')}")
-
-
-    assessment_output = RiskAssessmentOutput(
+
+def _build_assessment_output(
+    app_data: RestaurantApplication,
+    risk_score: float,
+    premium_details: Dict[str, float],
+    decision: str,
+    health_data_summary: Optional[Dict[str, Any]],
+    crime_data_summary: Optional[Dict[str, Any]],
+    factor_breakdown: Optional[RiskFactorBreakdown] = None,
+    config_version: Optional[str] = None
+) -> RiskAssessmentOutput:
+    # explanation_factors is left unset: it is rendered from factor_breakdown on serialization.
+    return RiskAssessmentOutput(
         application_id=app_data.application_id,
         risk_score=risk_score,
         confidence_level=0.70,  # Slightly adjusted placeholder
@@ -150,33 +451,254 @@ def submit_application():
         },
         risk_mitigation_recommendations=["Review safety protocols.", "Ensure compliance with all local health and safety codes."],
         required_documentation=["Copy of valid business license.", "Proof of latest health inspection if available from external source."],
-        explanation_factors=current_explanation_factors,
         health_inspection_summary=health_data_summary,
-        crime_statistics_summary=crime_data_summary
+        crime_statistics_summary=crime_data_summary,
+        factor_breakdown=factor_breakdown,
+        config_version=config_version
     )
 
-    assessment_results[application_id] = assessment_output.to_dict()
-    logger.info(f"Assessment for {application_id} completed and stored.")
 
-    return jsonify(assessment_output.to_dict()), 201
+def _assess_application(
+    app_data: RestaurantApplication,
+    health_data_summary: Optional[Dict[str, Any]],
+    crime_data_summary: Optional[Dict[str, Any]],
+    config: UnderwritingConfig
+) -> RiskAssessmentOutput:
+    application_id = app_data.application_id
+    # Step-by-step tracing is only formatted when DEBUG is enabled.
+    trace = logger.isEnabledFor(logging.DEBUG)
+    if trace:
+        logger.debug("Calculating risk score for %s with external data...", application_id)
+    risk_score, factor_breakdown = calculate_risk_score(
+        application=app_data,
+        health_data=health_data_summary,
+        crime_data=crime_data_summary,
+        return_breakdown=True
+    )
+    if trace:
+        logger.debug("Risk score for %s: %s", application_id, risk_score)
+
+    premium_details = calculate_premium(app_data, risk_score, config)
+    if trace:
+        logger.debug("Premium details for %s: %s", application_id, premium_details)
+
+    decision = make_decision(risk_score, config)
+    if trace:
+        logger.debug("Decision for %s: %s", application_id, decision)
+
+    return _build_assessment_output(app_data, risk_score, premium_details, decision,
+                                    health_data_summary, crime_data_summary, factor_breakdown, config.version)
+
+
+def request_deadline() -> Optional[Deadline]:
+    """A deadline of REQUEST_DEADLINE_SECONDS from now, or None when deadlines are disabled."""
+    return Deadline(REQUEST_DEADLINE_SECONDS) if REQUEST_DEADLINE_SECONDS > 0 else None
+
+
+def _assessment_cache_key(app_data: RestaurantApplication, config: UnderwritingConfig) -> Tuple[Any, ...]:
+    versions = tuple(getattr(source, "data_version", None) for source in data_sources.values())
+    return (app_data.content_hash(), versions, ruleset_fingerprint(config))
+
+
+def _cached_assessment(app_data: RestaurantApplication, cache_key: Tuple[Any, ...]) -> Optional[RiskAssessmentOutput]:
+    """Stores and returns a copy of a cached assessment under app_data's ID, or None on a miss."""
+    found, cached = assessment_cache.get(cache_key)
+    if not found:
+        return None
+    assessment_output = RiskAssessmentOutput.from_dict(cached.to_dict(render_explanations=False))
+    assessment_output.application_id = app_data.application_id
+    application_store.save_assessment(app_data.application_id, assessment_output.to_dict(render_explanations=False))
+    logger.info("Assessment for %s served from the assessment cache.", app_data.application_id)
+    return assessment_output
+
+
+def _enrich_and_assess(app_data: RestaurantApplication, deadline: Optional[Deadline]) -> RiskAssessmentOutput:
+    """
+    Fetches external data within the request's deadline, assesses the application and stores the result,
+    unless an identical application's assessment is cached.
+    """
+    config = current_config() # One config for the whole assessment, even if another is swapped in meanwhile
+    cache_key = _assessment_cache_key(app_data, config)
+    cached = _cached_assessment(app_data, cache_key)
+    if cached is not None:
+        return cached
+    application_id = app_data.application_id
+    logger.debug("Fetching external data for application ID: %s...", application_id)
+    external_data = enrichment_executor.enrich(_external_data_fetchers(app_data), request_label=application_id,
+                                               deadline=deadline)
+    return _assess_and_store(app_data, external_data, cache_key, config)
+
+
+async def _enrich_and_assess_async(app_data: RestaurantApplication, deadline: Optional[Deadline]) -> RiskAssessmentOutput:
+    """
+    asyncio counterpart of _enrich_and_assess: the external lookups are awaited on the
+    event loop, so a request holds no thread while its sources respond.
+    """
+    config = current_config()
+    cache_key = _assessment_cache_key(app_data, config)
+    cached = await store_call(_cached_assessment, app_data, cache_key)
+    if cached is not None:
+        return cached
+    application_id = app_data.application_id
+    logger.debug("Fetching external data for application ID: %s...", application_id)
+    external_data = await enrichment_executor.enrich_async(_async_external_data_fetchers(app_data),
+                                                           request_label=application_id, deadline=deadline)
+    return await store_call(_assess_and_store, app_data, external_data, cache_key, config)
+
+
+def _assess_and_store(app_data: RestaurantApplication, external_data: Dict[str, Optional[Dict[str, Any]]],
+                      cache_key: Tuple[Any, ...], config: UnderwritingConfig) -> RiskAssessmentOutput:
+    assessment_output = _assess_application(app_data, external_data["health"], external_data["crime"], config)
+    application_store.save_assessment(app_data.application_id, assessment_output.to_dict(render_explanations=False))
+    logger.info("Assessment for %s completed and stored.", app_data.application_id)
+    # An assessment missing a source's data (failure, timeout, open circuit) or made with an error answer
+    # (e.g. an invalid API key) is not reused; "not found" answers describe the location and are kept.
+    if all(enrichment_clients[source].is_cacheable(data) for source, data in external_data.items()):
+        assessment_cache.put(cache_key, assessment_output)
+    return assessment_output
+
+
+def _run_async_assessment(app_data: RestaurantApplication) -> None:
+    application_id = app_data.application_id
+    try:
+        _enrich_and_assess(app_data, request_deadline()) # Time spent queued does not count
+    except Exception as e:
+        logger.error(f"Error during assessment process for {application_id}: {e}", exc_info=True)
+        application_store.set_status(application_id, {"status": ASSESSMENT_FAILED,
+                                                      "error": f"Error during assessment process: {str(e)}"})
+        return
+    application_store.set_status(application_id, {"status": ASSESSMENT_COMPLETE})
+
+
+@application_bp.route('/submit', methods=['POST'])
+def submit_application():
+    deadline = request_deadline()
+    data = request.get_json()
+    async_mode = request.args.get('mode') == 'async'
+
+    try:
+        app_data = register_application(data)
+    except ApplicationInputError as e:
+        return jsonify({"error": str(e)}), e.status_code
+    application_id = app_data.application_id
+
+    if async_mode:
+        application_store.set_status(application_id, {"status": ASSESSMENT_PENDING})
+        if not assessment_worker_pool.submit(_run_async_assessment, app_data):
+            application_store.delete_status(application_id)
+            application_store.delete_application(application_id)
+            return jsonify({"error": "Assessment queue is full, please retry later"}), 503
+        logger.info("Assessment for %s queued.", application_id)
+        return jsonify({"application_id": application_id, "status": ASSESSMENT_PENDING}), 202
+
+    status, payload = assess_submission(app_data, deadline)
+    return jsonify(payload), status
+
+
+def _assess_bulk_batch(batch: List[JsonRecord]) -> List[Dict[str, Any]]:
+    """
+    Validates, enriches and scores one batch of bulk records.
+
+    Returns one result per record, in order: the stored assessment, or an error
+    for that record alone. Valid records are enriched together and scored with the
+    vectorized batch functions. If batch scoring fails, each record is scored on its
+    own so that one bad record cannot fail the rest of the batch.
+    """
+    results: Dict[int, Dict[str, Any]] = {}
+    valid: List[Tuple[int, int, RestaurantApplication]] = []
+    # Writes are grouped so a persistent store commits once per batch, not once per record.
+    with application_store.batch():
+        for position, (record_index, payload, parse_error) in enumerate(batch):
+            if parse_error:
+                results[position] = {"record": record_index, "error": parse_error}
+                continue
+            try:
+                app_data = _create_application(payload)
+            except ApplicationInputError as e:
+                results[position] = {"record": record_index, "error": str(e)}
+                continue
+            application_store.save_application(app_data.application_id, app_data.to_dict())
+            valid.append((position, record_index, app_data))
+
+    if valid:
+        applications = [app_data for _, _, app_data in valid]
+        external_data = bulk_enrichment_executor.enrich_many(
+            [(app_data.application_id, _external_data_fetchers(app_data)) for app_data in applications],
+            new_deadline=request_deadline)
+        health_summaries = [data["health"] for data in external_data]
+        crime_summaries = [data["crime"] for data in external_data]
+        config = current_config()
+
+        try:
+            risk_scores, breakdown_columns = calculate_risk_scores_batch(
+                applications, health_summaries, crime_summaries, return_breakdown=True)
+            premiums = calculate_premiums_batch(
+                risk_scores,
+                [app_data.alcohol_sales_percentage for app_data in applications],
+                [app_data.square_footage for app_data in applications],
+                config)
+            outputs = []
+            for i, app_data in enumerate(applications):
+                risk_score = float(risk_scores[i])
+                premium_details = {key: float(values[i]) for key, values in premiums.items()}
+                factor_breakdown = RiskFactorBreakdown(
+                    **{factor: float(column[i]) for factor, column in breakdown_columns.items()})
+                outputs.append(_build_assessment_output(app_data, risk_score, premium_details,
+                                                        make_decision(risk_score, config), health_summaries[i],
+                                                        crime_summaries[i], factor_breakdown, config.version))
+        except Exception as e:
+            logger.warning(f"Batch scoring failed ({e}); scoring {len(applications)} records individually.")
+            outputs = []
+            for i, app_data in enumerate(applications):
+                try:
+                    outputs.append(_assess_application(app_data, health_summaries[i], crime_summaries[i], config))
+                except Exception as record_error:
+                    logger.error(f"Error during assessment process for {app_data.application_id}: {record_error}", exc_info=True)
+                    outputs.append(record_error)
+
+        with application_store.batch():
+            for (position, record_index, app_data), output in zip(valid, outputs):
+                if isinstance(output, Exception):
+                    results[position] = {"record": record_index, "application_id": app_data.application_id,
+                                         "error": f"Error during assessment process: {str(output)}"}
+                    continue
+                application_store.save_assessment(app_data.application_id, output.to_dict(render_explanations=False))
+                results[position] = {"record": record_index, **output.to_dict()}
+
+    return [results[position] for position in range(len(batch))]
+
+
+@application_bp.route('/submit/bulk', methods=['POST'])
+def submit_applications_bulk():
+    """
+    Accepts many applications as NDJSON or as a JSON array and streams back one
+    NDJSON line per record as each batch is assessed. Records are read from the
+    request body lazily, so memory use does not grow with the size of the upload.
+    """
+    records = iter_json_records(request.stream)
+
+    def generate():
+        assessed = 0
+        while True:
+            batch = list(islice(records, BULK_BATCH_SIZE))
+            if not batch:
+                break
+            for result in _assess_bulk_batch(batch):
+                yield json.dumps(result) + "\n"
+            assessed += len(batch)
+        logger.info(f"Bulk submission finished: {assessed} records processed.")
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
 
 @application_bp.route('/<string:application_id>', methods=['GET'])
 def get_application(application_id: str):
-    logger.info(f"Attempting to retrieve raw application data for ID: {application_id}")
-    application_data = submitted_applications.get(application_id)
-    if application_data:
-        return jsonify(application_data), 200
-    logger.warning(f"Raw application data for ID: {application_id} not found.")
-    return jsonify({"error": "Application not found"}), 404
+    status, payload = application_response(application_id)
+    return jsonify(payload), status
 
 @application_bp.route('/assessment/<string:application_id>', methods=['GET'])
 def get_assessment(application_id: str):
-    logger.info(f"Attempting to retrieve assessment results for ID: {application_id}")
-    result = assessment_results.get(application_id)
-    if result:
-        return jsonify(result), 200
-    logger.warning(f"Assessment results for ID: {application_id} not found.")
-    return jsonify({"error": "Assessment not found for this application ID"}), 404
+    status, payload = assessment_response(application_id)
+    return jsonify(payload), status
 
 if not logging.getLogger().hasHandlers():
     logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(name)s - %(message)s')
@@ -0,0 +1,94 @@
+"""
+ASGI entry point serving the application endpoints with the asyncio submit pipeline.
+
+External lookups are awaited on the event loop, so one process keeps many slow
+upstream calls in flight without a thread per request. Scoring and the in-memory
+lookups run on the loop. Calls to a persistent application store (e.g. SQLite,
+which can wait seconds for another writer's lock) run on threads, so they do not
+stall the loop; the in-memory store is called directly (see store_call).
+Run it with any ASGI server, e.g. (from ai_underwriter/):
+
+    uvicorn app.api.asgi:app
+
+Routes, payloads and responses match the Flask blueprint's POST /applications/submit,
+GET /applications/<application_id> and GET /applications/assessment/<application_id>:
+both call the same handler functions of application_api, which return (status, payload).
+"""
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict
+
+from app.api.application_api import (ApplicationInputError, EndpointResult, application_response,
+                                     assess_submission_async, assessment_response, register_application,
+                                     request_deadline, store_call)
+
+logger = logging.getLogger(__name__)
+
+Receive = Callable[[], Awaitable[Dict[str, Any]]]
+Send = Callable[[Dict[str, Any]], Awaitable[None]]
+
+URL_PREFIX = "/applications"
+
+
+async def _read_body(receive: Receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+    return b"".join(chunks)
+
+
+async def _send_json(send: Send, status: int, payload: Dict[str, Any]) -> None:
+    body = json.dumps(payload).encode("utf-8")
+    await send({"type": "http.response.start", "status": status,
+                "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]})
+    await send({"type": "http.response.body", "body": body})
+
+
+async def submit_application(body: bytes) -> EndpointResult:
+    deadline = request_deadline()
+    try:
+        data = json.loads(body) if body else None
+    except ValueError:
+        return 400, {"error": "Request body is not valid JSON"}
+    try:
+        app_data = await store_call(register_application, data)
+    except ApplicationInputError as e:
+        return e.status_code, {"error": str(e)}
+    return await assess_submission_async(app_data, deadline)
+
+
+async def _route(method: str, path: str, receive: Receive) -> EndpointResult:
+    if not path.startswith(URL_PREFIX + "/"):
+        return 404, {"error": "Not found"}
+    parts = path[len(URL_PREFIX) + 1:].split("/")
+    if parts == ["submit"]:
+        if method != "POST":
+            return 405, {"error": "Method not allowed"}
+        return await submit_application(await _read_body(receive))
+    if method != "GET":
+        return 405, {"error": "Method not allowed"}
+    if len(parts) == 1 and parts[0]:
+        return await store_call(application_response, parts[0])
+    if len(parts) == 2 and parts[0] == "assessment" and parts[1]:
+        return await store_call(assessment_response, parts[1])
+    return 404, {"error": "Not found"}
+
+
+async def app(scope: Dict[str, Any], receive: Receive, send: Send) -> None:
+    if scope["type"] == "lifespan":
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+    if scope["type"] != "http":
+        return
+    status, payload = await _route(scope["method"], scope["path"], receive)
+    await _send_json(send, status, payload)
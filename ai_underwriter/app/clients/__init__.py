@@ -1,8 +1,46 @@
 from .health_inspection_client import MockHealthInspectionClient, SimulatedHealthInspectionClient
-from .crime_statistics_client import MockCrimeStatisticsClient
+from .crime_statistics_client import MockCrimeStatisticsClient, SimulatedCrimeStatisticsClient
+from .enrichment import EnrichmentExecutor
+from .caching import (TTLCache, SingleFlight, AsyncSingleFlight, CachedHealthInspectionClient, CachedCrimeStatisticsClient,
+                      AsyncCachedHealthInspectionClient, AsyncCachedCrimeStatisticsClient)
+from .async_clients import (UpstreamLatency, SlowUpstreamClient, AsyncSimulatedHealthInspectionClient,
+                            AsyncMockCrimeStatisticsClient)
+from .http_transport import PooledHttpTransport, AsyncPooledHttpTransport, RetryPolicy, HttpTransportError
+from .http_clients import (HttpHealthInspectionClient, HttpCrimeStatisticsClient, AsyncHttpHealthInspectionClient,
+                           AsyncHttpCrimeStatisticsClient)
+from .circuit_breaker import CircuitBreaker, CircuitBreakerClient, AsyncCircuitBreakerClient, CircuitOpenError
+from .hedging import HedgePolicy, HedgedClient, AsyncHedgedClient
 
 __all__ = [
     'MockHealthInspectionClient',
     'SimulatedHealthInspectionClient',
-    'MockCrimeStatisticsClient'
+    'MockCrimeStatisticsClient',
+    'SimulatedCrimeStatisticsClient',
+    'EnrichmentExecutor',
+    'TTLCache',
+    'SingleFlight',
+    'CachedHealthInspectionClient',
+    'CachedCrimeStatisticsClient',
+    'AsyncSingleFlight',
+    'AsyncCachedHealthInspectionClient',
+    'AsyncCachedCrimeStatisticsClient',
+    'UpstreamLatency',
+    'SlowUpstreamClient',
+    'AsyncSimulatedHealthInspectionClient',
+    'AsyncMockCrimeStatisticsClient',
+    'PooledHttpTransport',
+    'AsyncPooledHttpTransport',
+    'RetryPolicy',
+    'HttpTransportError',
+    'HttpHealthInspectionClient',
+    'HttpCrimeStatisticsClient',
+    'AsyncHttpHealthInspectionClient',
+    'AsyncHttpCrimeStatisticsClient',
+    'CircuitBreaker',
+    'CircuitBreakerClient',
+    'AsyncCircuitBreakerClient',
+    'CircuitOpenError',
+    'HedgePolicy',
+    'HedgedClient',
+    'AsyncHedgedClient'
 ]
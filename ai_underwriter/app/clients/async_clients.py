@@ -0,0 +1,130 @@
+import asyncio
+import logging
+import random
+import time
+from typing import Any, Callable, Dict, Optional
+
+from app.clients.crime_statistics_client import MockCrimeStatisticsClient
+from app.clients.health_inspection_client import SimulatedHealthInspectionClient
+
+logger = logging.getLogger(__name__)
+
+
+class UpstreamLatency:
+    """
+    Stand-in for the round trip to a remote data source.
+
+    Each wait lasts seconds plus a uniformly random jitter of up to jitter_seconds.
+    The local clients answer in microseconds; wrapping them with a latency makes them
+    behave like a slow upstream, so the threaded and asyncio pipelines can be load
+    tested offline. The default of zero adds no delay.
+    """
+
+    def __init__(self, seconds: float = 0.0, jitter_seconds: float = 0.0, rng: Optional[random.Random] = None):
+        self.seconds = seconds
+        self.jitter_seconds = jitter_seconds
+        self._rng = rng or random.Random()
+
+    def __bool__(self) -> bool:
+        return self.seconds > 0 or self.jitter_seconds > 0
+
+    def sample(self) -> float:
+        return self.seconds + (self._rng.random() * self.jitter_seconds if self.jitter_seconds else 0.0)
+
+    def wait(self) -> None:
+        """Blocks the calling thread for one sampled round trip."""
+        delay = self.sample()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def wait_async(self) -> None:
+        """Suspends the calling coroutine for one sampled round trip; the event loop keeps running."""
+        delay = self.sample()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class SlowUpstreamClient:
+    """
+    Sync client wrapper that waits one UpstreamLatency round trip (blocking its
+    thread) before each lookup: the threaded baseline for the asyncio clients below.
+    Other attributes are delegated to the wrapped client.
+    """
+
+    def __init__(self, client: Any, latency: UpstreamLatency):
+        self.client = client
+        self.latency = latency
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.client, name)
+
+    def get_inspection_data(self, business_name: str, address: str, **kwargs: Any) -> Optional[Dict[str, Any]]:
+        self.latency.wait()
+        return self.client.get_inspection_data(business_name=business_name, address=address, **kwargs)
+
+    def get_crime_data(self, address: str, **kwargs: Any) -> Optional[Dict[str, Any]]:
+        self.latency.wait()
+        return self.client.get_crime_data(address=address, **kwargs)
+
+
+async def _call(offload: bool, lookup: Callable[..., Any], **kwargs: Any) -> Optional[Dict[str, Any]]:
+    if asyncio.iscoroutinefunction(lookup):
+        return await lookup(**kwargs)
+    if offload:
+        return await asyncio.to_thread(lookup, **kwargs)
+    return lookup(**kwargs)
+
+
+class AsyncSimulatedHealthInspectionClient:
+    """
+    asyncio counterpart of SimulatedHealthInspectionClient.
+
+    Lookups await the upstream latency and are then answered by a
+    SimulatedHealthInspectionClient: the one passed in (so the sync and async paths
+    share one loaded dataset), or one built from client_options. The in-memory lookup
+    itself takes microseconds and runs on the event loop. A wrapped client whose
+    lookups are coroutines (e.g. AsyncHttpHealthInspectionClient) is awaited. A sync
+    client that blocks on I/O needs offload=True, which runs each lookup on the
+    loop's default thread pool instead. Other attributes (reload(), simulated_data,
+    ...) are delegated to the wrapped client.
+    """
+
+    def __init__(self, client: Optional[SimulatedHealthInspectionClient] = None,
+                 latency: Optional[UpstreamLatency] = None, offload: bool = False, **client_options: Any):
+        self.client = client if client is not None else SimulatedHealthInspectionClient(**client_options)
+        self.latency = latency or UpstreamLatency()
+        self.offload = offload
+        logger.info(f"AsyncSimulatedHealthInspectionClient initialized with upstream latency {self.latency.seconds}s.")
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.client, name)
+
+    async def get_inspection_data(self, business_name: str, address: str, city: Optional[str] = None,
+                                  state: Optional[str] = None, zip_code: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        await self.latency.wait_async()
+        return await _call(self.offload, self.client.get_inspection_data, business_name=business_name,
+                           address=address, city=city, state=state, zip_code=zip_code)
+
+
+class AsyncMockCrimeStatisticsClient:
+    """
+    asyncio counterpart of MockCrimeStatisticsClient.
+
+    Like AsyncSimulatedHealthInspectionClient, lookups await the upstream latency and
+    are then answered by the wrapped sync client, which may also be a
+    SimulatedCrimeStatisticsClient (extra location arguments are passed through).
+    """
+
+    def __init__(self, client: Optional[Any] = None, latency: Optional[UpstreamLatency] = None,
+                 offload: bool = False, **client_options: Any):
+        self.client = client if client is not None else MockCrimeStatisticsClient(**client_options)
+        self.latency = latency or UpstreamLatency()
+        self.offload = offload
+        logger.info(f"AsyncMockCrimeStatisticsClient initialized with upstream latency {self.latency.seconds}s.")
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.client, name)
+
+    async def get_crime_data(self, address: str, **location: Any) -> Optional[Dict[str, Any]]:
+        await self.latency.wait_async()
+        return await _call(self.offload, self.client.get_crime_data, address=address, **location)
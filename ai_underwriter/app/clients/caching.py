@@ -0,0 +1,290 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from app.utils.address import normalize_address_text, parse_address
+from app.utils.deadline import DeadlineExceeded, current_deadline
+from app.utils.read_only import ReadOnlyDict
+
+
+class TTLCache:
+    """
+    Thread-safe cache with per-entry expiry and least-recently-used eviction.
+
+    At most max_entries are kept; adding one more evicts the least recently used
+    entry. Entries expire ttl_seconds after they were stored unless put() is given
+    another ttl. Counters for hits, misses, evictions and expirations are kept for
+    monitoring (see stats()).
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 300.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict() # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """Returns (True, value) for a live entry, else (False, None)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > self._clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, entry[1]
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+            return False, None
+
+    def put(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (self._clock() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+class _Flight:
+    __slots__ = ('done', 'value', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key into one call.
+
+    The first caller for a key runs the function; callers arriving while it is in
+    flight wait for it and receive the same result, or the same exception. Nothing is
+    remembered once the call completes, so the next call for the key runs again.
+    coalesced counts the calls that were served by another caller's flight.
+
+    A waiter waits no longer than its own request deadline (see app/utils/deadline.py)
+    and then raises DeadlineExceeded, so a stuck call does not hold every coalesced
+    caller's thread; the call itself carries on for its own caller.
+    """
+
+    def __init__(self):
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self.coalesced += 1
+        if not leader:
+            deadline = current_deadline()
+            if not flight.done.wait(None if deadline is None else deadline.remaining()):
+                raise DeadlineExceeded("Request deadline passed while waiting for a coalesced lookup")
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+        try:
+            flight.value = fn()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.value
+
+
+class AsyncSingleFlight:
+    """
+    asyncio counterpart of SingleFlight for coroutine functions on one event loop.
+
+    Waiters are shielded from the shared call, so a waiter that is cancelled (e.g. by
+    its own timeout) does not cancel the call for everyone else.
+    """
+
+    def __init__(self):
+        self._flights: Dict[Hashable, "asyncio.Future[Any]"] = {}
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        flight = self._flights.get(key)
+        if flight is not None:
+            self.coalesced += 1
+            return await asyncio.shield(flight)
+        flight = self._flights[key] = asyncio.get_running_loop().create_future()
+        try:
+            value = await fn()
+        except asyncio.CancelledError:
+            flight.cancel()
+            raise
+        except BaseException as e:
+            flight.set_exception(e)
+            flight.exception() # Retrieved here, so an unawaited flight is not reported as unhandled
+            raise
+        finally:
+            del self._flights[key]
+        flight.set_result(value)
+        return value
+
+
+def _key_part(value: Optional[str]) -> Optional[str]:
+    return value.lower() if isinstance(value, str) else value
+
+
+def _address_key(address: str) -> Tuple[str, str]:
+    # The clients match addresses on their normalize_address_text form (health, mock crime) or
+    # on the parsed street and city (simulated crime); keying on both never merges lookups
+    # that a client would answer differently.
+    return normalize_address_text(address), parse_address(address).key
+
+
+class _CachedClient:
+    """
+    Base for client wrappers that answer repeated lookups from a shared TTLCache.
+
+    Successful results are cached for the cache's TTL, "not found" results for
+    negative_ttl_seconds, and any other error (bad key, data not loaded, timeouts
+    raised by the client) is not cached. Cached results are read-only dicts shared
+    between callers. Concurrent misses for the same key share one upstream call
+    (see SingleFlight); an exception it raises reaches every waiting caller and
+    leaves nothing in the cache. Keys include the wrapped client's data_version, if it
+    has one, so entries (negative ones included) are not served once its dataset has
+    been replaced. Other attributes are delegated to the wrapped client.
+    """
+    _NOT_FOUND_ERRORS: Tuple[str, ...] = ()
+
+    def __init__(self, client: Any, cache: TTLCache, negative_ttl_seconds: float = 60.0,
+                 single_flight: Optional[SingleFlight] = None):
+        self.client = client
+        self.cache = cache
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.single_flight = single_flight or SingleFlight()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.client, name)
+
+    def _data_version(self) -> Any:
+        # Entries of a replaced dataset are never looked up again and age out of the LRU.
+        return getattr(self.client, "data_version", None)
+
+    def _cached(self, key: Hashable, fetch: Callable[[], Optional[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+        found, value = self.cache.get(key)
+        if found:
+            return value
+        return self.single_flight.do(key, lambda: self._store(key, fetch()))
+
+    def is_cacheable(self, value: Optional[Dict[str, Any]]) -> bool:
+        """Whether value is an answer this wrapper caches: a result, or a "not found" answer."""
+        if not isinstance(value, dict):
+            return False
+        error = value.get("error")
+        return error is None or error in self._NOT_FOUND_ERRORS
+
+    def _store(self, key: Hashable, value: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        if self.is_cacheable(value):
+            ttl = None if value.get("error") is None else self.negative_ttl_seconds
+            if not isinstance(value, ReadOnlyDict):
+                value = ReadOnlyDict(value)
+            self.cache.put(key, value, ttl)
+        return value
+
+
+class _AsyncCachedClient(_CachedClient):
+    """
+    _CachedClient for asyncio clients, whose lookups are coroutines. Shares the cache
+    (and so the entries) with the sync wrappers; misses are coalesced per event loop.
+    """
+
+    def __init__(self, client: Any, cache: TTLCache, negative_ttl_seconds: float = 60.0,
+                 single_flight: Optional[AsyncSingleFlight] = None):
+        super().__init__(client, cache, negative_ttl_seconds)
+        self.single_flight = single_flight or AsyncSingleFlight()
+
+    async def _cached(self, key: Hashable, fetch: Callable[[], Awaitable[Optional[Dict[str, Any]]]]) -> Optional[Dict[str, Any]]:
+        found, value = self.cache.get(key)
+        if found:
+            return value
+        return await self.single_flight.do(key, lambda: self._fetch_and_store(key, fetch))
+
+    async def _fetch_and_store(self, key: Hashable, fetch: Callable[[], Awaitable[Optional[Dict[str, Any]]]]) -> Optional[Dict[str, Any]]:
+        return self._store(key, await fetch())
+
+
+def _health_key(data_version: Any, business_name: str, address: str, city: Optional[str], state: Optional[str],
+                zip_code: Optional[str]) -> Tuple[Any, ...]:
+    return ("health", data_version, _key_part(business_name), _address_key(address), _key_part(city), _key_part(state), _key_part(zip_code))
+
+
+def _crime_key(data_version: Any, address: str, location: Dict[str, Any]) -> Tuple[Any, ...]:
+    # Extra arguments (e.g. coordinates for SimulatedCrimeStatisticsClient) are part of the key.
+    return ("crime", data_version, _address_key(address), tuple(sorted(location.items())))
+
+
+class CachedHealthInspectionClient(_CachedClient):
+    _NOT_FOUND_ERRORS = ("Establishment not found",)
+
+    def get_inspection_data(self, business_name: str, address: str, city: Optional[str] = None,
+                            state: Optional[str] = None, zip_code: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        return self._cached(_health_key(self._data_version(), business_name, address, city, state, zip_code), lambda: self.client.get_inspection_data(
+            business_name=business_name, address=address, city=city, state=state, zip_code=zip_code))
+
+
+class CachedCrimeStatisticsClient(_CachedClient):
+    _NOT_FOUND_ERRORS = ("Location not found",)
+
+    def get_crime_data(self, address: str, **location: Any) -> Optional[Dict[str, Any]]:
+        return self._cached(_crime_key(self._data_version(), address, location), lambda: self.client.get_crime_data(address=address, **location))
+
+
+class AsyncCachedHealthInspectionClient(_AsyncCachedClient):
+    _NOT_FOUND_ERRORS = CachedHealthInspectionClient._NOT_FOUND_ERRORS
+
+    async def get_inspection_data(self, business_name: str, address: str, city: Optional[str] = None,
+                                  state: Optional[str] = None, zip_code: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        return await self._cached(_health_key(self._data_version(), business_name, address, city, state, zip_code), lambda: self.client.get_inspection_data(
+            business_name=business_name, address=address, city=city, state=state, zip_code=zip_code))
+
+
+class AsyncCachedCrimeStatisticsClient(_AsyncCachedClient):
+    _NOT_FOUND_ERRORS = CachedCrimeStatisticsClient._NOT_FOUND_ERRORS
+
+    async def get_crime_data(self, address: str, **location: Any) -> Optional[Dict[str, Any]]:
+        return await self._cached(_crime_key(self._data_version(), address, location), lambda: self.client.get_crime_data(address=address, **location))
@@ -0,0 +1,195 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+from app.utils.deadline import DeadlineExceeded, current_deadline
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a source whose circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Per-source circuit breaker over a sliding window of the last window_size calls.
+
+    Closed: calls go through and their outcomes are recorded. Once at least
+    min_calls are in the window and either the share of failed calls reaches
+    failure_rate_threshold or the share of calls slower than slow_call_seconds
+    reaches slow_call_rate_threshold, the breaker opens.
+    Open: calls are rejected immediately for open_seconds.
+    Half-open: up to half_open_calls trial calls go through. If they all succeed
+    quickly the breaker closes with an empty window; any failed or slow trial opens
+    it again.
+    """
+
+    def __init__(self, name: str, failure_rate_threshold: float = 0.5, slow_call_seconds: float = 2.0,
+                 slow_call_rate_threshold: float = 0.5, window_size: int = 20, min_calls: int = 10,
+                 open_seconds: float = 30.0, half_open_calls: int = 1, clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+        self._clock = clock
+        self._window: Deque[Tuple[bool, bool]] = deque(maxlen=window_size) # (failed, slow) per call
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._trials_started = 0
+        self._trials_succeeded = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._advance()
+            return self._state
+
+    def _advance(self) -> None:
+        if self._state == OPEN and self._clock() - self._opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+            self._trials_started = 0
+            self._trials_succeeded = 0
+            logger.info(f"Circuit for {self.name} is half-open; trying the source again.")
+
+    def _open(self, reason: str) -> None:
+        self._state = OPEN
+        self._opened_at = self._clock()
+        self._window.clear()
+        logger.warning(f"Circuit for {self.name} opened ({reason}); failing fast for {self.open_seconds}s.")
+
+    def allow(self) -> bool:
+        """Whether a call may go to the source now. Every allowed call must be followed by record()."""
+        with self._lock:
+            self._advance()
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and self._trials_started < self.half_open_calls:
+                self._trials_started += 1
+                return True
+            self.rejected += 1
+            return False
+
+    def record(self, duration: float, failed: bool) -> None:
+        slow = duration >= self.slow_call_seconds
+        with self._lock:
+            if self._state == HALF_OPEN:
+                if failed or slow:
+                    self._open("trial call " + ("failed" if failed else f"took {duration:.2f}s"))
+                    return
+                self._trials_succeeded += 1
+                if self._trials_succeeded >= self.half_open_calls:
+                    self._state = CLOSED
+                    self._window.clear()
+                    logger.info(f"Circuit for {self.name} closed.")
+                return
+            if self._state != CLOSED:
+                return # A call allowed before the breaker opened
+            self._window.append((failed, slow))
+            calls = len(self._window)
+            if calls < self.min_calls:
+                return
+            failure_rate = sum(1 for call_failed, _ in self._window if call_failed) / calls
+            slow_rate = sum(1 for _, call_slow in self._window if call_slow) / calls
+            if failure_rate >= self.failure_rate_threshold:
+                self._open(f"{failure_rate:.0%} of the last {calls} calls failed")
+            elif slow_rate >= self.slow_call_rate_threshold:
+                self._open(f"{slow_rate:.0%} of the last {calls} calls took over {self.slow_call_seconds}s")
+
+    def call(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Calls fn through the breaker: raises CircuitOpenError without calling it when
+        open, and DeadlineExceeded when the current request's deadline has already
+        passed (not counted against the source). A call that raises DeadlineExceeded
+        ran out of its request's budget rather than failing; it is recorded by its
+        duration only, so it counts as slow if it ran past slow_call_seconds.
+        """
+        started = self._start()
+        try:
+            result = fn(*args, **kwargs)
+        except DeadlineExceeded:
+            self.record(self._clock() - started, failed=False)
+            raise
+        except BaseException:
+            self.record(self._clock() - started, failed=True)
+            raise
+        self.record(self._clock() - started, failed=False)
+        return result
+
+    async def call_async(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        call() for a coroutine function. A call cancelled by its caller (a hedge that
+        lost, a source timeout) is recorded by its duration only, like one that
+        raises DeadlineExceeded.
+        """
+        started = self._start()
+        try:
+            result = await fn(*args, **kwargs)
+        except (DeadlineExceeded, asyncio.CancelledError):
+            self.record(self._clock() - started, failed=False)
+            raise
+        except BaseException:
+            self.record(self._clock() - started, failed=True)
+            raise
+        self.record(self._clock() - started, failed=False)
+        return result
+
+    def _start(self) -> float:
+        deadline = current_deadline()
+        if deadline is not None and deadline.expired():
+            raise DeadlineExceeded(f"No time left to query {self.name}")
+        if not self.allow():
+            raise CircuitOpenError(f"Circuit for {self.name} is open")
+        return self._clock()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._advance()
+            return {"state": self._state, "window_calls": len(self._window),
+                    "window_failures": sum(1 for failed, _ in self._window if failed),
+                    "window_slow_calls": sum(1 for _, slow in self._window if slow),
+                    "rejected": self.rejected}
+
+
+class CircuitBreakerClient:
+    """
+    Client wrapper that sends each lookup through a CircuitBreaker. A lookup that
+    raises counts as a failure; error answers such as "not found" are successes.
+    Other attributes are delegated to the wrapped client.
+    """
+
+    def __init__(self, client: Any, breaker: CircuitBreaker):
+        self.client = client
+        self.breaker = breaker
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.client, name)
+
+    def get_inspection_data(self, business_name: str, address: str, **kwargs: Any) -> Optional[Dict[str, Any]]:
+        return self.breaker.call(self.client.get_inspection_data, business_name=business_name, address=address, **kwargs)
+
+    def get_crime_data(self, address: str, **kwargs: Any) -> Optional[Dict[str, Any]]:
+        return self.breaker.call(self.client.get_crime_data, address=address, **kwargs)
+
+
+class AsyncCircuitBreakerClient(CircuitBreakerClient):
+    """CircuitBreakerClient for a client whose lookups are coroutines."""
+
+    async def get_inspection_data(self, business_name: str, address: str, **kwargs: Any) -> Optional[Dict[str, Any]]:
+        return await self.breaker.call_async(self.client.get_inspection_data, business_name=business_name,
+                                             address=address, **kwargs)
+
+    async def get_crime_data(self, address: str, **kwargs: Any) -> Optional[Dict[str, Any]]:
+        return await self.breaker.call_async(self.client.get_crime_data, address=address, **kwargs)
@@ -1,5 +1,28 @@
+import csv
+import json
 import logging
-from typing import Optional, Dict, Any
+import os
+from typing import Optional, Dict, Any, List, Tuple
+from app.utils.address import address_match_text, parse_address
+from app.utils.read_only import ReadOnlyDict
+from app.utils.spatial_index import GridIndex
+
+# Weight of each incident type in an area's crime level and safety score; other types count as 1.
+INCIDENT_WEIGHTS = {"theft": 1.0, "vandalism": 1.0, "assault": 3.0}
+REPORTED_INCIDENT_TYPES = ("theft", "vandalism", "assault")
+# Weighted incident counts within the search radius at which an area becomes Medium / High.
+MEDIUM_CRIME_THRESHOLD = 8.0
+HIGH_CRIME_THRESHOLD = 20.0
+
+_NOT_LOADED_RESPONSE = ReadOnlyDict({"error": "Simulated data not loaded", "source": "simulated_crime_api_internal_error"})
+_NOT_FOUND_RESPONSE = ReadOnlyDict({
+    "error": "Location not found",
+    "crime_level_area": None,
+    "safety_score": None,
+    "source": "simulated_crime_api_not_found"
+})
+# street -> {city (None when the dataset gives none) -> (latitude, longitude)}
+LocationIndex = Dict[str, Dict[Optional[str], Tuple[float, float]]]
 
 class MockCrimeStatisticsClient:
     def __init__(self, api_key: Optional[str] = None):
@@ -15,9 +38,9 @@ class MockCrimeStatisticsClient:
         """
         self.logger.info(f"Fetching mock crime statistics for address: {address}...")
 
-        address_lower = address.lower() # For case-insensitive matching
+        address_lower = address_match_text(address) # Case, punctuation and "Street"/"St" insensitive, whole tokens
 
-        if "123 main st" in address_lower:
+        if " 123 main st " in address_lower:
             self.logger.info(f"Found specific mock crime data for address containing '123 Main St'.")
             return {
                 "crime_level_area": "Low",
@@ -27,7 +50,7 @@ class MockCrimeStatisticsClient:
                 "safety_score": 8.5,  # Arbitrary score
                 "source": "mock_crime_statistics_api"
             }
-        elif "999 danger ave" in address_lower:
+        elif " 999 danger ave " in address_lower:
             self.logger.info(f"Found specific mock crime data for address containing '999 Danger Ave'.")
             return {
                 "crime_level_area": "High",
@@ -48,6 +71,134 @@ class MockCrimeStatisticsClient:
                 "source": "mock_crime_statistics_api"
             }
 
+class SimulatedCrimeStatisticsClient:
+    """
+    Crime statistics computed from a local incident dataset.
+
+    Incidents are held in a grid index (app/utils/spatial_index.py), so counting the
+    incidents within radius_m of a location only visits the surrounding grid cells.
+    A location is given as coordinates, or as an address whose street (and city, when
+    both sides have one) matches one of the dataset's geocoded locations.
+
+    The data file is either JSON, {"locations": [{"address", "latitude", "longitude"}],
+    "incidents": [{"type", "latitude", "longitude"}]}, or a CSV of incidents with
+    type, latitude and longitude columns (addresses then cannot be resolved).
+    """
+
+    def __init__(self, api_key: Optional[str] = None,
+                 data_file_path: str = "ai_underwriter/app/clients/data/simulated_crime_data.json",
+                 radius_m: float = 500.0, cell_size_degrees: float = 0.01):
+        self.api_key = api_key
+        self.radius_m = radius_m
+        self.logger = logging.getLogger(__name__)
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+        if os.path.isabs(data_file_path):
+            self.data_file_path = data_file_path
+        else:
+            self.data_file_path = os.path.join(current_dir, "data", os.path.basename(data_file_path))
+
+        self.locations: LocationIndex = {}
+        self.incident_index = GridIndex(cell_size_degrees=cell_size_degrees)
+        self._load_data(cell_size_degrees)
+        self.logger.info(f"SimulatedCrimeStatisticsClient initialized with {len(self.incident_index)} incidents "
+                         f"and {len(self.locations)} locations from {self.data_file_path}.")
+        if self.api_key:
+            self.logger.info(f"API Key provided: {self.api_key[:4]}... (masked)")
+
+    def _load_data(self, cell_size_degrees: float) -> None:
+        try:
+            if self.data_file_path.lower().endswith(".csv"):
+                locations, incidents = {}, self._read_csv_incidents()
+            else:
+                locations, incidents = self._read_json()
+        except FileNotFoundError:
+            self.logger.error(f"Simulated crime data file not found at {self.data_file_path}.")
+            return
+        except (ValueError, KeyError, TypeError) as e:
+            self.logger.error(f"Error reading simulated crime data from {self.data_file_path}: {e}")
+            return
+        self.locations = locations
+        self.incident_index = GridIndex(incidents, cell_size_degrees=cell_size_degrees)
+
+    def _read_json(self) -> Tuple[LocationIndex, List[Tuple[float, float, str]]]:
+        with open(self.data_file_path, 'r') as f:
+            data = json.load(f)
+        locations: LocationIndex = {}
+        for location in data.get("locations", []):
+            parsed = parse_address(location["address"])
+            locations.setdefault(parsed.street, {}).setdefault(
+                parsed.city, (float(location["latitude"]), float(location["longitude"])))
+        incidents = [(float(incident["latitude"]), float(incident["longitude"]), str(incident["type"]).lower())
+                     for incident in data.get("incidents", [])]
+        return locations, incidents
+
+    def _read_csv_incidents(self) -> List[Tuple[float, float, str]]:
+        with open(self.data_file_path, 'r', newline='') as f:
+            return [(float(row["latitude"]), float(row["longitude"]), row["type"].strip().lower())
+                    for row in csv.DictReader(f)]
+
+    def locate(self, address: str) -> Optional[Tuple[float, float]]:
+        """
+        Returns the coordinates of the address's street. Locations are partitioned by
+        city: when the address names a city, only a location in that city (or one
+        without a city) matches; otherwise the street's first location is used.
+        """
+        parsed = parse_address(address)
+        by_city = self.locations.get(parsed.street)
+        if not by_city:
+            return None
+        if parsed.city is None:
+            return next(iter(by_city.values()))
+        coordinates = by_city.get(parsed.city)
+        return coordinates if coordinates is not None else by_city.get(None)
+
+    def count_incidents(self, latitude: float, longitude: float, radius_m: Optional[float] = None) -> Dict[str, int]:
+        """Counts incidents by type within radius_m (default: the client's radius) of a location."""
+        counts: Dict[str, int] = {}
+        for _, _, incident_type in self.incident_index.query_radius(
+                latitude, longitude, self.radius_m if radius_m is None else radius_m):
+            counts[incident_type] = counts.get(incident_type, 0) + 1
+        return counts
+
+    @staticmethod
+    def _summarize(counts: Dict[str, int]) -> Dict[str, Any]:
+        weighted = sum(INCIDENT_WEIGHTS.get(incident_type, 1.0) * count for incident_type, count in counts.items())
+        if weighted >= HIGH_CRIME_THRESHOLD:
+            crime_level = "High"
+        elif weighted >= MEDIUM_CRIME_THRESHOLD:
+            crime_level = "Medium"
+        else:
+            crime_level = "Low"
+        summary: Dict[str, Any] = {"crime_level_area": crime_level}
+        for incident_type in REPORTED_INCIDENT_TYPES:
+            summary[f"{incident_type}_incidents_last_year_nearby"] = counts.get(incident_type, 0)
+        summary["safety_score"] = round(max(1.0, 10.0 - weighted * 0.25), 1)
+        summary["source"] = "simulated_crime_statistics_api"
+        return summary
+
+    def get_crime_data(self, address: str, latitude: Optional[float] = None,
+                       longitude: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Summarizes crime around a location: incident counts by type within the
+        search radius, an area crime level and a safety score (10 is safest).
+        Coordinates, when given, take precedence over the address.
+        """
+        self.logger.debug("SimulatedCrimeStatisticsClient: Fetching crime statistics for '%s' (%s, %s)...",
+                          address, latitude, longitude)
+        if not len(self.incident_index) and not self.locations:
+            self.logger.warning("No simulated crime data loaded. Cannot provide crime statistics.")
+            return _NOT_LOADED_RESPONSE
+
+        if latitude is None or longitude is None:
+            coordinates = self.locate(address)
+            if coordinates is None:
+                self.logger.info(f"SimulatedCrimeStatisticsClient: Could not locate address '{address}'.")
+                return _NOT_FOUND_RESPONSE
+            latitude, longitude = coordinates
+
+        return self._summarize(self.count_incidents(latitude, longitude))
+
+
 # Example Usage (not part of the module's direct functionality, but for testing)
 if __name__ == '__main__':
     # Ensure basic logging is configured to see output from the client
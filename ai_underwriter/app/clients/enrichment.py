@@ -0,0 +1,193 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple, Any
+
+from app.clients.circuit_breaker import CircuitOpenError
+from app.utils.deadline import Deadline, DeadlineExceeded, deadline_scope
+
+logger = logging.getLogger(__name__)
+
+SourceFetcher = Callable[[], Optional[Dict[str, Any]]]
+AsyncSourceFetcher = Callable[[], Awaitable[Optional[Dict[str, Any]]]]
+
+
+class _Attempt:
+    """One source lookup of one request, from its submission to the pool until it is resolved."""
+    __slots__ = ('index', 'name', 'timeout', 'deadline', 'submitted_at', 'started_at')
+
+    def __init__(self, index: int, name: str, timeout: float, deadline: Optional[Deadline]):
+        self.index = index
+        self.name = name
+        self.timeout = timeout
+        self.deadline = deadline
+        self.submitted_at = time.monotonic()
+        self.started_at: Optional[float] = None # Set by the worker that runs the lookup
+
+    def expires_at(self, now: float) -> float:
+        # The timeout counts from when the lookup starts; until a worker picks it up, the same
+        # timeout bounds the wait in the queue. The deadline, if any, bounds both.
+        expires_at = (self.started_at if self.started_at is not None else self.submitted_at) + self.timeout
+        if self.deadline is not None:
+            expires_at = min(expires_at, now + self.deadline.remaining())
+        return expires_at
+
+
+def _run_within(attempt: _Attempt, fetch: SourceFetcher) -> Optional[Dict[str, Any]]:
+    # Runs on a pool thread, which does not inherit the submitting request's context.
+    attempt.started_at = time.monotonic()
+    if attempt.deadline is not None and attempt.deadline.expired():
+        raise DeadlineExceeded("Request deadline passed while waiting for a worker")
+    with deadline_scope(attempt.deadline):
+        return fetch()
+
+
+async def _run_async(fetch: AsyncSourceFetcher) -> Optional[Dict[str, Any]]:
+    # Calls the fetcher inside the task, so one that raises before returning its awaitable
+    # fails its own source like any other lookup error.
+    return await fetch()
+
+
+def _log_failure(name: str, request_label: str, error: BaseException) -> None:
+    if isinstance(error, (CircuitOpenError, DeadlineExceeded)):
+        # Expected while a source is shed; a traceback per request would only add noise.
+        logger.warning(f"Skipped {name} data for {request_label}: {error}")
+    else:
+        logger.error(f"Error fetching {name} data for {request_label}: {error!r}", exc_info=error)
+
+
+class EnrichmentExecutor:
+    """
+    Fans out lookups against external data sources on a shared, bounded thread pool.
+
+    Every source runs concurrently, so the latency of an enrichment stage is that of
+    its slowest source rather than the sum of all of them. A source that raises or
+    does not answer within its timeout yields None, which the risk engine treats as
+    missing data.
+
+    An optional per-request Deadline caps every source's timeout at the budget left,
+    skips sources once it has passed, and is made current (see app/utils/deadline.py)
+    while a fetcher runs, so clients can bound their own I/O by it.
+    """
+
+    def __init__(self, max_workers: int = 8, default_timeout: float = 5.0,
+                 source_timeouts: Optional[Dict[str, float]] = None, max_in_flight: Optional[int] = None):
+        self.default_timeout = default_timeout
+        self.source_timeouts: Dict[str, float] = dict(source_timeouts or {})
+        self.max_in_flight = max_in_flight or max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="enrichment")
+        logger.info(f"EnrichmentExecutor initialized with {max_workers} workers, default timeout {default_timeout}s.")
+
+    def timeout_for(self, source_name: str) -> float:
+        return self.source_timeouts.get(source_name, self.default_timeout)
+
+    def enrich(self, fetchers: Dict[str, SourceFetcher], request_label: str = "",
+               deadline: Optional[Deadline] = None) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Runs every fetcher concurrently and returns their results keyed by source name.
+
+        Each source's timeout is measured from the moment its lookup starts on a worker;
+        time spent queued behind a saturated pool is bounded by the same timeout, and
+        the deadline, if given, bounds both.
+        """
+        return self.enrich_many([(request_label, fetchers)], deadline=deadline)[0]
+
+    def enrich_many(self, requests: List[Tuple[str, Dict[str, SourceFetcher]]],
+                    deadline: Optional[Deadline] = None,
+                    new_deadline: Optional[Callable[[], Optional[Deadline]]] = None
+                    ) -> List[Dict[str, Optional[Dict[str, Any]]]]:
+        """
+        Enriches several requests at once, e.g. a batch of bulk submissions.
+
+        Takes (request_label, fetchers) pairs and returns one result dict per pair, in order.
+        Lookups are submitted in order, at most max_in_flight at a time, so a large batch
+        does not queue behind itself: every lookup gets its full timeout from when it
+        starts, whatever its position in the batch. deadline, if given, applies to every
+        request; otherwise new_deadline, if given, is called for each request as its first
+        lookup is submitted and gives that request its own deadline.
+        """
+        results: List[Dict[str, Optional[Dict[str, Any]]]] = [{name: None for name in fetchers}
+                                                               for _, fetchers in requests]
+        if deadline is not None and deadline.expired():
+            logger.warning(f"Deadline passed before enrichment; skipping all sources for {len(requests)} request(s).")
+            return results
+        queued = deque((index, name, fetch) for index, (_, fetchers) in enumerate(requests)
+                       for name, fetch in fetchers.items())
+        deadlines: Dict[int, Optional[Deadline]] = {}
+        running: Dict["Future[Optional[Dict[str, Any]]]", _Attempt] = {}
+
+        trace = logger.isEnabledFor(logging.DEBUG)
+        while queued or running:
+            while queued and len(running) < self.max_in_flight:
+                index, name, fetch = queued.popleft()
+                if index not in deadlines:
+                    deadlines[index] = deadline if deadline is not None or new_deadline is None else new_deadline()
+                attempt = _Attempt(index, name, self.timeout_for(name), deadlines[index])
+                running[self._executor.submit(_run_within, attempt, fetch)] = attempt
+
+            now = time.monotonic()
+            next_expiry = min(attempt.expires_at(now) for attempt in running.values())
+            done, _ = wait(running, timeout=max(0.0, next_expiry - now), return_when=FIRST_COMPLETED)
+            for future in done:
+                attempt = running.pop(future)
+                request_label = requests[attempt.index][0]
+                try:
+                    results[attempt.index][attempt.name] = future.result()
+                    if trace:
+                        logger.debug("%s data received for %s: %s", attempt.name, request_label,
+                                     results[attempt.index][attempt.name])
+                except Exception as e:
+                    _log_failure(attempt.name, request_label, e)
+
+            now = time.monotonic()
+            for future, attempt in list(running.items()):
+                if attempt.expires_at(now) > now:
+                    continue
+                # A lookup that has started cannot be interrupted; it finishes on its worker and is ignored.
+                future.cancel()
+                del running[future]
+                request_label = requests[attempt.index][0]
+                if attempt.deadline is not None and attempt.deadline.expired():
+                    logger.error(f"Request deadline passed while fetching {attempt.name} data for {request_label}.")
+                else:
+                    logger.error(f"Timed out after {attempt.timeout}s fetching {attempt.name} data for {request_label}.")
+        return results
+
+    async def enrich_async(self, fetchers: Dict[str, AsyncSourceFetcher], request_label: str = "",
+                           deadline: Optional[Deadline] = None) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        asyncio counterpart of enrich() for coroutine fetchers.
+
+        The fetchers run concurrently on the running event loop instead of the thread
+        pool, so a request waiting on slow sources holds no thread. Timeouts, failures
+        and the deadline are handled as in enrich(): the source's result is None.
+        """
+        if deadline is not None and deadline.expired():
+            logger.warning(f"Deadline passed before enrichment; skipping all sources for {request_label}.")
+            return {name: None for name in fetchers}
+        names = list(fetchers)
+        timeouts = {name: self.timeout_for(name) if deadline is None else deadline.cap(self.timeout_for(name))
+                    for name in names}
+        with deadline_scope(deadline): # Inherited by the tasks gather() creates
+            outcomes = await asyncio.gather(
+                *(asyncio.wait_for(_run_async(fetchers[name]), timeouts[name]) for name in names), return_exceptions=True)
+
+        trace = logger.isEnabledFor(logging.DEBUG)
+        results: Dict[str, Optional[Dict[str, Any]]] = {}
+        for name, outcome in zip(names, outcomes):
+            if isinstance(outcome, asyncio.TimeoutError):
+                logger.error(f"Timed out after {timeouts[name]:.3f}s fetching {name} data for {request_label}.")
+                results[name] = None
+            elif isinstance(outcome, BaseException):
+                _log_failure(name, request_label, outcome)
+                results[name] = None
+            else:
+                results[name] = outcome
+                if trace:
+                    logger.debug("%s data received for %s: %s", name, request_label, outcome)
+        return results
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
@@ -1,7 +1,24 @@
 import logging
-from typing import Optional, Dict, Any, List # Added List
+import threading
+from typing import Optional, Dict, Any, List, Tuple # Added List
 import json # Added
 import os # Added
+from app.clients.health_snapshot import SNAPSHOT_EXTENSION, HealthSnapshot, write_snapshot
+from app.utils.address import address_match_text
+from app.utils.file_watcher import FileSignature, FileWatcher, file_signature
+from app.utils.json_stream import iter_json_records
+from app.utils.keyword_matcher import KeywordMatcher
+from app.utils.read_only import ReadOnlyDict
+
+# Fixed responses are shared and read-only so no call has to build them.
+_INVALID_KEY_RESPONSE = ReadOnlyDict({"error": "Invalid API Key", "source": "simulated_health_api_error"})
+_NOT_LOADED_RESPONSE = ReadOnlyDict({"error": "Simulated data not loaded", "source": "simulated_health_api_internal_error"})
+_NOT_FOUND_RESPONSE = ReadOnlyDict({
+    "error": "Establishment not found",
+    "latest_score": None, # Important for risk engine checks
+    "critical_violations_last_year": None, # Important for risk engine checks
+    "source": "simulated_health_api_not_found"
+})
 
 # --- Existing MockHealthInspectionClient ---
 class MockHealthInspectionClient:
@@ -53,21 +70,56 @@ class MockHealthInspectionClient:
                 "source": "mock_health_department_api_v1"
             }
 
+# Fields of a record that lookups use; streaming loads keep only these.
+_LOOKUP_FIELDS = ('establishment_id', 'business_name', 'search_keywords')
+_STREAMING_EXTENSIONS = ('.ndjson', '.jsonl')
+
+class _HealthDataset:
+    """
+    One loaded version of the simulated data together with everything derived from it.
+    Never modified after construction; a reload builds a new one and swaps it in.
+    """
+    __slots__ = ('records', 'name_index', 'keyword_matcher', 'summaries')
+
+    def __init__(self, records: List[Dict[str, Any]], name_index: Dict[str, int],
+                 keyword_matcher: KeywordMatcher, summaries: List[Dict[str, Any]]):
+        self.records = records
+        self.name_index = name_index
+        self.keyword_matcher = keyword_matcher
+        self.summaries = summaries
+
 # --- New SimulatedHealthInspectionClient ---
 class SimulatedHealthInspectionClient:
     def __init__(self, base_url: Optional[str] = None, api_key: Optional[str] = None,
-                 data_file_path: str = "ai_underwriter/app/clients/data/simulated_health_data.json"):
+                 data_file_path: str = "ai_underwriter/app/clients/data/simulated_health_data.json",
+                 keep_violations: bool = True, streaming: Optional[bool] = None):
         self.logger = logging.getLogger(__name__)
+        # Violation lists are only needed to build summaries; dropping them afterwards saves memory.
+        self.keep_violations = keep_violations
+        # Streaming loads parse one record at a time and keep only the summary and the
+        # lookup fields, for datasets too large to json.load. None enables it for
+        # .ndjson/.jsonl files, which json.load cannot read anyway.
+        self.streaming = streaming if streaming is not None else data_file_path.endswith(_STREAMING_EXTENSIONS)
         self.base_url = base_url if base_url else "http://simulated-health-api.local" # Default if not provided
         self.api_key = api_key if api_key else "SIM_DEFAULT_KEY" # Default if not provided
 
         # Adjust path if necessary, assuming script is run from project root /app
         # If run_tests.py adds /app to sys.path, then this relative path from /app should work.
         # For robustness, construct path relative to this file's directory.
+        # An absolute path (e.g. a large dump stored elsewhere) is used as given.
         current_dir = os.path.dirname(os.path.abspath(__file__))
-        self.data_file_path = os.path.join(current_dir, "data", os.path.basename(data_file_path))
+        if os.path.isabs(data_file_path):
+            self.data_file_path = data_file_path
+        else:
+            self.data_file_path = os.path.join(current_dir, "data", os.path.basename(data_file_path))
 
         self.simulated_data: List[Dict[str, Any]] = []
+        self._dataset = _HealthDataset([], {}, KeywordMatcher(), [])
+        # Incremented whenever a dataset is published, so results derived from the data can tell it changed.
+        self.data_version = 0
+        self._data_signature: FileSignature = None
+        self._reload_lock = threading.Lock()
+        self._watcher: Optional[FileWatcher] = None
         self._load_data()
         self.logger.info(f"SimulatedHealthInspectionClient initialized. Base URL: {self.base_url}, Data File: {self.data_file_path}")
         if self.api_key:
@@ -75,6 +127,7 @@ class SimulatedHealthInspectionClient:
 
 
     def _load_data(self) -> None:
+        dataset: Optional[_HealthDataset] = None
         try:
             # Ensure path is correct when running from tests or main app
             # If run_tests.py is in /app, and it sets CWD or adds to path correctly,
@@ -89,79 +142,145 @@ class SimulatedHealthInspectionClient:
                 else:
                     raise FileNotFoundError(f"Could not find data file at {self.data_file_path} or {alt_path}")
 
-            with open(self.data_file_path, 'r') as f:
-                self.simulated_data = json.load(f)
-            self.logger.info(f"Successfully loaded {len(self.simulated_data)} records from {self.data_file_path}")
+            dataset = self._read_dataset()
         except FileNotFoundError:
             self.logger.error(f"Simulated health data file not found at {self.data_file_path}.")
-            self.simulated_data = []
         except json.JSONDecodeError as e:
             self.logger.error(f"Error decoding JSON from {self.data_file_path}: {e}")
-            self.simulated_data = []
         except Exception as e:
             self.logger.error(f"An unexpected error occurred during data loading: {e}", exc_info=True)
-            self.simulated_data = []
+        self._publish(dataset if dataset is not None else self._index_records([]))
 
-    def _find_establishment_data(self, business_name: str, address: str) -> Optional[Dict[str, Any]]:
-        business_name_lower = business_name.lower()
-        address_lower = address.lower()
+    def _read_dataset(self) -> _HealthDataset:
+        """
+        Reads the data file into a new dataset: a compiled snapshot is mapped as is,
+        JSON and NDJSON files are parsed and indexed.
+        """
+        signature = file_signature(self.data_file_path)
+        if self.data_file_path.endswith(SNAPSHOT_EXTENSION):
+            snapshot = HealthSnapshot(self.data_file_path)
+            dataset = _HealthDataset(snapshot.records, snapshot.name_index, snapshot.keyword_matcher, snapshot.summaries)
+        else:
+            if self.streaming:
+                records, summaries = self._stream_records()
+            else:
+                with open(self.data_file_path, 'r') as f:
+                    records = json.load(f)
+                summaries = None
+                if not isinstance(records, list):
+                    raise ValueError(f"Expected a JSON array of establishments in {self.data_file_path}")
+            dataset = self._index_records(records, summaries)
+        self._data_signature = signature
+        self.logger.info(f"Successfully loaded {len(dataset.records)} records from {self.data_file_path}")
+        return dataset
+
+    def _stream_records(self) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Parses a JSON array or NDJSON file one record at a time, summarizing each
+        record as it is read and keeping only its lookup fields. Peak memory is the
+        retained index plus a single raw record, however large the file.
+        """
+        records: List[Dict[str, Any]] = []
+        summaries: List[Dict[str, Any]] = []
+        with open(self.data_file_path, 'rb') as f:
+            for index, record, error in iter_json_records(f):
+                if error:
+                    raise ValueError(f"Record {index} of {self.data_file_path}: {error}")
+                if not isinstance(record, dict):
+                    raise ValueError(f"Record {index} of {self.data_file_path} is not a JSON object")
+                summaries.append(self._summarize(record))
+                records.append({field: record[field] for field in _LOOKUP_FIELDS if field in record})
+        return records, summaries
+
+    def _build_index(self, records: Optional[List[Dict[str, Any]]] = None) -> None:
+        """Indexes records (by default, simulated_data) and publishes them as the current dataset."""
+        self._publish(self._index_records(self.simulated_data if records is None else records))
+
+    def _index_records(self, records: List[Dict[str, Any]],
+                       summaries: Optional[List[Dict[str, Any]]] = None) -> _HealthDataset:
+        """
+        Builds the lookup structures used by _find_establishment_data and, unless
+        already given, the inspection summary of every record.
 
-        for record in self.simulated_data:
-            if record.get('business_name', '').lower() == business_name_lower:
-                self.logger.debug(f"Found match by business name: {business_name}")
-                return record
-            # Check search keywords against the full address
+        Records are identified by their position in the record list so the index
+        reproduces the linear scan's precedence: the first record (in file order)
+        that matches by name or by address keyword wins.
+        """
+        name_index: Dict[str, int] = {}
+        keywords = []
+        for position, record in enumerate(records):
+            name_index.setdefault(record.get('business_name', '').lower(), position)
             for kw in record.get('search_keywords', []):
-                if kw.lower() in address_lower:
-                    self.logger.debug(f"Found match by address keyword '{kw}' in '{address}' for {record.get('business_name')}")
-                    return record
-        self.logger.debug(f"No match found for {business_name} at {address}")
-        return None
-
-    def get_inspection_data(self, business_name: str, address: str, city: Optional[str]=None, state: Optional[str]=None, zip_code: Optional[str]=None) -> Optional[Dict[str, Any]]:
-        # City, state, zip_code are not used by this simulated client but kept for interface consistency if needed later
-        self.logger.info(f"SimulatedHealthInspectionClient: Fetching health data for '{business_name}' at '{address}' (City: {city}, State: {state}, Zip: {zip_code})...")
-
-        if self.api_key == "INVALID_KEY_TEST":
-            self.logger.warning("Simulated API key is invalid.")
-            return {"error": "Invalid API Key", "source": "simulated_health_api_error"}
-
-        if not self.simulated_data:
-            self.logger.warning("No simulated data loaded. Cannot provide health inspection details.")
-            return {"error": "Simulated data not loaded", "source": "simulated_health_api_internal_error"}
-
-        establishment_data = self._find_establishment_data(business_name, address)
-
-        if not establishment_data:
-            self.logger.info(f"SimulatedHealthInspectionClient: No data found for establishment '{business_name}' in simulated dataset.")
-            # To align with how risk engine handles missing data, return None or specific "not found" structure
-            # For now, returning None to trigger the "missing data penalty" in risk engine.
-            # Or, return a dict that indicates "not found" clearly:
-            return {
-                "error": "Establishment not found",
-                "latest_score": None, # Important for risk engine checks
-                "critical_violations_last_year": None, # Important for risk engine checks
-                "source": "simulated_health_api_not_found"
-            }
-            # return None # This would also work if risk engine handles None from client
+                keywords.append((address_match_text(kw), position))
+        if summaries is None:
+            summaries = [self._summarize(record) for record in records]
+        if not self.keep_violations:
+            self._drop_violations(records)
+        self.logger.info(f"Indexed {len(name_index)} business names and {len(keywords)} address keywords.")
+        return _HealthDataset(records, name_index, KeywordMatcher(keywords), summaries)
+
+    def _publish(self, dataset: _HealthDataset) -> None:
+        # A single reference assignment publishes the new dataset. Lookups read
+        # self._dataset once, so they see the old or the new version, never a mix.
+        self._dataset = dataset
+        self.simulated_data = dataset.records
+        self.data_version += 1
+
+    def write_snapshot(self, path: str) -> None:
+        """
+        Compiles the current dataset into a snapshot file (see health_snapshot.py),
+        which later clients can load with data_file_path=<path> instead of parsing JSON.
+        """
+        dataset = self._dataset
+        records = [{field: record[field] for field in _LOOKUP_FIELDS if field in record} for record in dataset.records]
+        write_snapshot(path, records, dataset.summaries, dataset.name_index, dataset.keyword_matcher.tables())
+        self.logger.info(f"Wrote snapshot of {len(records)} records to {path}")
 
+    def reload(self) -> bool:
+        """
+        Re-reads the data file and swaps in the new dataset. Lookups keep using the
+        current dataset while the new one is built and are never blocked. If the
+        file cannot be read, the current dataset stays in place and False is returned.
+        """
+        with self._reload_lock:
+            try:
+                dataset = self._read_dataset()
+            except (OSError, ValueError) as e:
+                self.logger.error(f"Reload of {self.data_file_path} failed, keeping the current data: {e}")
+                return False
+            self._publish(dataset)
+            return True
+
+    def start_auto_reload(self, interval: float = 5.0) -> None:
+        """Reloads the data in the background whenever the data file's mtime or size changes."""
+        if self._watcher is not None:
+            return
+        self._watcher = FileWatcher(self.data_file_path, lambda path: self.reload(), interval=interval,
+                                    signature=self._data_signature, name="health-data-reloader")
+        self._watcher.start()
+
+    def stop_auto_reload(self) -> None:
+        if self._watcher is not None:
+            self._watcher.stop()
+            self._watcher = None
+
+    @staticmethod
+    def _summarize(establishment_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Builds the read-only summary returned by get_inspection_data for one record.
+        The dataset is static between loads, so this runs once per record at load time.
+        """
         last_insp = establishment_data.get("last_inspection", {})
         violations = last_insp.get("violations", [])
 
-        # Calculate critical violations from the *last inspection's* list of violations.
-        # The JSON also has "historical_summary.critical_violations_last_12_months" which might be more appropriate.
-        # Let's use the historical_summary if available, else count from last inspection.
+        # Prefer historical_summary.critical_violations_last_12_months; fall back to
+        # counting critical violations in the last inspection.
         historical_summary = establishment_data.get("historical_summary", {})
         critical_violations_count = historical_summary.get("critical_violations_last_12_months")
-
-        if critical_violations_count is None: # Fallback to counting from last inspection
+        if critical_violations_count is None:
             critical_violations_count = sum(1 for v in violations if v.get("severity") == "Critical")
-            self.logger.info(f"Used fallback critical violation count from last inspection: {critical_violations_count}")
-        else:
-            self.logger.info(f"Used historical critical violation count: {critical_violations_count}")
-
 
-        summary = {
+        return ReadOnlyDict({
             "latest_score": last_insp.get("score"),
             "last_inspection_date": last_insp.get("inspection_date"),
             "critical_violations_last_year": critical_violations_count,
@@ -170,8 +289,62 @@ class SimulatedHealthInspectionClient:
             "all_violations_count_last_inspection": len(violations), # Example of additional derived data
             "source": "simulated_health_api_v2", # Differentiate source
             "establishment_id_debug": establishment_data.get("establishment_id") # For debugging
-        }
-        self.logger.info(f"SimulatedHealthInspectionClient: Returning data for '{business_name}': {summary}")
+        })
+
+    @staticmethod
+    def _drop_violations(records: List[Dict[str, Any]]) -> None:
+        """Removes the raw violation lists, which are no longer needed once summaries are built."""
+        for record in records:
+            last_insp = record.get("last_inspection")
+            if isinstance(last_insp, dict) and "violations" in last_insp:
+                record["last_inspection"] = {key: value for key, value in last_insp.items() if key != "violations"}
+
+    def _find_establishment_position(self, dataset: _HealthDataset, business_name: str, address: str) -> Optional[int]:
+        name_position = dataset.name_index.get(business_name.lower())
+        # Keywords were indexed in the same canonical form, so "Street"/"St" etc. match alike,
+        # and only on whole tokens.
+        keyword_position = dataset.keyword_matcher.best_match(address_match_text(address))
+
+        if name_position is not None and (keyword_position is None or name_position <= keyword_position):
+            self.logger.debug("Found match by business name: %s", business_name)
+            return name_position
+        if keyword_position is not None:
+            self.logger.debug("Found match by address keyword in '%s'", address)
+            return keyword_position
+        self.logger.debug("No match found for %s at %s", business_name, address)
+        return None
+
+    def _find_establishment_data(self, business_name: str, address: str) -> Optional[Dict[str, Any]]:
+        dataset = self._dataset
+        position = self._find_establishment_position(dataset, business_name, address)
+        return dataset.records[position] if position is not None else None
+
+    def get_inspection_data(self, business_name: str, address: str, city: Optional[str]=None, state: Optional[str]=None, zip_code: Optional[str]=None) -> Optional[Dict[str, Any]]:
+        """
+        Returns the precomputed, read-only inspection summary for the establishment.
+        Copy it (e.g. dict(summary)) before modifying.
+        """
+        # City, state, zip_code are not used by this simulated client but kept for interface consistency if needed later
+        self.logger.debug("SimulatedHealthInspectionClient: Fetching health data for '%s' at '%s' (City: %s, State: %s, Zip: %s)...",
+                          business_name, address, city, state, zip_code)
+
+        if self.api_key == "INVALID_KEY_TEST":
+            self.logger.warning("Simulated API key is invalid.")
+            return _INVALID_KEY_RESPONSE
+
+        dataset = self._dataset # Read once: a concurrent reload may swap it
+        if not dataset.records:
+            self.logger.warning("No simulated data loaded. Cannot provide health inspection details.")
+            return _NOT_LOADED_RESPONSE
+
+        position = self._find_establishment_position(dataset, business_name, address)
+        if position is None:
+            self.logger.info(f"SimulatedHealthInspectionClient: No data found for establishment '{business_name}' in simulated dataset.")
+            # The "not found" summary has no score, which the risk engine treats as missing health data.
+            return _NOT_FOUND_RESPONSE
+
+        summary = dataset.summaries[position]
+        self.logger.debug("SimulatedHealthInspectionClient: Returning data for '%s': %s", business_name, summary)
         return summary
 
 # Example Usage (for SimulatedHealthInspectionClient)
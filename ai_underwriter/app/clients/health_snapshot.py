@@ -0,0 +1,247 @@
+"""
+Compiled, memory-mapped snapshots of the simulated health inspection dataset.
+
+A snapshot holds the compact lookup records, the precomputed summaries and a
+prebuilt name/keyword index in flat arrays. Opening one maps the file read-only and
+serves lookups straight from the mapping: nothing is parsed at startup, and worker
+processes that open the same file share its physical pages.
+
+Compile a snapshot from a JSON or NDJSON dataset (from the ai_underwriter directory):
+    python -m app.clients.health_snapshot <dataset.json> <dataset.snapshot>
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import zlib
+from array import array
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from app.utils.keyword_matcher import FlatKeywordMatcher, TABLE_NAMES
+from app.utils.read_only import ReadOnlyDict
+
+SNAPSHOT_EXTENSION = ".snapshot"
+FORMAT_VERSION = 3 # 2: address keywords are stored in normalize_address_text form; 3: in address_match_text form
+
+_MAGIC = b"HLTHSNAP"
+_BYTEORDER = {"little": 1, "big": 2}
+# magic, format version, byte order of the arrays, empty keyword priority (-1 for none), keyword count, record count
+_HEADER = struct.Struct("<8sIIqQQ")
+_SECTION = struct.Struct("<QQ") # offset, length in bytes
+_ALIGNMENT = 8
+
+# Every section, in file order, with the array typecode of its items ("B" for raw bytes).
+_SECTIONS = (
+    ("record_offsets", "Q"), ("records", "B"),
+    ("summary_offsets", "Q"), ("summaries", "B"),
+    ("name_offsets", "Q"), ("names", "B"), ("name_positions", "I"), ("name_table", "I"),
+    ("fail", "I"), ("best", "i"), ("edge_start", "I"), ("edge_chars", "I"), ("edge_targets", "I"),
+)
+
+
+class SnapshotError(ValueError):
+    """Raised when a file is not a snapshot this version can read."""
+
+
+def _name_hash(name: bytes) -> int:
+    # Python's hash() is randomized per process, so the table uses a stable hash.
+    return zlib.crc32(name)
+
+
+def _blob_sections(items: Sequence[Any]) -> Tuple[array, bytes]:
+    offsets = array("Q", [0])
+    chunks = []
+    for item in items:
+        chunk = json.dumps(item, separators=(",", ":")).encode("utf-8")
+        chunks.append(chunk)
+        offsets.append(offsets[-1] + len(chunk))
+    return offsets, b"".join(chunks)
+
+
+def write_snapshot(path: str, records: Sequence[Dict[str, Any]], summaries: Sequence[Mapping[str, Any]],
+                   name_index: Mapping[str, int], keyword_tables: Dict[str, Any]) -> None:
+    """
+    Writes a snapshot of an indexed dataset: records and their summaries (aligned by
+    position), the lowercased-name -> position index and KeywordMatcher.tables().
+
+    The file is written next to path and renamed into place, so a process watching
+    or mapping path never sees a partial snapshot.
+    """
+    names = list(name_index.items())
+    name_offsets = array("Q", [0])
+    name_chunks = []
+    for name, _ in names:
+        encoded = name.encode("utf-8")
+        name_chunks.append(encoded)
+        name_offsets.append(name_offsets[-1] + len(encoded))
+
+    # Open addressing with linear probing; a slot holds name id + 1, or 0 when empty.
+    capacity = 1
+    while capacity < 2 * len(names):
+        capacity *= 2
+    name_table = array("I", [0] * capacity)
+    for name_id, encoded in enumerate(name_chunks):
+        slot = _name_hash(encoded) & (capacity - 1)
+        while name_table[slot]:
+            slot = (slot + 1) & (capacity - 1)
+        name_table[slot] = name_id + 1
+
+    record_offsets, record_blob = _blob_sections(records)
+    summary_offsets, summary_blob = _blob_sections([dict(summary) for summary in summaries])
+    empty_priority = keyword_tables["empty_keyword_priority"]
+    contents = {
+        "record_offsets": record_offsets, "records": record_blob,
+        "summary_offsets": summary_offsets, "summaries": summary_blob,
+        "name_offsets": name_offsets, "names": b"".join(name_chunks),
+        "name_positions": array("I", [position for _, position in names]), "name_table": name_table,
+        **{name: array(typecode, keyword_tables[name]) for name, typecode in _SECTIONS if name in TABLE_NAMES},
+    }
+
+    directory = os.path.dirname(os.path.abspath(path))
+    handle, temp_path = tempfile.mkstemp(dir=directory, prefix=".snapshot-")
+    try:
+        with os.fdopen(handle, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, FORMAT_VERSION, _BYTEORDER[sys.byteorder],
+                                 -1 if empty_priority is None else empty_priority,
+                                 keyword_tables["keyword_count"], len(records)))
+            directory_offset = f.tell()
+            f.write(b"\0" * (_SECTION.size * len(_SECTIONS)))
+            sections = []
+            for name, _ in _SECTIONS:
+                f.write(b"\0" * (-f.tell() % _ALIGNMENT))
+                offset = f.tell()
+                data = contents[name]
+                f.write(data.tobytes() if isinstance(data, array) else data)
+                sections.append(_SECTION.pack(offset, f.tell() - offset))
+            f.seek(directory_offset)
+            f.write(b"".join(sections))
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+class _BlobSequence(Sequence):
+    """Read-only sequence of JSON values decoded on access from a blob section."""
+
+    def __init__(self, buffer: mmap.mmap, offsets: memoryview, base: int, wrap=None):
+        self._buffer = buffer
+        self._offsets = offsets
+        self._base = base
+        self._wrap = wrap
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(len(self)))]
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError("snapshot record index out of range")
+        value = json.loads(self._buffer[self._base + self._offsets[position]:self._base + self._offsets[position + 1]])
+        return self._wrap(value) if self._wrap else value
+
+    def __iter__(self) -> Iterator[Any]:
+        for position in range(len(self)):
+            yield self[position]
+
+
+class _NameIndex:
+    """Lowercased business name -> first record position, served from the snapshot's hash table."""
+
+    def __init__(self, buffer: mmap.mmap, offsets: memoryview, names_base: int,
+                 positions: memoryview, table: memoryview):
+        self._buffer = buffer
+        self._offsets = offsets
+        self._names_base = names_base
+        self._positions = positions
+        self._table = table
+        self._mask = len(table) - 1
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def _name(self, name_id: int) -> bytes:
+        return self._buffer[self._names_base + self._offsets[name_id]:self._names_base + self._offsets[name_id + 1]]
+
+    def get(self, name: str, default: Optional[int] = None) -> Optional[int]:
+        encoded = name.encode("utf-8")
+        slot = _name_hash(encoded) & self._mask
+        while True:
+            entry = self._table[slot]
+            if not entry:
+                return default
+            if self._name(entry - 1) == encoded:
+                return self._positions[entry - 1]
+            slot = (slot + 1) & self._mask
+
+    def items(self) -> Iterator[Tuple[str, int]]:
+        for name_id in range(len(self)):
+            yield self._name(name_id).decode("utf-8"), self._positions[name_id]
+
+
+class HealthSnapshot:
+    """
+    A snapshot file mapped read-only. records, summaries, name_index and
+    keyword_matcher expose the same lookups as an in-memory dataset.
+
+    The mapping stays open for as long as this object (or any of those views) is
+    referenced, so a dataset swapped out by a reload keeps serving in-flight lookups.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < _HEADER.size:
+                raise SnapshotError(f"{path} is too small to be a health data snapshot")
+            self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, byteorder, empty_priority, keyword_count, record_count = _HEADER.unpack_from(self._buffer)
+        if magic != _MAGIC:
+            raise SnapshotError(f"{path} is not a health data snapshot")
+        if version != FORMAT_VERSION:
+            raise SnapshotError(f"{path} has snapshot format version {version}; this build reads version {FORMAT_VERSION}")
+        if byteorder != _BYTEORDER[sys.byteorder]:
+            raise SnapshotError(f"{path} was compiled on a machine with a different byte order")
+
+        view = memoryview(self._buffer)
+        sections: Dict[str, Any] = {}
+        for index, (name, typecode) in enumerate(_SECTIONS):
+            offset, length = _SECTION.unpack_from(self._buffer, _HEADER.size + index * _SECTION.size)
+            if offset + length > len(self._buffer):
+                raise SnapshotError(f"{path} is truncated")
+            sections[name] = offset if typecode == "B" else view[offset:offset + length].cast(typecode)
+
+        self.record_count = record_count
+        self.records = _BlobSequence(self._buffer, sections["record_offsets"], sections["records"])
+        self.summaries = _BlobSequence(self._buffer, sections["summary_offsets"], sections["summaries"], ReadOnlyDict)
+        self.name_index = _NameIndex(self._buffer, sections["name_offsets"], sections["names"],
+                                     sections["name_positions"], sections["name_table"])
+        self.keyword_matcher = FlatKeywordMatcher(
+            keyword_count, None if empty_priority < 0 else empty_priority,
+            *(sections[name] for name in TABLE_NAMES))
+        if len(self.records) != record_count or len(self.summaries) != record_count:
+            raise SnapshotError(f"{path} is inconsistent: expected {record_count} records")
+
+
+def main(argv: List[str]) -> int:
+    if len(argv) != 2:
+        print(__doc__.strip().splitlines()[-1].strip())
+        return 2
+    # Imported here: the client imports this module to read snapshots.
+    from app.clients.health_inspection_client import SimulatedHealthInspectionClient
+    source, target = (os.path.abspath(path) for path in argv)
+    client = SimulatedHealthInspectionClient(data_file_path=source, streaming=True)
+    if not client.simulated_data:
+        print(f"No records loaded from {source}", file=sys.stderr)
+        return 1
+    client.write_snapshot(target)
+    print(f"Wrote {len(client.simulated_data)} records to {target}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
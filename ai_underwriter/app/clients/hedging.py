@@ -0,0 +1,220 @@
+import asyncio
+import contextvars
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, wait
+from typing import Any, Callable, Dict, Optional
+
+from app.utils.deadline import Deadline, DeadlineExceeded, current_deadline
+from app.utils.quantile import P2Quantile
+
+logger = logging.getLogger(__name__)
+
+Lookup = Callable[..., Optional[Dict[str, Any]]]
+
+
+class HedgePolicy:
+    """
+    When to send a duplicate ("hedged") request to one source, and how many.
+
+    Latencies of successful lookups are tracked with a streaming P² estimator of the
+    given percentile. To follow recent behavior the estimator is replaced every
+    window_size observations; the delay comes from the last complete window (or the
+    current one until the first window fills). No hedge is sent before min_samples
+    latencies are known.
+
+    Hedges are budgeted with a token bucket: each request adds max_hedge_fraction of
+    a token (up to burst tokens) and each hedge spends one, so over time at most
+    that fraction of requests is hedged and a slow spell cannot double the load on
+    a source that is already struggling.
+    """
+
+    def __init__(self, name: str, percentile: float = 0.95, max_hedge_fraction: float = 0.05,
+                 min_samples: int = 50, window_size: int = 1000, min_delay_seconds: float = 0.001,
+                 burst: float = 10.0):
+        self.name = name
+        self.percentile = percentile
+        self.max_hedge_fraction = max_hedge_fraction
+        self.min_samples = min_samples
+        self.window_size = window_size
+        self.min_delay_seconds = min_delay_seconds
+        self.burst = burst
+        self._current = P2Quantile(percentile)
+        self._previous: Optional[P2Quantile] = None
+        self._tokens = 0.0
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.hedges = 0
+        self.hedges_won = 0
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self._current.add(seconds)
+            if self._current.count >= self.window_size:
+                self._previous, self._current = self._current, P2Quantile(self.percentile)
+
+    def hedge_delay(self) -> Optional[float]:
+        """How long to wait for an answer before hedging; None while too few latencies are known."""
+        with self._lock:
+            estimator = self._previous or self._current
+            if estimator.count < self.min_samples:
+                return None
+            return max(self.min_delay_seconds, estimator.value())
+
+    def request_started(self) -> None:
+        with self._lock:
+            self.requests += 1
+            self._tokens = min(self.burst, self._tokens + self.max_hedge_fraction)
+
+    def try_hedge(self) -> bool:
+        """Spends a hedge token; False when the budget is used up."""
+        with self._lock:
+            if self._tokens < 1.0:
+                return False
+            self._tokens -= 1.0
+            self.hedges += 1
+            return True
+
+    def hedge_won(self) -> None:
+        with self._lock:
+            self.hedges_won += 1
+
+    def stats(self) -> Dict[str, Any]:
+        delay = self.hedge_delay()
+        with self._lock:
+            return {"requests": self.requests, "hedges": self.hedges, "hedges_won": self.hedges_won,
+                    "hedge_rate": self.hedges / self.requests if self.requests else 0.0,
+                    f"p{round(self.percentile * 100)}_seconds": delay}
+
+
+def _remaining(deadline: Optional[Deadline]) -> Optional[float]:
+    return None if deadline is None else deadline.remaining()
+
+
+class HedgedClient:
+    """
+    Client wrapper that hedges slow lookups.
+
+    A lookup runs on executor; if it has not answered within the policy's hedge
+    delay and the hedge budget allows, the same lookup is sent again and the first
+    successful answer is returned (an error is only raised when both attempts fail).
+    The losing attempt is left to finish in the background and its answer dropped.
+    Until the policy knows enough latencies, lookups run directly on the caller's
+    thread. The caller's context (e.g. the request deadline) is passed to both
+    attempts, and the caller waits for them no longer than that deadline allows
+    (DeadlineExceeded is raised then). Attempts run on executor, which clients may
+    share (the API gives all of them one pool of HEDGE_MAX_WORKERS threads); without
+    one, each client gets a pool of its own. Other attributes are delegated to the
+    wrapped client.
+    """
+
+    def __init__(self, client: Any, policy: HedgePolicy, executor: Optional[ThreadPoolExecutor] = None):
+        self.client = client
+        self.policy = policy
+        self.executor = executor or ThreadPoolExecutor(max_workers=16, thread_name_prefix=f"hedge-{policy.name}")
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.client, name)
+
+    def get_inspection_data(self, business_name: str, address: str, **kwargs: Any) -> Optional[Dict[str, Any]]:
+        return self._hedged(self.client.get_inspection_data, business_name=business_name, address=address, **kwargs)
+
+    def get_crime_data(self, address: str, **kwargs: Any) -> Optional[Dict[str, Any]]:
+        return self._hedged(self.client.get_crime_data, address=address, **kwargs)
+
+    def _timed(self, lookup: Lookup, **kwargs: Any) -> Optional[Dict[str, Any]]:
+        started = time.monotonic()
+        result = lookup(**kwargs)
+        self.policy.observe(time.monotonic() - started)
+        return result
+
+    def _submit(self, lookup: Lookup, kwargs: Dict[str, Any]) -> "Future[Optional[Dict[str, Any]]]":
+        return self.executor.submit(contextvars.copy_context().run, self._timed, lookup, **kwargs)
+
+    def _hedged(self, lookup: Lookup, **kwargs: Any) -> Optional[Dict[str, Any]]:
+        self.policy.request_started()
+        delay = self.policy.hedge_delay()
+        if delay is None:
+            return self._timed(lookup, **kwargs)
+
+        deadline = current_deadline()
+        primary = self._submit(lookup, kwargs)
+        answered = wait([primary], timeout=delay if deadline is None else deadline.cap(delay)).done
+        if not answered and not (deadline is not None and deadline.expired()) and self.policy.try_hedge():
+            logger.debug("Hedging %s lookup after %.3fs.", self.policy.name, delay)
+            hedge = self._submit(lookup, kwargs)
+            pending = {primary, hedge}
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = wait(pending, timeout=_remaining(deadline), return_when=FIRST_COMPLETED)
+                if not done:
+                    raise DeadlineExceeded(f"Request deadline passed while waiting for a hedged {self.policy.name} lookup")
+                for future in done:
+                    if future.exception() is None:
+                        if future is hedge:
+                            self.policy.hedge_won()
+                        return future.result()
+                    error = future.exception()
+            raise error
+        try:
+            return primary.result(timeout=_remaining(deadline))
+        except FuturesTimeoutError:
+            raise DeadlineExceeded(f"Request deadline passed while waiting for a {self.policy.name} lookup") from None
+
+
+class AsyncHedgedClient:
+    """
+    asyncio counterpart of HedgedClient for the async clients: the attempts are
+    tasks on the running loop and the losing one is cancelled.
+    """
+
+    def __init__(self, client: Any, policy: HedgePolicy):
+        self.client = client
+        self.policy = policy
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.client, name)
+
+    async def get_inspection_data(self, business_name: str, address: str, **kwargs: Any) -> Optional[Dict[str, Any]]:
+        return await self._hedged(self.client.get_inspection_data, business_name=business_name, address=address, **kwargs)
+
+    async def get_crime_data(self, address: str, **kwargs: Any) -> Optional[Dict[str, Any]]:
+        return await self._hedged(self.client.get_crime_data, address=address, **kwargs)
+
+    async def _timed(self, lookup: Callable[..., Any], **kwargs: Any) -> Optional[Dict[str, Any]]:
+        started = time.monotonic()
+        result = await lookup(**kwargs)
+        self.policy.observe(time.monotonic() - started)
+        return result
+
+    async def _hedged(self, lookup: Callable[..., Any], **kwargs: Any) -> Optional[Dict[str, Any]]:
+        self.policy.request_started()
+        delay = self.policy.hedge_delay()
+        if delay is None:
+            return await self._timed(lookup, **kwargs)
+
+        primary = asyncio.ensure_future(self._timed(lookup, **kwargs))
+        attempts = {primary}
+        try:
+            done, _ = await asyncio.wait(attempts, timeout=delay)
+            if not done and self.policy.try_hedge():
+                logger.debug("Hedging %s lookup after %.3fs.", self.policy.name, delay)
+                hedge = asyncio.ensure_future(self._timed(lookup, **kwargs))
+                attempts.add(hedge)
+                pending = set(attempts)
+                error: Optional[BaseException] = None
+                while pending:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        if task.exception() is None:
+                            if task is hedge:
+                                self.policy.hedge_won()
+                            return task.result()
+                        error = task.exception()
+                raise error
+            return await primary
+        finally:
+            for task in attempts:
+                if not task.done():
+                    task.cancel()
@@ -0,0 +1,88 @@
+import logging
+from typing import Any, Dict, Optional
+
+from app.clients.http_transport import AsyncPooledHttpTransport, HttpTransportError, PooledHttpTransport
+
+# Statuses whose JSON body is a regular client answer ({"error": ...}), as the simulated clients return them.
+_ANSWER_STATUSES = (200, 401, 403, 404)
+
+
+class _HttpClient:
+    """
+    Base for clients of a remote JSON API over a shared PooledHttpTransport.
+
+    The API key is sent in the X-API-Key header. 200 responses and the error
+    answers of _ANSWER_STATUSES (invalid key, not found) are returned as the
+    decoded body, in the same shape the simulated clients return. Anything else
+    raises HttpTransportError once the transport has given up retrying, which the
+    enrichment stage treats as missing data.
+    """
+
+    transport_class: type = PooledHttpTransport
+
+    def __init__(self, base_url: str, api_key: Optional[str] = None, transport: Optional[Any] = None):
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.transport = transport or self.transport_class()
+        self.logger = logging.getLogger(__name__)
+        self.logger.info(f"{type(self).__name__} initialized. Base URL: {self.base_url}")
+
+    def _headers(self) -> Optional[Dict[str, str]]:
+        return {"X-API-Key": self.api_key} if self.api_key else None
+
+    def _answer(self, path: str, status: int, payload: Any) -> Dict[str, Any]:
+        if status not in _ANSWER_STATUSES or not isinstance(payload, dict):
+            raise HttpTransportError(f"Unexpected response from {self.base_url}{path}: {status}", status)
+        return payload
+
+    def _get(self, path: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        status, payload = self.transport.get_json(self.base_url + path, params, headers=self._headers())
+        return self._answer(path, status, payload)
+
+
+class _AsyncHttpClient(_HttpClient):
+    """_HttpClient over a shared AsyncPooledHttpTransport; lookups are coroutines."""
+
+    transport_class = AsyncPooledHttpTransport
+
+    async def _get(self, path: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        status, payload = await self.transport.get_json(self.base_url + path, params, headers=self._headers())
+        return self._answer(path, status, payload)
+
+
+class HttpHealthInspectionClient(_HttpClient):
+    """SimulatedHealthInspectionClient's interface, answered by GET {base_url}/inspections."""
+
+    def get_inspection_data(self, business_name: str, address: str, city: Optional[str] = None,
+                            state: Optional[str] = None, zip_code: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        self.logger.debug("HttpHealthInspectionClient: Fetching health data for '%s' at '%s'...", business_name, address)
+        return self._get("/inspections", {"business_name": business_name, "address": address,
+                                          "city": city, "state": state, "zip_code": zip_code})
+
+
+class HttpCrimeStatisticsClient(_HttpClient):
+    """MockCrimeStatisticsClient's interface, answered by GET {base_url}/crime."""
+
+    def get_crime_data(self, address: str, latitude: Optional[float] = None,
+                       longitude: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        self.logger.debug("HttpCrimeStatisticsClient: Fetching crime statistics for '%s'...", address)
+        return self._get("/crime", {"address": address, "latitude": latitude, "longitude": longitude})
+
+
+class AsyncHttpHealthInspectionClient(_AsyncHttpClient):
+    """HttpHealthInspectionClient for the asyncio pipeline: the same GET, awaited."""
+
+    async def get_inspection_data(self, business_name: str, address: str, city: Optional[str] = None,
+                                  state: Optional[str] = None, zip_code: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        self.logger.debug("AsyncHttpHealthInspectionClient: Fetching health data for '%s' at '%s'...", business_name, address)
+        return await self._get("/inspections", {"business_name": business_name, "address": address,
+                                                "city": city, "state": state, "zip_code": zip_code})
+
+
+class AsyncHttpCrimeStatisticsClient(_AsyncHttpClient):
+    """HttpCrimeStatisticsClient for the asyncio pipeline: the same GET, awaited."""
+
+    async def get_crime_data(self, address: str, latitude: Optional[float] = None,
+                             longitude: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        self.logger.debug("AsyncHttpCrimeStatisticsClient: Fetching crime statistics for '%s'...", address)
+        return await self._get("/crime", {"address": address, "latitude": latitude, "longitude": longitude})
@@ -0,0 +1,438 @@
+import asyncio
+import http.client
+import json
+import logging
+import random
+import socket
+import ssl
+import threading
+import time
+import weakref
+from typing import Any, Awaitable, Dict, List, Optional, Tuple, TypeVar
+from urllib.parse import urlencode, urlsplit
+
+from app.utils.deadline import Deadline, DeadlineExceeded, current_deadline
+
+logger = logging.getLogger(__name__)
+
+# Response statuses worth retrying: the upstream is overloaded or briefly unavailable.
+RETRYABLE_STATUSES = (429, 502, 503, 504)
+
+# Failures of one attempt that are retried. asyncio.TimeoutError and IncompleteReadError (an EOFError)
+# are the asyncio transport's read timeouts and truncated responses.
+_ATTEMPT_ERRORS = (OSError, http.client.HTTPException, ValueError, EOFError, asyncio.TimeoutError)
+# A pooled connection the server closed while it sat idle fails with one of these on reuse.
+_STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+
+T = TypeVar("T")
+
+
+class HttpTransportError(Exception):
+    """Raised when a request fails for good: retries exhausted, a timeout, or an unusable response."""
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+class RetryPolicy:
+    """
+    How often and how long to wait before retrying a failed request.
+
+    Retries use exponential backoff with full jitter: before retry n (1-based) the
+    transport sleeps a uniformly random time in [0, min(backoff_max, backoff_base * 2**(n-1))],
+    so clients that failed together do not retry in lockstep.
+    """
+
+    def __init__(self, max_retries: int = 2, backoff_base: float = 0.05, backoff_max: float = 1.0,
+                 retry_statuses: Tuple[int, ...] = RETRYABLE_STATUSES, rng: Optional[random.Random] = None):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_statuses = retry_statuses
+        self._rng = rng or random.Random()
+
+    def backoff(self, retry: int) -> float:
+        return self._rng.uniform(0.0, min(self.backoff_max, self.backoff_base * 2 ** (retry - 1)))
+
+
+class _HostPool:
+    """
+    Keep-alive connections to one host. At most max_connections are open at once;
+    callers beyond that wait up to pool_timeout for one to be released. Idle
+    connections are reused most recently released first.
+    """
+
+    def __init__(self, scheme: str, host: str, port: int, max_connections: int):
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self._slots = threading.BoundedSemaphore(max_connections)
+        self._idle: List[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+        self.connections_opened = 0
+
+    def acquire(self, pool_timeout: float, connect_timeout: float) -> Tuple[http.client.HTTPConnection, bool]:
+        """Returns (connection, reused). The connection must be given back with release()."""
+        if not self._slots.acquire(timeout=pool_timeout):
+            raise HttpTransportError(f"No connection to {self.host}:{self.port} became free within {pool_timeout}s")
+        with self._lock:
+            if self._idle:
+                return self._idle.pop(), True
+        try:
+            return self._connect(connect_timeout), False
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def _connect(self, connect_timeout: float) -> http.client.HTTPConnection:
+        connection_class = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+        connection = connection_class(self.host, self.port, timeout=connect_timeout)
+        connection.connect()
+        connection.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with self._lock:
+            self.connections_opened += 1
+        return connection
+
+    def release(self, connection: http.client.HTTPConnection, reusable: bool) -> None:
+        if reusable:
+            with self._lock:
+                self._idle.append(connection)
+        else:
+            connection.close()
+        self._slots.release()
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            connection.close()
+
+
+class _TransportBase:
+    """Settings, counters and the request and retry decisions shared by the sync and asyncio transports."""
+
+    def __init__(self, max_connections_per_host: int = 10, connect_timeout: float = 1.0,
+                 read_timeout: float = 3.0, pool_timeout: Optional[float] = None,
+                 retry: Optional[RetryPolicy] = None, keep_alive: bool = True,
+                 headers: Optional[Dict[str, str]] = None):
+        self.max_connections_per_host = max_connections_per_host
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.pool_timeout = pool_timeout if pool_timeout is not None else connect_timeout + read_timeout
+        self.retry = retry or RetryPolicy()
+        self.keep_alive = keep_alive
+        self.headers = {"Accept": "application/json", **(headers or {})}
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.retries = 0
+
+    def _prepare(self, url: str, params: Optional[Dict[str, Any]],
+                 headers: Optional[Dict[str, str]]) -> Tuple[str, str, int, str, Dict[str, str]]:
+        """Returns (scheme, host, port, request target, headers) for a GET of url with params."""
+        parts = urlsplit(url)
+        scheme = parts.scheme or "http"
+        port = parts.port or (443 if scheme == "https" else 80)
+        query = {key: value for key, value in (params or {}).items() if value is not None}
+        target = (parts.path or "/") + ("?" + urlencode(query) if query else "")
+        request_headers = {**self.headers, **(headers or {})}
+        if not self.keep_alive:
+            request_headers["Connection"] = "close"
+        return scheme, parts.hostname or "localhost", port, target, request_headers
+
+    def _check_deadline(self, url: str, deadline: Optional[Deadline]) -> None:
+        if deadline is not None and deadline.expired():
+            raise DeadlineExceeded(f"GET {url} abandoned: request deadline passed")
+
+    def _retry_delay(self, url: str, failure: Exception, retry: int, deadline: Optional[Deadline]) -> float:
+        """
+        Called after attempt retry + 1 failed. Returns how long to back off before the
+        next attempt. Raises HttpTransportError when retries are exhausted, and
+        DeadlineExceeded when the request deadline cut the attempt short (every wait
+        is capped at it, so it has passed by the time a capped wait times out) or
+        leaves no time for the retry: the source is not to blame for those.
+        """
+        if deadline is not None and deadline.expired():
+            raise DeadlineExceeded(f"GET {url} cut short by the request deadline: {failure!r}") from failure
+        if retry >= self.retry.max_retries:
+            if isinstance(failure, HttpTransportError):
+                raise failure
+            raise HttpTransportError(f"GET {url} failed: {failure!r}") from failure
+        with self._lock:
+            self.retries += 1
+        delay = self.retry.backoff(retry + 1)
+        if deadline is not None and delay >= deadline.remaining():
+            raise DeadlineExceeded(f"GET {url} failed and the request deadline leaves no time to retry: "
+                                   f"{failure!r}") from failure
+        logger.warning(f"GET {url} failed ({failure}); retry {retry + 1}/{self.retry.max_retries} in {delay:.3f}s.")
+        return delay
+
+    def _count_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def _timeout(self, timeout: float, deadline: Optional[Deadline]) -> float:
+        # Never 0: a zero socket timeout would make the socket non-blocking.
+        return timeout if deadline is None else max(0.001, deadline.cap(timeout))
+
+
+class PooledHttpTransport(_TransportBase):
+    """
+    Thread-safe HTTP/1.1 client for JSON APIs with keep-alive connection pooling.
+
+    Connections are pooled per (scheme, host, port) and reused across requests, so the
+    TCP/TLS handshake is paid once per connection rather than once per lookup. At most
+    max_connections_per_host are open to a host at a time. connect_timeout bounds the
+    handshake and read_timeout each wait for response data. Connection errors,
+    timeouts and the statuses in retry.retry_statuses are retried per RetryPolicy; a
+    reused connection the server has meanwhile closed is replaced without counting as
+    a retry. keep_alive=False opens a new connection for every request (for comparison).
+
+    When the calling request has a deadline (app/utils/deadline.py), every wait is
+    capped at the budget left, and no attempt or retry is started once it has passed;
+    a request given up because of the deadline raises DeadlineExceeded rather than
+    HttpTransportError.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._pools: Dict[Tuple[str, str, int], _HostPool] = {}
+
+    def _pool(self, scheme: str, host: str, port: int) -> _HostPool:
+        key = (scheme, host, port)
+        pool = self._pools.get(key)
+        if pool is None:
+            with self._lock:
+                pool = self._pools.get(key)
+                if pool is None:
+                    pool = self._pools[key] = _HostPool(scheme, host, port, self.max_connections_per_host)
+        return pool
+
+    @property
+    def connections_opened(self) -> int:
+        return sum(pool.connections_opened for pool in list(self._pools.values()))
+
+    def get_json(self, url: str, params: Optional[Dict[str, Any]] = None,
+                 headers: Optional[Dict[str, str]] = None) -> Tuple[int, Any]:
+        """
+        GETs url (with params as its query string) and returns (status, decoded JSON body).
+        Non-retryable error statuses (e.g. 404) are returned, not raised, so the caller
+        can map them. Raises HttpTransportError once retries are exhausted.
+        """
+        scheme, host, port, target, request_headers = self._prepare(url, params, headers)
+        pool = self._pool(scheme, host, port)
+        deadline = current_deadline()
+        retry = 0
+        while True:
+            self._check_deadline(url, deadline)
+            try:
+                status, payload = self._request(pool, target, request_headers, deadline)
+                if status not in self.retry.retry_statuses:
+                    return status, payload
+                failure: Exception = HttpTransportError(f"GET {url} returned {status}", status)
+            except _ATTEMPT_ERRORS as e:
+                failure = e
+            time.sleep(self._retry_delay(url, failure, retry, deadline))
+            retry += 1
+
+    def _request(self, pool: _HostPool, target: str, headers: Dict[str, str],
+                 deadline: Optional[Deadline]) -> Tuple[int, Any]:
+        while True:
+            connection, reused = pool.acquire(self._timeout(self.pool_timeout, deadline),
+                                              self._timeout(self.connect_timeout, deadline))
+            try:
+                # The connect timeout covered the TCP (and TLS) handshake; reads get the read timeout.
+                connection.sock.settimeout(self._timeout(self.read_timeout, deadline))
+                connection.request("GET", target, headers=headers)
+                response = connection.getresponse()
+                body = response.read()
+            except _STALE_CONNECTION_ERRORS:
+                pool.release(connection, reusable=False)
+                if reused:
+                    continue # The server closed an idle keep-alive connection; retry on a fresh one.
+                raise
+            except BaseException:
+                pool.release(connection, reusable=False)
+                raise
+            pool.release(connection, reusable=self.keep_alive and not response.will_close)
+            self._count_request()
+            return response.status, json.loads(body) if body else None
+
+    def close(self) -> None:
+        """Closes every idle connection; the transport stays usable and reconnects on demand."""
+        for pool in list(self._pools.values()):
+            pool.close()
+
+
+_Connection = Tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+
+class _AsyncHostPool:
+    """
+    _HostPool for one event loop: keep-alive stream connections to one host, at most
+    max_connections open at once. Waiting for a free connection suspends the caller.
+    """
+
+    def __init__(self, scheme: str, host: str, port: int, max_connections: int):
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self._slots = asyncio.Semaphore(max_connections)
+        self._idle: List[_Connection] = []
+
+    async def acquire(self, pool_timeout: float, connect_timeout: float) -> Tuple[_Connection, bool]:
+        """Returns (connection, reused). The connection must be given back with release()."""
+        try:
+            await asyncio.wait_for(self._slots.acquire(), pool_timeout)
+        except asyncio.TimeoutError:
+            raise HttpTransportError(f"No connection to {self.host}:{self.port} became free within {pool_timeout}s")
+        while self._idle:
+            reader, writer = self._idle.pop()
+            if not reader.at_eof() and not writer.is_closing():
+                return (reader, writer), True
+            writer.close()
+        try:
+            return await self._connect(connect_timeout), False
+        except BaseException:
+            self._slots.release()
+            raise
+
+    async def _connect(self, connect_timeout: float) -> _Connection:
+        # asyncio already sets TCP_NODELAY on the connections it opens.
+        ssl_context = ssl.create_default_context() if self.scheme == "https" else None
+        return await asyncio.wait_for(asyncio.open_connection(self.host, self.port, ssl=ssl_context), connect_timeout)
+
+    def release(self, connection: _Connection, reusable: bool) -> None:
+        if reusable:
+            self._idle.append(connection)
+        else:
+            connection[1].close()
+        self._slots.release()
+
+    def close(self) -> None:
+        idle, self._idle = self._idle, []
+        for _, writer in idle:
+            writer.close()
+
+
+class AsyncPooledHttpTransport(_TransportBase):
+    """
+    asyncio counterpart of PooledHttpTransport, for the ASGI pipeline.
+
+    Requests are written and read with asyncio streams, so a lookup waiting on the
+    network suspends its coroutine rather than holding a thread: how many lookups
+    are in flight is bounded by max_connections_per_host, not by a thread pool.
+    Pooling, timeouts, retries with backoff and the request deadline work as in
+    PooledHttpTransport. Connections belong to the event loop that opened them, so
+    each loop gets pools of its own. It speaks the HTTP/1.1 subset JSON APIs use:
+    GET only, with Content-Length, chunked or read-to-close bodies.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[str, str, int], _AsyncHostPool]]" = \
+            weakref.WeakKeyDictionary()
+        self.connections_opened = 0 # Counted here: a loop's pools go away with the loop
+
+    def _pool(self, scheme: str, host: str, port: int) -> _AsyncHostPool:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            pools = self._pools.setdefault(loop, {})
+            pool = pools.get((scheme, host, port))
+            if pool is None:
+                pool = pools[(scheme, host, port)] = _AsyncHostPool(scheme, host, port, self.max_connections_per_host)
+        return pool
+
+    async def get_json(self, url: str, params: Optional[Dict[str, Any]] = None,
+                       headers: Optional[Dict[str, str]] = None) -> Tuple[int, Any]:
+        """As PooledHttpTransport.get_json, awaited."""
+        scheme, host, port, target, request_headers = self._prepare(url, params, headers)
+        pool = self._pool(scheme, host, port)
+        request_headers = {"Host": host if port == (443 if scheme == "https" else 80) else f"{host}:{port}",
+                           **request_headers}
+        request = "".join([f"GET {target} HTTP/1.1\r\n"] + [f"{name}: {value}\r\n" for name, value in
+                                                            request_headers.items()] + ["\r\n"]).encode("latin-1")
+        deadline = current_deadline()
+        retry = 0
+        while True:
+            self._check_deadline(url, deadline)
+            try:
+                status, payload = await self._request(pool, request, deadline)
+                if status not in self.retry.retry_statuses:
+                    return status, payload
+                failure: Exception = HttpTransportError(f"GET {url} returned {status}", status)
+            except _ATTEMPT_ERRORS as e:
+                failure = e
+            await asyncio.sleep(self._retry_delay(url, failure, retry, deadline))
+            retry += 1
+
+    async def _request(self, pool: _AsyncHostPool, request: bytes, deadline: Optional[Deadline]) -> Tuple[int, Any]:
+        while True:
+            connection, reused = await pool.acquire(self._timeout(self.pool_timeout, deadline),
+                                                    self._timeout(self.connect_timeout, deadline))
+            if not reused:
+                with self._lock:
+                    self.connections_opened += 1
+            reader, writer = connection
+            try:
+                writer.write(request)
+                await self._read(writer.drain(), deadline)
+                status, will_close, body = await self._read_response(reader, deadline)
+            except _STALE_CONNECTION_ERRORS:
+                pool.release(connection, reusable=False)
+                if reused:
+                    continue # The server closed an idle keep-alive connection; retry on a fresh one.
+                raise
+            except BaseException:
+                pool.release(connection, reusable=False)
+                raise
+            pool.release(connection, reusable=self.keep_alive and not will_close)
+            self._count_request()
+            return status, json.loads(body) if body else None
+
+    async def _read(self, step: Awaitable[T], deadline: Optional[Deadline]) -> T:
+        return await asyncio.wait_for(step, self._timeout(self.read_timeout, deadline))
+
+    async def _read_response(self, reader: asyncio.StreamReader, deadline: Optional[Deadline]) -> Tuple[int, bool, bytes]:
+        """Reads one response; returns (status, whether the server will close the connection, body)."""
+        status_line = await self._read(reader.readline(), deadline)
+        if not status_line:
+            raise http.client.RemoteDisconnected("Remote end closed connection without response")
+        version, _, rest = status_line.decode("iso-8859-1").partition(" ")
+        if not version.startswith("HTTP/"):
+            raise http.client.BadStatusLine(status_line.decode("iso-8859-1").strip())
+        status = int(rest.split(" ", 1)[0])
+        headers: Dict[str, str] = {}
+        while True:
+            line = await self._read(reader.readline(), deadline)
+            if not line:
+                raise http.client.IncompleteRead(b"")
+            if line in (b"\r\n", b"\n"):
+                break
+            name, _, value = line.decode("iso-8859-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        connection_header = headers.get("connection", "").lower()
+        will_close = connection_header == "close" or (version == "HTTP/1.0" and connection_header != "keep-alive")
+        if status in (204, 304) or 100 <= status < 200:
+            return status, will_close, b""
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            return status, will_close, await self._read_chunked(reader, deadline)
+        if "content-length" in headers:
+            return status, will_close, await self._read(reader.readexactly(int(headers["content-length"])), deadline)
+        return status, True, await self._read(reader.read(), deadline) # The body ends when the server closes
+
+    async def _read_chunked(self, reader: asyncio.StreamReader, deadline: Optional[Deadline]) -> bytes:
+        chunks = []
+        while True:
+            size = int((await self._read(reader.readline(), deadline)).split(b";", 1)[0], 16)
+            if size == 0:
+                while (await self._read(reader.readline(), deadline)) not in (b"\r\n", b"\n", b""):
+                    pass # Trailers
+                return b"".join(chunks)
+            chunks.append((await self._read(reader.readexactly(size + 2), deadline))[:-2])
+
+    def close(self) -> None:
+        """Closes the running loop's idle connections (call it from that loop); the transport stays usable."""
+        with self._lock:
+            pools = list(self._pools.get(asyncio.get_running_loop(), {}).values())
+        for pool in pools:
+            pool.close()
@@ -0,0 +1,181 @@
+"""
+Local stand-in for the remote health inspection and crime statistics APIs.
+
+Serves the simulated clients' answers over HTTP/1.1 with keep-alive, so the HTTP
+clients and PooledHttpTransport can be exercised and load tested offline:
+
+    GET /inspections?business_name=...&address=...[&city=&state=&zip_code=]
+    GET /crime?address=...[&latitude=&longitude=]
+
+Every request first waits one UpstreamLatency round trip; with probability
+error_rate it then fails with 503. Error answers of the simulated clients map to
+401 (invalid key), 404 (not found) and 503 (data not loaded). A request whose
+X-API-Key header is INVALID_KEY_TEST is rejected with 401.
+
+Run it on its own (from ai_underwriter/):
+
+    python -m app.clients.stand_in_server --port 8081 --latency 0.05 --error-rate 0.01
+"""
+import argparse
+import json
+import logging
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from app.clients.async_clients import UpstreamLatency
+from app.clients.crime_statistics_client import MockCrimeStatisticsClient
+from app.clients.health_inspection_client import SimulatedHealthInspectionClient
+
+logger = logging.getLogger(__name__)
+
+INVALID_KEY = "INVALID_KEY_TEST"
+_ERROR_STATUSES = {
+    "Invalid API Key": 401,
+    "Establishment not found": 404,
+    "Location not found": 404,
+}
+
+
+class _QuietHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128 # Load tests open many connections at once; the default backlog of 5 drops them
+
+    def handle_error(self, request: Any, client_address: Tuple[str, int]) -> None:
+        # Clients that time out close the connection before the answer is written; that is expected under test.
+        logger.debug(f"Stand-in server: connection from {client_address} failed", exc_info=True)
+
+
+class StandInServer:
+    """
+    Threaded HTTP server answering from in-process simulated clients.
+    port=0 picks a free port; the bound address is in url once started.
+    requests_served and connections_accepted are counted for load tests.
+    """
+
+    def __init__(self, health_client: Optional[Any] = None, crime_client: Optional[Any] = None,
+                 host: str = "127.0.0.1", port: int = 0, latency: Optional[UpstreamLatency] = None,
+                 error_rate: float = 0.0, rng: Optional[random.Random] = None):
+        self.health_client = health_client if health_client is not None else SimulatedHealthInspectionClient(keep_violations=False)
+        self.crime_client = crime_client if crime_client is not None else MockCrimeStatisticsClient()
+        self.latency = latency or UpstreamLatency()
+        self.error_rate = error_rate
+        self._rng = rng or random.Random()
+        self._rng_lock = threading.Lock()
+        self._counter_lock = threading.Lock()
+        self.requests_served = 0
+        self.connections_accepted = 0
+        self._server = _QuietHTTPServer((host, port), self._handler_class())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _should_fail(self) -> bool:
+        if self.error_rate <= 0:
+            return False
+        with self._rng_lock:
+            return self._rng.random() < self.error_rate
+
+    def _count(self, counter: str) -> None:
+        with self._counter_lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def answer(self, path: str, query: Dict[str, str], api_key: Optional[str]) -> Tuple[int, Dict[str, Any]]:
+        """Returns (status, JSON body) for one request."""
+        self.latency.wait()
+        if self._should_fail():
+            return 503, {"error": "Injected upstream failure"}
+        if api_key == INVALID_KEY:
+            return 401, {"error": "Invalid API Key", "source": "stand_in_api_error"}
+        if path == "/inspections":
+            if "business_name" not in query or "address" not in query:
+                return 400, {"error": "business_name and address are required"}
+            data = self.health_client.get_inspection_data(
+                business_name=query["business_name"], address=query["address"],
+                city=query.get("city"), state=query.get("state"), zip_code=query.get("zip_code"))
+        elif path == "/crime":
+            if "address" not in query:
+                return 400, {"error": "address is required"}
+            location = {key: float(query[key]) for key in ("latitude", "longitude") if key in query}
+            data = self.crime_client.get_crime_data(address=query["address"], **location)
+        else:
+            return 404, {"error": "Unknown endpoint"}
+        if data is None:
+            return 503, {"error": "No data"}
+        error = data.get("error")
+        return (_ERROR_STATUSES.get(error, 503) if error else 200), dict(data)
+
+    def _handler_class(self) -> type:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1" # Keep-alive unless the client asks to close
+            # Headers and body are written separately; without TCP_NODELAY a kept-alive connection
+            # stalls each response on the client's delayed ACK.
+            disable_nagle_algorithm = True
+
+            def setup(self) -> None:
+                super().setup()
+                server._count("connections_accepted")
+
+            def do_GET(self) -> None:
+                parts = urlsplit(self.path)
+                query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+                try:
+                    status, payload = server.answer(parts.path, query, self.headers.get("X-API-Key"))
+                except Exception as e:
+                    logger.error(f"Stand-in server failed answering {self.path}: {e}", exc_info=True)
+                    status, payload = 500, {"error": "Internal error"}
+                body = json.dumps(payload).encode("utf-8")
+                server._count("requests_served")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                logger.debug("Stand-in server: " + format, *args)
+
+        return Handler
+
+    def start(self) -> "StandInServer":
+        """Serves requests on a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, kwargs={"poll_interval": 0.05},
+                                        name="stand-in-server", daemon=True)
+        self._thread.start()
+        logger.info(f"Stand-in server listening on {self.url}")
+        return self
+
+    def serve_forever(self) -> None:
+        logger.info(f"Stand-in server listening on {self.url}")
+        self._server.serve_forever()
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve the simulated health and crime data over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this many random seconds more")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests failing with 503")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(name)s - %(message)s')
+    StandInServer(host=args.host, port=args.port, latency=UpstreamLatency(args.latency, args.jitter),
+                  error_rate=args.error_rate).serve_forever()
+
+
+if __name__ == '__main__':
+    main()
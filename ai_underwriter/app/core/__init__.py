@@ -1,5 +1,11 @@
-from .risk_engine import calculate_risk_score
-from .premium_calculator import calculate_premium
+from .risk_engine import calculate_risk_score, calculate_risk_scores_batch, set_risk_rules
+from .rules import RiskRules, load_risk_rules
+from .premium_calculator import calculate_premium, calculate_premiums_batch
 from .decision_engine import make_decision
+from .ruleset import ruleset_fingerprint
+from .underwriting_config import (UnderwritingConfig, current_config, load_underwriting_config,
+                                  reload_underwriting_config, set_underwriting_config)
 
-__all__ = ['calculate_risk_score', 'calculate_premium', 'make_decision']
+__all__ = ['calculate_risk_score', 'calculate_risk_scores_batch', 'calculate_premium', 'calculate_premiums_batch', 'make_decision',
+           'ruleset_fingerprint', 'set_risk_rules', 'RiskRules', 'load_risk_rules', 'UnderwritingConfig', 'current_config',
+           'load_underwriting_config', 'reload_underwriting_config', 'set_underwriting_config']
@@ -1,11 +1,13 @@
-# Decision Thresholds
-APPROVE_THRESHOLD = 3.5
-REFER_THRESHOLD = 6.5
+from typing import Optional
+from app.core.underwriting_config import UnderwritingConfig, current_config
+
+# Decision thresholds come from the underwriting config (see underwriting_config.py).
 # Risk score is expected to be between 1.0 and 10.0 from risk_engine.py
 
-def make_decision(risk_score: float) -> str:
+def make_decision(risk_score: float, config: Optional[UnderwritingConfig] = None) -> str:
     """
-    Makes an underwriting decision based on the provided risk score.
+    Makes an underwriting decision based on the provided risk score, using the
+    thresholds of config (by default, the config currently in effect).
     """
     if risk_score is None:
         return "Error: Risk score not provided"
@@ -19,9 +21,11 @@ def make_decision(risk_score: float) -> str:
         # This case should ideally not be reached if risk_score comes from calculate_risk_score
         return "Error: Risk score out of expected range (1.0-10.0)"
 
-    if risk_score <= APPROVE_THRESHOLD:
+    if config is None:
+        config = current_config()
+    if risk_score <= config.approve_threshold:
         return "Approved"
-    elif risk_score <= REFER_THRESHOLD:
+    elif risk_score <= config.refer_threshold:
         return "Refer to manual underwriter"
-    else:  # risk_score > REFER_THRESHOLD
+    else:  # risk_score > refer_threshold
         return "Declined"
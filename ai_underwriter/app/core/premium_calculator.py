@@ -1,14 +1,21 @@
-from typing import Dict
+import logging
+from typing import Dict, Sequence, Optional
+import numpy as np
+from app.core.underwriting_config import UnderwritingConfig, current_config
 from app.models.data_models import RestaurantApplication
 
-# Base Rates
-BASE_GENERAL_LIABILITY_RATE = 500.0
-BASE_PROPERTY_RATE = 300.0
+logger = logging.getLogger(__name__)
 
-def calculate_premium(application: RestaurantApplication, risk_score: float) -> Dict[str, float]:
+# Base rates come from the underwriting config (see underwriting_config.py).
+
+def calculate_premium(application: RestaurantApplication, risk_score: float,
+                      config: Optional[UnderwritingConfig] = None) -> Dict[str, float]:
     """
-    Calculates a simplified insurance premium based on the application and risk score.
+    Calculates a simplified insurance premium based on the application and risk score,
+    using the base rates of config (by default, the config currently in effect).
     """
+    if config is None:
+        config = current_config()
 
     # Handle Potential None Values for Inputs and ensure logical defaults
     alcohol_sales = application.alcohol_sales_percentage if application.alcohol_sales_percentage is not None else 0.0
@@ -22,18 +29,74 @@ def calculate_premium(application: RestaurantApplication, risk_score: float) ->
 
     # Calculate General Liability Premium
     # Factor in alcohol sales: higher alcohol sales can increase liability risk
-    gl_premium = BASE_GENERAL_LIABILITY_RATE * effective_risk_score * (1 + (alcohol_sales * 0.5))
+    gl_premium = config.base_general_liability_rate * effective_risk_score * (1 + (alcohol_sales * 0.5))
 
     # Calculate Property Premium
     # Factor in square footage: larger properties may have higher property risk
     # Normalize square footage to a factor (e.g., per 1000 sq ft)
-    prop_premium = BASE_PROPERTY_RATE * effective_risk_score * (sq_footage / 1000.0)
+    prop_premium = config.base_property_rate * effective_risk_score * (sq_footage / 1000.0)
 
     # Calculate Total Premium
     total_premium = gl_premium + prop_premium
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Premium for %s: GL %s + property %s = %s (effective risk %s, alcohol %s, sq ft %s)",
+                     application.application_id, gl_premium, prop_premium, total_premium,
+                     effective_risk_score, alcohol_sales, sq_footage)
 
     return {
         "total_premium": round(total_premium, 2),
         "general_liability_premium": round(gl_premium, 2),
         "property_premium": round(prop_premium, 2)
     }
+
+
+def _round_like_builtin(values: np.ndarray, ndigits: int = 2) -> np.ndarray:
+    """
+    Rounds an array exactly as the builtin round(value, ndigits) would round each element.
+
+    np.round scales by 10**ndigits before rounding, which can disagree with the builtin
+    only when the scaled value sits within floating-point error of a .5 tie. Those few
+    elements are re-rounded with the builtin; everything else keeps the vectorized result.
+    """
+    scaled = values * (10.0 ** ndigits)
+    rounded = np.round(values, ndigits)
+    distance_from_tie = np.abs(np.abs(scaled - np.trunc(scaled)) - 0.5)
+    near_tie = np.flatnonzero(distance_from_tie <= 1e-9 + np.abs(scaled) * 1e-15)
+    for index in near_tie:
+        rounded[index] = round(float(values[index]), ndigits)
+    return rounded
+
+
+def calculate_premiums_batch(
+    risk_scores: Sequence[float],
+    alcohol_sales_percentages: Sequence[Optional[float]],
+    square_footages: Sequence[Optional[float]],
+    config: Optional[UnderwritingConfig] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Columnar counterpart of calculate_premium for re-rating whole portfolios.
+
+    Takes aligned sequences (None or NaN marks a missing value) and returns arrays
+    under the same keys as calculate_premium, with identical defaults and rounding.
+    """
+    if config is None:
+        config = current_config()
+    risk = np.asarray(risk_scores, dtype=float)
+    alcohol_sales = np.asarray(alcohol_sales_percentages, dtype=float)
+    sq_footage = np.asarray(square_footages, dtype=float)
+    if not (risk.shape == alcohol_sales.shape == sq_footage.shape) or risk.ndim != 1:
+        raise ValueError("risk_scores, alcohol_sales_percentages and square_footages must be 1-D and the same length")
+
+    alcohol_sales = np.where(np.isnan(alcohol_sales), 0.0, alcohol_sales)
+    sq_footage = np.where(sq_footage > 0, sq_footage, 1000.0) # NaN fails the comparison and gets the default
+    effective_risk_score = np.fmax(risk, 1.0) # Like max(1.0, risk_score), a NaN score falls back to 1.0
+
+    gl_premium = config.base_general_liability_rate * effective_risk_score * (1 + (alcohol_sales * 0.5))
+    prop_premium = config.base_property_rate * effective_risk_score * (sq_footage / 1000.0)
+    total_premium = gl_premium + prop_premium
+
+    return {
+        "total_premium": _round_like_builtin(total_premium),
+        "general_liability_premium": _round_like_builtin(gl_premium),
+        "property_premium": _round_like_builtin(prop_premium)
+    }
@@ -1,135 +1,190 @@
 import logging
-from typing import Optional, Dict, Any
-from app.models.data_models import RestaurantApplication
+from typing import Optional, Dict, Any, Sequence, Tuple, Union
+import numpy as np
+from app.core.rules import CategoricalRule, RiskRules, Rule, load_risk_rules
+from app.models.data_models import RestaurantApplication, RiskFactorBreakdown
 
 logger = logging.getLogger(__name__)
 
+# The scoring rules, compiled from data/risk_rules.json (see rules.py). Replaced as a whole by
+# set_risk_rules(); scoring reads the reference once per call, so a swap never mixes two rule sets.
+risk_rules: RiskRules = load_risk_rules()
+
+
+def set_risk_rules(rules: RiskRules) -> None:
+    global risk_rules
+    risk_rules = rules
+    logger.info("Risk rules %s loaded from %s.", rules.fingerprint, rules.source)
+
+
+def _has_crime_figures(crime_data: Optional[Dict[str, Any]]) -> bool:
+    # An answer without either figure (e.g. "Location not found") tells no more than no answer,
+    # so it must not score better than one.
+    return bool(crime_data) and (crime_data.get("crime_level_area") is not None
+                                 or crime_data.get("safety_score") is not None)
+
+
 def calculate_risk_score(
     application: RestaurantApplication,
     health_data: Optional[Dict[str, Any]] = None,
-    crime_data: Optional[Dict[str, Any]] = None
-) -> float:
+    crime_data: Optional[Dict[str, Any]] = None,
+    return_breakdown: bool = False
+) -> Union[float, Tuple[float, RiskFactorBreakdown]]:
     """
     Calculates a simplified risk score for a restaurant application,
     optionally incorporating external health and crime data.
+
+    With return_breakdown=True, returns (score, RiskFactorBreakdown) so callers can
+    see how much each factor contributed.
     """
-    score = 5.0  # Base score
-    logger.info(f"Starting risk score calculation for application {application.application_id} (or business {application.business_name}) with base score: {score}")
-
-    # --- Original Application Data Logic ---
-    # Cuisine Type Logic
-    cuisine_scores = {
-        "sushi": -0.5, "salad bar": -0.5, "cafe": -0.5, "fine dining": -0.2,
-        "italian": 0.5, "mexican": 0.5, "chinese": 0.5,
-        "steakhouse": 1.5, "fast food": 1.5, "food truck": 1.2, # Added food truck
-        "bar": 1.0 # Added generic bar
-    }
-    cuisine_type_lower = application.cuisine_type.lower() if application.cuisine_type else ""
-    cuisine_adjustment = cuisine_scores.get(cuisine_type_lower, 0.0)
+    rules = risk_rules
+    # Per-factor tracing is only built when DEBUG is enabled: in production the
+    # formatting (including whole health/crime dicts) costs more than the scoring itself.
+    trace = logger.isEnabledFor(logging.DEBUG)
+    score = rules.base_score
+    if trace:
+        logger.debug("Starting risk score calculation for application %s (or business %s) with base score: %s", application.application_id, application.business_name, score)
+
+    # --- Application factors, in APPLICATION_FACTORS order ---
+    cuisine, alcohol, years, fire_suppression, claims = rules.application_values(application)
+    cuisine_rule, alcohol_rule, years_rule, fire_suppression_rule, claims_rule = rules.application_evaluators
+    cuisine_adjustment = cuisine_rule(cuisine)
+    alcohol_adjustment = alcohol_rule(alcohol)
+    years_adjustment = years_rule(years)
+    fire_suppression_adjustment = fire_suppression_rule(fire_suppression)
+    claims_adjustment = claims_rule(claims)
     score += cuisine_adjustment
-    logger.info(f"Score after cuisine ({application.cuisine_type}): {score} (adjustment: {cuisine_adjustment})")
-
-    # Alcohol Sales Percentage Logic
-    alcohol_adjustment = 0.0
-    if application.alcohol_sales_percentage is not None:
-        if application.alcohol_sales_percentage > 0.5:
-            alcohol_adjustment = 1.5
-        elif application.alcohol_sales_percentage > 0.25:
-            alcohol_adjustment = 0.5
     score += alcohol_adjustment
-    logger.info(f"Score after alcohol ({application.alcohol_sales_percentage*100}%): {score} (adjustment: {alcohol_adjustment})")
-
-    # Years in Business Logic
-    years_adjustment = 0.0
-    if application.years_in_business is not None:
-        if application.years_in_business < 2:
-            years_adjustment = 1.0
-        elif application.years_in_business > 10:
-            years_adjustment = -0.5
     score += years_adjustment
-    logger.info(f"Score after years in business ({application.years_in_business}): {score} (adjustment: {years_adjustment})")
-
-    # Fire Suppression System Type Logic
-    fire_suppression_adjustment = 0.0
-    if application.fire_suppression_system_type:
-        system_type_lower = application.fire_suppression_system_type.lower()
-        if system_type_lower == "none":
-            fire_suppression_adjustment = 2.0
-        elif system_type_lower == "sprinkler":
-            fire_suppression_adjustment = -0.5
-        elif any(sub_type in system_type_lower for sub_type in ["ansul", "kitchen hood", "kitchen suppression"]):
-            fire_suppression_adjustment = -1.0
-    else: # If None or empty, treat as high risk
-        fire_suppression_adjustment = 2.0
     score += fire_suppression_adjustment
-    logger.info(f"Score after fire suppression ({application.fire_suppression_system_type}): {score} (adjustment: {fire_suppression_adjustment})")
-
-    # Previous Claims Count Logic
-    claims_adjustment = 0.0
-    if application.previous_claims_count is not None:
-        if application.previous_claims_count > 2:
-            claims_adjustment = 1.5
-        elif application.previous_claims_count >= 1:
-            claims_adjustment = 0.5
     score += claims_adjustment
-    logger.info(f"Score after previous claims ({application.previous_claims_count}): {score} (adjustment: {claims_adjustment})")
+    if trace:
+        logger.debug("Application factor adjustments: cuisine (%s) %s, alcohol (%s) %s, years in business (%s) %s, "
+                     "fire suppression (%s) %s, previous claims (%s) %s; score: %s",
+                     cuisine, cuisine_adjustment, alcohol, alcohol_adjustment, years, years_adjustment,
+                     fire_suppression, fire_suppression_adjustment, claims, claims_adjustment, score)
 
     # --- External Health Data Integration ---
-    health_penalty = 0.0
     if health_data:
-        logger.info(f"Processing health data: {health_data}")
         latest_health_score = health_data.get("latest_score")
-        if isinstance(latest_health_score, (int, float)):
-            if latest_health_score < 70:
-                health_penalty += 2.0
-                logger.info(f"Health penalty increased by 2.0 due to low health score: {latest_health_score}")
-            elif latest_health_score < 85:
-                health_penalty += 1.0
-                logger.info(f"Health penalty increased by 1.0 due to moderate health score: {latest_health_score}")
-
         critical_violations = health_data.get("critical_violations_last_year")
+        health_penalty = 0.0
+        if isinstance(latest_health_score, (int, float)):
+            health_penalty += rules.health_score.evaluate(latest_health_score)
         if isinstance(critical_violations, int):
-            if critical_violations > 3:
-                health_penalty += 1.5
-                logger.info(f"Health penalty increased by 1.5 due to high critical violations: {critical_violations}")
-            elif critical_violations > 0:
-                health_penalty += 0.5
-                logger.info(f"Health penalty increased by 0.5 due to critical violations: {critical_violations}")
+            health_penalty += rules.health_violations.evaluate(critical_violations)
     else:
-        logger.info("No health data provided or found for risk scoring.")
-        health_penalty = 0.5  # Small penalty if health data is missing
-        logger.info(f"Health penalty set to {health_penalty} due to missing health data.")
+        health_penalty = rules.health_missing # Small penalty if health data is missing
     score += health_penalty
-    logger.info(f"Score after health data integration: {score} (total health penalty: {health_penalty})")
+    if trace:
+        logger.debug("Score after health data integration (%s): %s (total health penalty: %s)", health_data, score, health_penalty)
 
     # --- External Crime Data Integration ---
-    crime_penalty = 0.0
-    if crime_data:
-        logger.info(f"Processing crime data: {crime_data}")
-        crime_level = crime_data.get("crime_level_area")
-        if crime_level: # Check if crime_level is not None and not an empty string
-            if crime_level.lower() == "high":
-                crime_penalty += 1.5
-                logger.info("Crime penalty increased by 1.5 due to high crime level in area.")
-            elif crime_level.lower() == "medium":
-                crime_penalty += 0.5
-                logger.info("Crime penalty increased by 0.5 due to medium crime level in area.")
-
-        safety_score_val = crime_data.get("safety_score")  # Assuming lower is worse
-        if isinstance(safety_score_val, (int, float)):
-            if safety_score_val < 4.0:
-                crime_penalty += 1.0
-                logger.info(f"Crime penalty increased by 1.0 due to low safety score: {safety_score_val}")
-            elif safety_score_val < 7.0:
-                crime_penalty += 0.5
-                logger.info(f"Crime penalty increased by 0.5 due to moderate safety score: {safety_score_val}")
+    if _has_crime_figures(crime_data):
+        safety_score = crime_data.get("safety_score")  # Lower is worse
+        crime_penalty = 0.0
+        crime_penalty += rules.crime_level.evaluate(crime_data.get("crime_level_area"))
+        if isinstance(safety_score, (int, float)):
+            crime_penalty += rules.crime_safety.evaluate(safety_score)
     else:
-        logger.info("No crime data provided or found for risk scoring.")
-        crime_penalty = 0.25  # Small penalty if crime data is missing
-        logger.info(f"Crime penalty set to {crime_penalty} due to missing crime data.")
+        crime_penalty = rules.crime_missing # Small penalty if crime data is missing or the location was not found
     score += crime_penalty
-    logger.info(f"Score after crime data integration: {score} (total crime penalty: {crime_penalty})")
+    if trace:
+        logger.debug("Score after crime data integration (%s): %s (total crime penalty: %s)", crime_data, score, crime_penalty)
 
-    final_score = max(1.0, min(score, 10.0))
-    logger.info(f"Final capped score for application {application.application_id}: {final_score} (raw score was {score})")
+    final_score = max(rules.min_score, min(score, rules.max_score))
+    if trace:
+        logger.debug("Final capped score for application %s: %s (raw score was %s)", application.application_id, final_score, score)
+    if return_breakdown:
+        return final_score, RiskFactorBreakdown(
+            base_score=rules.base_score, cuisine=cuisine_adjustment, alcohol=alcohol_adjustment,
+            years_in_business=years_adjustment, fire_suppression=fire_suppression_adjustment,
+            previous_claims=claims_adjustment, health=health_penalty, crime=crime_penalty)
     return final_score
+
+
+def _categorical_adjustments(values: Sequence[Optional[str]], rule: CategoricalRule) -> np.ndarray:
+    """
+    Maps a column of strings to adjustments, evaluating the rule once per distinct value.
+    None is treated as the empty string.
+    """
+    column = np.array([value if value else "" for value in values], dtype=str)
+    distinct, inverse = np.unique(column, return_inverse=True)
+    table = np.array([rule(value) for value in distinct], dtype=float)
+    return table[inverse.reshape(-1)]
+
+
+def _column_adjustments(values: Sequence[Any], rule: Rule) -> np.ndarray:
+    if isinstance(rule, CategoricalRule):
+        return _categorical_adjustments(values, rule)
+    return rule.evaluate_array(np.array(values, dtype=float))
+
+
+def _numeric_or_nan(value: Any, types: tuple) -> float:
+    return float(value) if isinstance(value, types) else np.nan
+
+
+def calculate_risk_scores_batch(
+    applications: Sequence[RestaurantApplication],
+    health_data: Optional[Sequence[Optional[Dict[str, Any]]]] = None,
+    crime_data: Optional[Sequence[Optional[Dict[str, Any]]]] = None,
+    return_breakdown: bool = False
+) -> Union[np.ndarray, Tuple[np.ndarray, Dict[str, np.ndarray]]]:
+    """
+    Vectorized counterpart of calculate_risk_score for scoring whole portfolios.
+
+    health_data and crime_data, when given, must be aligned with applications (entries may be None).
+    Returns a float64 array holding, for each application, the score calculate_risk_score would return.
+    With return_breakdown=True, also returns one array per RiskFactorBreakdown field, which
+    can be summed or averaged across the portfolio directly.
+    """
+    count = len(applications)
+    if health_data is None:
+        health_data = [None] * count
+    if crime_data is None:
+        crime_data = [None] * count
+    if len(health_data) != count or len(crime_data) != count:
+        raise ValueError("health_data and crime_data must have one entry per application")
+
+    rules = risk_rules
+
+    # --- Column extraction (missing numeric values become NaN, which get each rule's default) ---
+    has_health = np.array([bool(h) for h in health_data], dtype=bool)
+    health_scores = np.array([_numeric_or_nan(h.get("latest_score"), (int, float)) if h else np.nan
+                              for h in health_data], dtype=float)
+    critical_violations = np.array([_numeric_or_nan(h.get("critical_violations_last_year"), (int,)) if h else np.nan
+                                    for h in health_data], dtype=float)
+
+    has_crime = np.array([_has_crime_figures(c) for c in crime_data], dtype=bool)
+    safety_scores = np.array([_numeric_or_nan(c.get("safety_score"), (int, float)) if c else np.nan
+                              for c in crime_data], dtype=float)
+
+    # --- Application adjustments ---
+    adjustments = {factor: _column_adjustments([getattr(a, field) for a in applications], rule)
+                   for factor, field, rule in rules.application_rules}
+
+    # --- External data penalties ---
+    health_penalty = (0.0
+                      + rules.health_score.evaluate_array(health_scores)
+                      + rules.health_violations.evaluate_array(critical_violations))
+    health_penalty = np.where(has_health, health_penalty, rules.health_missing)
+
+    crime_penalty = (0.0
+                     + _categorical_adjustments([c.get("crime_level_area") if c else None for c in crime_data],
+                                                rules.crime_level)
+                     + rules.crime_safety.evaluate_array(safety_scores))
+    crime_penalty = np.where(has_crime, crime_penalty, rules.crime_missing)
+
+    # Accumulate in the same order as calculate_risk_score so results are bit-for-bit identical.
+    score = np.full(count, rules.base_score)
+    for factor in adjustments:
+        score += adjustments[factor]
+    score += health_penalty
+    score += crime_penalty
+
+    final_scores = np.clip(score, rules.min_score, rules.max_score)
+    logger.debug("Calculated batch risk scores for %s applications.", count)
+    if return_breakdown:
+        return final_scores, {"base_score": np.full(count, rules.base_score), **adjustments,
+                              "health": health_penalty, "crime": crime_penalty}
+    return final_scores
@@ -0,0 +1,218 @@
+import hashlib
+import json
+import math
+import os
+from bisect import bisect_right
+from operator import attrgetter
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from app.models.data_models import RestaurantApplication
+
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "risk_rules.json")
+
+# Factors scored from the application itself, in the order calculate_risk_score adds them.
+APPLICATION_FACTORS = ('cuisine', 'alcohol', 'years_in_business', 'fire_suppression', 'previous_claims')
+
+# Band conditions. Each is turned into a cut point c such that the condition flips between
+# values below c and values at or above c, so every band rule is one bisect_right over its cuts.
+_BAND_CONDITIONS = ('below', 'at_most', 'above', 'at_least')
+
+
+def _cut_point(condition: str, bound: float) -> float:
+    # x > b and x <= b flip at the next float after b; x < b and x >= b flip at b itself.
+    return math.nextafter(bound, math.inf) if condition in ('above', 'at_most') else bound
+
+
+def _band_matches(condition: str, bound: float, value: float) -> bool:
+    if condition == 'below':
+        return value < bound
+    if condition == 'at_most':
+        return value <= bound
+    if condition == 'above':
+        return value > bound
+    return value >= bound
+
+
+class BandRule:
+    """
+    Numeric rule: the first band whose condition holds gives the adjustment, else
+    default. Compiled into sorted cut points and one adjustment per interval between
+    them, so evaluation is a bisect instead of a chain of comparisons. None and NaN
+    get the default. evaluate is the same lookup as a plain function, which is
+    cheaper to call on the scoring hot path.
+    """
+    __slots__ = ('cuts', 'values', 'default', 'evaluate', '_cuts_array', '_values_array')
+
+    def __init__(self, bands: Sequence[Tuple[str, float, float]], default: float = 0.0):
+        self.default = default
+        self.cuts: List[float] = sorted({_cut_point(condition, bound) for condition, bound, _ in bands})
+        # Every condition is constant between consecutive cuts, so evaluating the chain at one
+        # point of each interval (its lower cut, or just below the first cut) fills the table.
+        samples = [math.nextafter(self.cuts[0], -math.inf)] + self.cuts if self.cuts else [0.0]
+        self.values: List[float] = [
+            next((value for condition, bound, value in bands if _band_matches(condition, bound, sample)), default)
+            for sample in samples
+        ]
+        self._cuts_array = np.array(self.cuts, dtype=float)
+        self._values_array = np.array(self.values, dtype=float)
+        self.evaluate = self._compile()
+
+    def _compile(self) -> Callable[[Optional[float]], float]:
+        cuts, values, default = self.cuts, self.values, self.default
+        # Tables of one or two cuts (the usual case) are searched with direct comparisons,
+        # which cost less than a bisect call; longer tables use bisect_right.
+        if len(cuts) == 1:
+            cut, below, above = cuts[0], values[0], values[1]
+
+            def evaluate(value: Optional[float]) -> float:
+                if value is None or value != value: # None or NaN
+                    return default
+                return above if value >= cut else below
+        elif len(cuts) == 2:
+            low_cut, high_cut = cuts
+            below, between, above = values
+
+            def evaluate(value: Optional[float]) -> float:
+                if value is None or value != value:
+                    return default
+                if value >= high_cut:
+                    return above
+                return between if value >= low_cut else below
+        else:
+            def evaluate(value: Optional[float]) -> float:
+                if value is None or value != value:
+                    return default
+                return values[bisect_right(cuts, value)]
+        return evaluate
+
+    def __call__(self, value: Optional[float]) -> float:
+        return self.evaluate(value)
+
+    def evaluate_array(self, values: np.ndarray) -> np.ndarray:
+        adjustments = self._values_array[np.searchsorted(self._cuts_array, values, side='right')]
+        return np.where(np.isnan(values), self.default, adjustments)
+
+
+class CategoricalRule:
+    """
+    String rule, matched case-insensitively: an exact match in the equals table wins,
+    then the first contains entry with a substring of the value, else default. Empty
+    or missing values get missing. Results are memoized per distinct value; evaluate
+    is the same lookup as a plain function.
+    """
+    __slots__ = ('equals', 'contains', 'default', 'missing', 'evaluate', '_memo')
+
+    _MEMO_LIMIT = 4096
+
+    def __init__(self, equals: Dict[str, float], contains: Sequence[Tuple[Sequence[str], float]] = (),
+                 default: float = 0.0, missing: Optional[float] = None):
+        self.equals = {key.lower(): value for key, value in equals.items()}
+        self.contains = [(tuple(part.lower() for part in parts), value) for parts, value in contains]
+        self.default = default
+        self.missing = default if missing is None else missing
+        self._memo: Dict[str, float] = {}
+        self.evaluate = self._compile()
+
+    def _compile(self) -> Callable[[Optional[str]], float]:
+        memo, missing, limit, match = self._memo, self.missing, self._MEMO_LIMIT, self._match
+
+        def evaluate(value: Optional[str]) -> float:
+            if not value:
+                return missing
+            adjustment = memo.get(value)
+            if adjustment is None:
+                adjustment = match(value.lower())
+                if len(memo) < limit:
+                    memo[value] = adjustment
+            return adjustment
+        return evaluate
+
+    def __call__(self, value: Optional[str]) -> float:
+        return self.evaluate(value)
+
+    def _match(self, value: str) -> float:
+        adjustment = self.equals.get(value)
+        if adjustment is not None:
+            return adjustment
+        for parts, adjustment in self.contains:
+            if any(part in value for part in parts):
+                return adjustment
+        return self.default
+
+
+Rule = Union[BandRule, CategoricalRule]
+
+
+class RiskRules:
+    """
+    A rule set compiled from its declarative form (see data/risk_rules.json).
+    Never modified after construction. fingerprint identifies the rule set's content.
+    """
+    __slots__ = ('base_score', 'min_score', 'max_score', 'application_rules', 'application_values',
+                 'application_evaluators', 'health_missing',
+                 'health_score', 'health_violations', 'crime_missing', 'crime_level', 'crime_safety',
+                 'fingerprint', 'source')
+
+    def __init__(self, definition: Dict[str, Any], source: str = "<memory>"):
+        self.source = source
+        try:
+            self.base_score = float(definition["base_score"])
+            self.min_score = float(definition["min_score"])
+            self.max_score = float(definition["max_score"])
+            application = definition["application"]
+            if set(application) != set(APPLICATION_FACTORS):
+                raise ValueError(f"application rules must be exactly {', '.join(APPLICATION_FACTORS)}")
+            self.application_rules: List[Tuple[str, str, Rule]] = []
+            for factor in APPLICATION_FACTORS:
+                field = application[factor]["field"]
+                if field not in RestaurantApplication.FIELDS:
+                    raise ValueError(f"{factor} rule refers to unknown field {field!r}")
+                self.application_rules.append((factor, field, _compile_rule(application[factor])))
+            # One attrgetter call fetches every field the application rules read, in factor order.
+            self.application_values = attrgetter(*(field for _, field, _ in self.application_rules))
+            self.application_evaluators = tuple(rule.evaluate for _, _, rule in self.application_rules)
+            health, crime = definition["health"], definition["crime"]
+            self.health_missing = float(health["missing"])
+            self.health_score = _compile_rule(health["latest_score"], "bands")
+            self.health_violations = _compile_rule(health["critical_violations_last_year"], "bands")
+            self.crime_missing = float(crime["missing"])
+            self.crime_level = _compile_rule(crime["crime_level_area"], "categorical")
+            self.crime_safety = _compile_rule(crime["safety_score"], "bands")
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"Invalid risk rules in {source}: {e!r}") from e
+        except ValueError as e:
+            raise ValueError(f"Invalid risk rules in {source}: {e}") from e
+        canonical = json.dumps(definition, sort_keys=True, separators=(",", ":"))
+        self.fingerprint = hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+def _compile_rule(definition: Dict[str, Any], expected_type: Optional[str] = None) -> Rule:
+    if expected_type is not None and definition["type"] != expected_type:
+        raise ValueError(f"expected a {expected_type} rule, got {definition['type']!r}")
+    default = float(definition.get("default", 0.0))
+    if definition["type"] == "bands":
+        bands = []
+        for band in definition["bands"]:
+            conditions = [condition for condition in _BAND_CONDITIONS if condition in band]
+            if len(conditions) != 1:
+                raise ValueError(f"band {band} needs exactly one of {', '.join(_BAND_CONDITIONS)}")
+            bands.append((conditions[0], float(band[conditions[0]]), float(band["value"])))
+        return BandRule(bands, default)
+    if definition["type"] == "categorical":
+        missing = definition.get("missing")
+        return CategoricalRule({key: float(value) for key, value in definition.get("equals", {}).items()},
+                               [(entry["any_of"], float(entry["value"])) for entry in definition.get("contains", [])],
+                               default, None if missing is None else float(missing))
+    raise ValueError(f"unknown rule type {definition['type']!r}")
+
+
+def load_risk_rules(path: str = DEFAULT_RULES_PATH) -> RiskRules:
+    """Reads and compiles a rule file. Raises OSError if it cannot be read and ValueError if it is invalid."""
+    with open(path, 'r') as f:
+        try:
+            definition = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid risk rules in {path}: {e}") from e
+    return RiskRules(definition, source=path)
@@ -0,0 +1,17 @@
+from typing import Optional
+
+from app.core import risk_engine
+from app.core.underwriting_config import UnderwritingConfig, current_config
+
+
+def ruleset_fingerprint(config: Optional[UnderwritingConfig] = None) -> str:
+    """
+    Identifies the scoring rules together with the decision thresholds and premium
+    rates of config (by default, the config currently in effect).
+
+    Results cached under it are not reused once any of them changes, including
+    changes made at runtime with set_risk_rules() or set_underwriting_config().
+    """
+    if config is None:
+        config = current_config()
+    return f"{risk_engine.risk_rules.fingerprint}:{config.fingerprint}"
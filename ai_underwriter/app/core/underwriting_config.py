@@ -0,0 +1,106 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "underwriting_config.json")
+
+_SETTINGS = ('approve_threshold', 'refer_threshold', 'base_general_liability_rate', 'base_property_rate')
+
+
+class UnderwritingConfig:
+    """
+    Decision thresholds and premium base rates, as one versioned value. Never
+    modified after construction; a change is a new config swapped in whole.
+
+    version is the file's "version" entry when it has one, else a hash of the
+    settings. fingerprint always hashes the settings, so edits made without bumping
+    version are still told apart.
+    """
+    __slots__ = ('version', 'fingerprint', 'source') + _SETTINGS
+
+    def __init__(self, approve_threshold: float, refer_threshold: float, base_general_liability_rate: float,
+                 base_property_rate: float, version: str = "", source: str = "<memory>"):
+        settings = {'approve_threshold': float(approve_threshold), 'refer_threshold': float(refer_threshold),
+                    'base_general_liability_rate': float(base_general_liability_rate),
+                    'base_property_rate': float(base_property_rate)}
+        if not settings['approve_threshold'] <= settings['refer_threshold']:
+            raise ValueError("approve_threshold must not exceed refer_threshold")
+        if settings['base_general_liability_rate'] <= 0 or settings['base_property_rate'] <= 0:
+            raise ValueError("base rates must be positive")
+        self.approve_threshold: float = settings['approve_threshold']
+        self.refer_threshold: float = settings['refer_threshold']
+        self.base_general_liability_rate: float = settings['base_general_liability_rate']
+        self.base_property_rate: float = settings['base_property_rate']
+        self.fingerprint = hashlib.sha256(json.dumps(settings, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+        self.version = str(version) if version else self.fingerprint
+        self.source = source
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'version': self.version, **{name: getattr(self, name) for name in _SETTINGS}}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], source: str = "<memory>") -> 'UnderwritingConfig':
+        """Builds a config from a to_dict() result. Raises ValueError if it is incomplete or invalid."""
+        if not isinstance(data, dict):
+            raise ValueError(f"Invalid underwriting config in {source}: expected a JSON object")
+        unknown = set(data) - set(_SETTINGS) - {'version'}
+        missing = set(_SETTINGS) - set(data)
+        if unknown or missing:
+            raise ValueError(f"Invalid underwriting config in {source}: "
+                             f"missing {sorted(missing)}, unknown {sorted(unknown)}")
+        try:
+            return cls(**data, source=source)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Invalid underwriting config in {source}: {e}") from e
+
+
+def load_underwriting_config(path: str = DEFAULT_CONFIG_PATH) -> UnderwritingConfig:
+    """Reads a config file. Raises OSError if it cannot be read and ValueError if it is invalid."""
+    with open(path, 'r') as f:
+        try:
+            data = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid underwriting config in {path}: {e}") from e
+    return UnderwritingConfig.from_dict(data, source=path)
+
+
+# The config in effect. Readers call current_config() once per assessment and use that object
+# throughout, without a lock: publishing a new config is a single reference assignment, so a
+# reader sees the old or the new config, never a mix of the two.
+_current_config = load_underwriting_config()
+_swap_lock = threading.Lock()
+
+
+def current_config() -> UnderwritingConfig:
+    return _current_config
+
+
+def set_underwriting_config(config: UnderwritingConfig) -> UnderwritingConfig:
+    """Publishes config for all subsequent assessments and returns the config it replaced."""
+    global _current_config
+    with _swap_lock:
+        previous, _current_config = _current_config, config
+    if previous.fingerprint != config.fingerprint:
+        logger.info(f"Underwriting config {config.version} from {config.source} is now in effect "
+                    f"(was {previous.version}).")
+    return previous
+
+
+def reload_underwriting_config(path: str) -> bool:
+    """
+    Loads the config file at path and swaps it in. If the file cannot be read or is
+    invalid, the current config stays in effect and False is returned (a FileWatcher
+    on_change callback, so the file is retried at its next poll).
+    """
+    try:
+        config = load_underwriting_config(path)
+    except (OSError, ValueError) as e:
+        logger.error(f"Reload of {path} failed, keeping underwriting config {_current_config.version}: {e}")
+        return False
+    set_underwriting_config(config)
+    return True
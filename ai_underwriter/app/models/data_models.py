@@ -1,6 +1,22 @@
+import hashlib
+import json
+from operator import attrgetter
 from typing import List, Dict, Optional, Any
 
+_APPLICATION_FIELDS = (
+    'application_id', 'business_name', 'address', 'cuisine_type', 'alcohol_sales_percentage',
+    'operating_hours', 'square_footage', 'building_age', 'fire_suppression_system_type',
+    'years_in_business', 'management_experience_years', 'has_delivery_operations',
+    'has_catering_operations', 'seating_capacity', 'annual_revenue',
+    'health_inspection_score', 'previous_claims_count'
+)
+
 class RestaurantApplication:
+    # Slotted: no per-instance __dict__, which matters when whole portfolios are held in memory.
+    __slots__ = _APPLICATION_FIELDS
+    FIELDS = _APPLICATION_FIELDS
+    _get_fields = attrgetter(*_APPLICATION_FIELDS)
+
     def __init__(self,
                  application_id: str,
                  business_name: str,
@@ -38,9 +54,88 @@ class RestaurantApplication:
         self.previous_claims_count: int = previous_claims_count
 
     def to_dict(self) -> Dict[str, Any]:
-        return self.__dict__
+        """Returns a new dict of the application's fields; changing it does not affect the object."""
+        return dict(zip(_APPLICATION_FIELDS, self._get_fields(self)))
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'RestaurantApplication':
+        """Builds an application from a to_dict() result. Unknown or missing keys raise TypeError."""
+        return cls(**data)
+
+    def content_hash(self) -> str:
+        """
+        SHA-256 of every field except application_id, so resubmissions of the same
+        application hash alike. Numbers are compared by value (3 and 3.0 are equal).
+        """
+        values = [float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else value
+                  for value in self._get_fields(self)[1:]]
+        return hashlib.sha256(json.dumps(values, default=str).encode("utf-8")).hexdigest()
+
+_RISK_FACTORS = (
+    'cuisine', 'alcohol', 'years_in_business', 'fire_suppression', 'previous_claims', 'health', 'crime'
+)
+
+_RISK_FACTOR_LABELS = {
+    'cuisine': "Cuisine type", 'alcohol': "Alcohol sales", 'years_in_business': "Years in business",
+    'fire_suppression': "Fire suppression system", 'previous_claims': "Previous claims",
+    'health': "Health inspection data", 'crime': "Area crime data"
+}
+
+class RiskFactorBreakdown:
+    """
+    Fixed-layout record of how much each factor moved the risk score.
+
+    base_score plus the factor adjustments, added in FACTORS order, gives the raw score
+    before it is capped to the 1-10 range.
+    """
+    __slots__ = ('base_score',) + _RISK_FACTORS
+    FACTORS = _RISK_FACTORS
+
+    def __init__(self,
+                 base_score: float,
+                 cuisine: float,
+                 alcohol: float,
+                 years_in_business: float,
+                 fire_suppression: float,
+                 previous_claims: float,
+                 health: float,
+                 crime: float):
+        self.base_score: float = base_score
+        self.cuisine: float = cuisine
+        self.alcohol: float = alcohol
+        self.years_in_business: float = years_in_business
+        self.fire_suppression: float = fire_suppression
+        self.previous_claims: float = previous_claims
+        self.health: float = health
+        self.crime: float = crime
+
+    def raw_score(self) -> float:
+        score = self.base_score
+        for factor in _RISK_FACTORS:
+            score += getattr(self, factor)
+        return score
+
+    def describe(self) -> List[str]:
+        """Renders one human-readable line per factor that moved the score."""
+        return [f"{_RISK_FACTOR_LABELS[factor]}: {adjustment:+.2f}"
+                for factor, adjustment in ((factor, getattr(self, factor)) for factor in _RISK_FACTORS)
+                if adjustment]
+
+    def to_dict(self) -> Dict[str, float]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, float]) -> 'RiskFactorBreakdown':
+        return cls(**data)
 
 class RiskAssessmentOutput:
+    __slots__ = (
+        'application_id', 'risk_score', 'confidence_level', 'decision', 'recommended_premium',
+        'premium_breakdown', 'risk_mitigation_recommendations', 'required_documentation',
+        '_explanation_factors', 'health_inspection_summary', 'crime_statistics_summary',
+        'factor_breakdown', 'config_version'
+    )
+
     def __init__(self,
                  application_id: str,
                  risk_score: float,
@@ -50,9 +145,11 @@ class RiskAssessmentOutput:
                  premium_breakdown: Dict[str, float],
                  risk_mitigation_recommendations: List[str],
                  required_documentation: List[str],
-                 explanation_factors: List[str],
+                 explanation_factors: Optional[List[str]] = None,
                  health_inspection_summary: Optional[Dict[str, Any]] = None,
-                 crime_statistics_summary: Optional[Dict[str, Any]] = None):
+                 crime_statistics_summary: Optional[Dict[str, Any]] = None,
+                 factor_breakdown: Optional[RiskFactorBreakdown] = None,
+                 config_version: Optional[str] = None):
         self.application_id: str = application_id
         self.risk_score: float = risk_score
         self.confidence_level: float = confidence_level
@@ -61,11 +158,48 @@ class RiskAssessmentOutput:
         self.premium_breakdown: Dict[str, float] = premium_breakdown
         self.risk_mitigation_recommendations: List[str] = risk_mitigation_recommendations
         self.required_documentation: List[str] = required_documentation
-        self.explanation_factors: List[str] = explanation_factors
+        # None means "render from factor_breakdown when asked for".
+        self._explanation_factors: Optional[List[str]] = explanation_factors
         self.health_inspection_summary: Optional[Dict[str, Any]] = health_inspection_summary
         self.crime_statistics_summary: Optional[Dict[str, Any]] = crime_statistics_summary
+        self.factor_breakdown: Optional[RiskFactorBreakdown] = factor_breakdown
+        # Version of the underwriting config (thresholds and rates) the assessment was made with.
+        self.config_version: Optional[str] = config_version
 
-    def to_dict(self) -> Dict[str, Any]:
+    @property
+    def explanation_factors(self) -> List[str]:
+        """
+        Human-readable explanation of the assessment. Unless explicit factors were given,
+        they are rendered from factor_breakdown on each access, so scoring never pays for them.
+        """
+        if self._explanation_factors is not None:
+            return self._explanation_factors
+        factors = [
+            f"Calculated risk score: {self.risk_score:.2f}",
+            f"Decision based on risk score: {self.decision}",
+        ]
+        if self.factor_breakdown is not None:
+            factors.extend(self.factor_breakdown.describe())
+        health = self.health_inspection_summary
+        if health and not health.get("error"): # Add factor if data is valid
+            factors.append(f"Health score from external source: {health.get('latest_score', 'N/A')}")
+        elif health and health.get("error"):
+            factors.append(f"Health data error: {health.get('error')}")
+        crime = self.crime_statistics_summary
+        if crime and not crime.get("error"): # Add factor if data is valid
+            factors.append(f"Area crime level from external source: {crime.get('crime_level_area', 'N/A')}")
+        elif crime and crime.get("error"):
+            factors.append(f"Crime data error: {crime.get('error')}")
+        return factors
+
+    def to_dict(self, render_explanations: bool = True) -> Dict[str, Any]:
+        """
+        Returns a new dict of the assessment. Nested lists and dicts are copied too,
+        so callers can modify the result without affecting this object.
+
+        With render_explanations=False, explanation_factors that can be re-rendered from
+        factor_breakdown are left out, which keeps stored assessments compact.
+        """
         # Ensure all attributes, including optional ones, are included if they exist
         data = {
             "application_id": self.application_id,
@@ -73,13 +207,26 @@ class RiskAssessmentOutput:
             "confidence_level": self.confidence_level,
             "decision": self.decision,
             "recommended_premium": self.recommended_premium,
-            "premium_breakdown": self.premium_breakdown,
-            "risk_mitigation_recommendations": self.risk_mitigation_recommendations,
-            "required_documentation": self.required_documentation,
-            "explanation_factors": self.explanation_factors,
+            "premium_breakdown": dict(self.premium_breakdown),
+            "risk_mitigation_recommendations": list(self.risk_mitigation_recommendations),
+            "required_documentation": list(self.required_documentation),
         }
+        if render_explanations or self._explanation_factors is not None or self.factor_breakdown is None:
+            data["explanation_factors"] = list(self.explanation_factors)
         if self.health_inspection_summary is not None:
-            data["health_inspection_summary"] = self.health_inspection_summary
+            data["health_inspection_summary"] = dict(self.health_inspection_summary)
         if self.crime_statistics_summary is not None:
-            data["crime_statistics_summary"] = self.crime_statistics_summary
+            data["crime_statistics_summary"] = dict(self.crime_statistics_summary)
+        if self.factor_breakdown is not None:
+            data["factor_breakdown"] = self.factor_breakdown.to_dict()
+        if self.config_version is not None:
+            data["config_version"] = self.config_version
         return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'RiskAssessmentOutput':
+        """Builds an assessment from a to_dict() result."""
+        data = dict(data)
+        if data.get("factor_breakdown") is not None:
+            data["factor_breakdown"] = RiskFactorBreakdown.from_dict(data["factor_breakdown"])
+        return cls(**data)
@@ -0,0 +1,24 @@
+from typing import Optional
+from .base import ApplicationStore
+from .memory import InMemoryApplicationStore
+from .sqlite import SQLiteApplicationStore
+
+
+def create_store(url: Optional[str]) -> ApplicationStore:
+    """
+    Builds a store from a URL: "memory" (or empty) for the in-memory default,
+    or "sqlite:///<path>" for a SQLite database file.
+    """
+    if not url or url == "memory":
+        return InMemoryApplicationStore()
+    if url.startswith("sqlite:///"):
+        return SQLiteApplicationStore(url[len("sqlite:///"):])
+    raise ValueError(f"Unsupported application store URL: {url}")
+
+
+__all__ = [
+    'ApplicationStore',
+    'InMemoryApplicationStore',
+    'SQLiteApplicationStore',
+    'create_store'
+]
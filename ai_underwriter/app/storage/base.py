@@ -0,0 +1,46 @@
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+
+class ApplicationStore(ABC):
+    """
+    Storage for submitted applications, their assessments and async assessment status.
+
+    Backends store plain JSON-serializable dicts keyed by application_id.
+    """
+
+    @abstractmethod
+    def save_application(self, application_id: str, application: Dict[str, Any]) -> None: ...
+
+    @abstractmethod
+    def get_application(self, application_id: str) -> Optional[Dict[str, Any]]: ...
+
+    @abstractmethod
+    def delete_application(self, application_id: str) -> None: ...
+
+    @abstractmethod
+    def save_assessment(self, application_id: str, assessment: Dict[str, Any]) -> None: ...
+
+    @abstractmethod
+    def get_assessment(self, application_id: str) -> Optional[Dict[str, Any]]: ...
+
+    @abstractmethod
+    def set_status(self, application_id: str, status: Dict[str, Any]) -> None: ...
+
+    @abstractmethod
+    def get_status(self, application_id: str) -> Optional[Dict[str, Any]]: ...
+
+    @abstractmethod
+    def delete_status(self, application_id: str) -> None: ...
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """
+        Groups the writes made inside the block so a backend can commit them together.
+        Backends without transactions treat this as a no-op.
+        """
+        yield
+
+    def close(self) -> None:
+        pass
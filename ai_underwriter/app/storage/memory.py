@@ -0,0 +1,41 @@
+from typing import Any, Dict, Optional
+from .base import ApplicationStore
+
+
+class InMemoryApplicationStore(ApplicationStore):
+    """
+    Default store backed by plain dicts. Contents are lost on restart and not shared
+    between processes. The dicts can be passed in so callers can inspect them directly.
+    """
+
+    def __init__(self,
+                 applications: Optional[Dict[str, Dict[str, Any]]] = None,
+                 assessments: Optional[Dict[str, Dict[str, Any]]] = None,
+                 statuses: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.applications = applications if applications is not None else {}
+        self.assessments = assessments if assessments is not None else {}
+        self.statuses = statuses if statuses is not None else {}
+
+    def save_application(self, application_id: str, application: Dict[str, Any]) -> None:
+        self.applications[application_id] = application
+
+    def get_application(self, application_id: str) -> Optional[Dict[str, Any]]:
+        return self.applications.get(application_id)
+
+    def delete_application(self, application_id: str) -> None:
+        self.applications.pop(application_id, None)
+
+    def save_assessment(self, application_id: str, assessment: Dict[str, Any]) -> None:
+        self.assessments[application_id] = assessment
+
+    def get_assessment(self, application_id: str) -> Optional[Dict[str, Any]]:
+        return self.assessments.get(application_id)
+
+    def set_status(self, application_id: str, status: Dict[str, Any]) -> None:
+        self.statuses[application_id] = status
+
+    def get_status(self, application_id: str) -> Optional[Dict[str, Any]]:
+        return self.statuses.get(application_id)
+
+    def delete_status(self, application_id: str) -> None:
+        self.statuses.pop(application_id, None)
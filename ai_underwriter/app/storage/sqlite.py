@@ -0,0 +1,137 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+from .base import ApplicationStore
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS applications (
+    application_id TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS assessments (
+    application_id TEXT PRIMARY KEY,
+    decision TEXT,
+    risk_score REAL,
+    data TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_assessments_decision ON assessments (decision);
+CREATE INDEX IF NOT EXISTS idx_assessments_risk_score ON assessments (risk_score);
+CREATE TABLE IF NOT EXISTS assessment_status (
+    application_id TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+# Statements are kept constant so each connection's statement cache reuses the compiled form.
+_UPSERT_APPLICATION = "INSERT OR REPLACE INTO applications (application_id, data, created_at) VALUES (?, ?, ?)"
+_SELECT_APPLICATION = "SELECT data FROM applications WHERE application_id = ?"
+_DELETE_APPLICATION = "DELETE FROM applications WHERE application_id = ?"
+_UPSERT_ASSESSMENT = ("INSERT OR REPLACE INTO assessments (application_id, decision, risk_score, data, created_at) "
+                      "VALUES (?, ?, ?, ?, ?)")
+_SELECT_ASSESSMENT = "SELECT data FROM assessments WHERE application_id = ?"
+_UPSERT_STATUS = "INSERT OR REPLACE INTO assessment_status (application_id, data, updated_at) VALUES (?, ?, ?)"
+_SELECT_STATUS = "SELECT data FROM assessment_status WHERE application_id = ?"
+_DELETE_STATUS = "DELETE FROM assessment_status WHERE application_id = ?"
+
+
+class SQLiteApplicationStore(ApplicationStore):
+    """
+    Persistent store in a SQLite database running in WAL mode.
+
+    Several worker processes can share one database file: WAL lets readers proceed
+    while a writer commits, and busy_timeout makes competing writers wait rather than
+    fail. Each thread gets its own connection. Writes commit immediately unless they
+    are made inside batch(), which commits them in a single transaction.
+    """
+
+    def __init__(self, path: str, busy_timeout_ms: int = 5000):
+        # Connections are per thread, so path must be a file rather than ":memory:".
+        self.path = path
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+        self._connection().executescript(_SCHEMA)
+        logger.info(f"SQLiteApplicationStore initialized at {path}.")
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            # isolation_level=None: autocommit unless a transaction is opened explicitly.
+            connection = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False,
+                                         cached_statements=32)
+            connection.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.execute("PRAGMA synchronous = NORMAL")
+            self._local.connection = connection
+            self._local.batch_depth = 0
+        return connection
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        connection = self._connection()
+        if self._local.batch_depth:
+            yield connection
+            return
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        with self._transaction():
+            self._local.batch_depth += 1
+            try:
+                yield
+            finally:
+                self._local.batch_depth -= 1
+
+    def _write(self, statement: str, parameters: tuple) -> None:
+        with self._transaction() as connection:
+            connection.execute(statement, parameters)
+
+    def _read(self, statement: str, application_id: str) -> Optional[Dict[str, Any]]:
+        row = self._connection().execute(statement, (application_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save_application(self, application_id: str, application: Dict[str, Any]) -> None:
+        self._write(_UPSERT_APPLICATION, (application_id, json.dumps(application), time.time()))
+
+    def get_application(self, application_id: str) -> Optional[Dict[str, Any]]:
+        return self._read(_SELECT_APPLICATION, application_id)
+
+    def delete_application(self, application_id: str) -> None:
+        self._write(_DELETE_APPLICATION, (application_id,))
+
+    def save_assessment(self, application_id: str, assessment: Dict[str, Any]) -> None:
+        self._write(_UPSERT_ASSESSMENT, (application_id, assessment.get("decision"), assessment.get("risk_score"),
+                                         json.dumps(assessment), time.time()))
+
+    def get_assessment(self, application_id: str) -> Optional[Dict[str, Any]]:
+        return self._read(_SELECT_ASSESSMENT, application_id)
+
+    def set_status(self, application_id: str, status: Dict[str, Any]) -> None:
+        self._write(_UPSERT_STATUS, (application_id, json.dumps(status), time.time()))
+
+    def get_status(self, application_id: str) -> Optional[Dict[str, Any]]:
+        return self._read(_SELECT_STATUS, application_id)
+
+    def delete_status(self, application_id: str) -> None:
+        self._write(_DELETE_STATUS, (application_id,))
+
+    def close(self) -> None:
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
@@ -0,0 +1,87 @@
+import re
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+_NON_WORD = re.compile(r"[^\w\s]")
+_ZIP_CODE = re.compile(r"^(\d{5})(?:-\d{4})?$")
+_STATE = re.compile(r"^[A-Za-z]{2}$")
+
+# USPS standard abbreviations for street suffixes and directionals.
+STREET_ABBREVIATIONS = {
+    "street": "st", "avenue": "ave", "av": "ave", "road": "rd", "boulevard": "blvd", "drive": "dr",
+    "lane": "ln", "court": "ct", "place": "pl", "terrace": "ter", "parkway": "pkwy", "highway": "hwy",
+    "square": "sq", "circle": "cir", "trail": "trl", "plaza": "plz",
+    "north": "n", "south": "s", "east": "e", "west": "w",
+    "northeast": "ne", "northwest": "nw", "southeast": "se", "southwest": "sw",
+}
+
+
+@lru_cache(maxsize=8192)
+def normalize_address_text(text: str) -> str:
+    """'123  Main Street.' -> '123 main st': lowercased, punctuation dropped, suffixes abbreviated."""
+    return " ".join(STREET_ABBREVIATIONS.get(token, token) for token in _NON_WORD.sub(" ", text.lower()).split())
+
+
+def address_match_text(text: str) -> str:
+    """
+    normalize_address_text(text) padded with a space on each side. A keyword in this
+    form is a substring of an address in this form only where it starts and ends on
+    token boundaries: " 12 n st " is not found in " 12 n star rd ". Empty text stays
+    empty, so an empty keyword still matches every address.
+    """
+    normalized = normalize_address_text(text)
+    return f" {normalized} " if normalized else ""
+
+
+class ParsedAddress(NamedTuple):
+    """
+    Components of a free-text address, normalized with normalize_address_text
+    (state upper-cased, ZIP+4 cut to five digits). Missing components are None.
+    """
+    street: str
+    city: Optional[str] = None
+    state: Optional[str] = None
+    zip_code: Optional[str] = None
+    unit: Optional[str] = None
+
+    @property
+    def key(self) -> str:
+        """Canonical key: equal for any two spellings of the same address."""
+        return "|".join((self.street, self.city or "", self.state or "", self.zip_code or ""))
+
+
+@lru_cache(maxsize=8192)
+def parse_address(address: str) -> ParsedAddress:
+    """
+    Parses "street[, city][, state zip]" style addresses. A leading part without a
+    house number ("Unit A, 999 Danger Ave, ...") is taken as the unit. Results are
+    memoized, so repeated addresses are parsed once.
+    """
+    parts = [part.strip() for part in address.split(",") if part.strip()]
+    street_at = next((i for i, part in enumerate(parts) if part[0].isdigit()), 0)
+    unit = ", ".join(parts[:street_at]) or None
+    street = parts[street_at] if parts else ""
+    rest = parts[street_at + 1:]
+
+    # Peel "12345", then "ST", off the end (within one part or as parts of their own);
+    # whatever is left of the last remaining part is the city.
+    city = state = zip_code = None
+    tokens = rest.pop().split() if rest else []
+    if tokens and _ZIP_CODE.match(tokens[-1]):
+        zip_code = _ZIP_CODE.match(tokens.pop()).group(1)
+        if not tokens and rest:
+            tokens = rest.pop().split()
+    if tokens and _STATE.match(tokens[-1]) and (zip_code or rest or len(tokens) > 1 or tokens[-1].isupper()):
+        state = tokens.pop().upper()
+        if not tokens and rest:
+            tokens = rest.pop().split()
+    if tokens:
+        city = " ".join(tokens)
+
+    return ParsedAddress(
+        street=normalize_address_text(street),
+        city=normalize_address_text(city) or None if city else None,
+        state=state,
+        zip_code=zip_code,
+        unit=normalize_address_text(unit) or None if unit else None,
+    )
@@ -0,0 +1,55 @@
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+
+class DeadlineExceeded(Exception):
+    """Raised when work is skipped or abandoned because the request's deadline has passed."""
+
+
+class Deadline:
+    """
+    The point in time by which a request's work has to be done.
+
+    Created once when a request arrives and handed down to everything working for it,
+    so each step can see how much of the request's budget is left rather than
+    applying its own full timeout.
+    """
+    __slots__ = ('expires_at', '_clock')
+
+    def __init__(self, seconds: float, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self.expires_at = clock() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - self._clock())
+
+    def expired(self) -> bool:
+        return self._clock() >= self.expires_at
+
+    def cap(self, timeout: float) -> float:
+        """The smaller of timeout and the remaining budget."""
+        return min(timeout, self.remaining())
+
+
+_current_deadline: "contextvars.ContextVar[Optional[Deadline]]" = contextvars.ContextVar("deadline", default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """The deadline of the request being served in this context, if any."""
+    return _current_deadline.get()
+
+
+@contextmanager
+def deadline_scope(deadline: Optional[Deadline]) -> Iterator[Optional[Deadline]]:
+    """
+    Makes deadline the current deadline inside the block (and in asyncio tasks
+    created there). Pool threads do not inherit it, so work submitted to a thread
+    pool has to enter the scope itself.
+    """
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
@@ -0,0 +1,73 @@
+import logging
+import os
+import threading
+from typing import Callable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (mtime in nanoseconds, size in bytes), or None if the file does not exist
+FileSignature = Optional[Tuple[int, int]]
+
+
+def file_signature(path: str) -> FileSignature:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class FileWatcher:
+    """
+    Polls a file's modification time and size from a background thread and calls
+    on_change(path) when either differs from the last successfully handled version.
+
+    on_change returns True once it has handled the change. If it returns False or
+    raises, the change is retried at the next poll, which covers files that were
+    read while still being written. A file that disappears is ignored until it
+    comes back.
+    """
+
+    def __init__(self, path: str, on_change: Callable[[str], bool], interval: float = 5.0,
+                 signature: FileSignature = None, name: str = "file-watcher"):
+        self.path = path
+        self.interval = interval
+        self._on_change = on_change
+        # Pass the signature taken when the file was last loaded so the first poll
+        # does not reload it again.
+        self._signature = signature if signature is not None else file_signature(path)
+        self._name = name
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def check(self) -> bool:
+        """Polls once. Returns True if a change was detected and handled."""
+        signature = file_signature(self.path)
+        if signature is None or signature == self._signature:
+            return False
+        try:
+            handled = self._on_change(self.path)
+        except Exception as e:
+            logger.error(f"Error handling change to {self.path}: {e}", exc_info=True)
+            return False
+        if handled:
+            self._signature = signature
+        return bool(handled)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+        self._thread.start()
+        logger.info(f"Watching {self.path} for changes every {self.interval}s.")
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.check()
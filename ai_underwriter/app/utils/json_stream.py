@@ -0,0 +1,139 @@
+import codecs
+import json
+from typing import Any, BinaryIO, Iterator, Optional, Tuple
+
+# (record index, parsed value or None, error message or None)
+JsonRecord = Tuple[int, Any, Optional[str]]
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = " \t\r\n"
+
+
+class _ChunkReader:
+    """Decodes a binary stream into text incrementally, one chunk at a time."""
+
+    def __init__(self, stream: BinaryIO, chunk_size: int):
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+        self.exhausted = False
+
+    def read(self) -> str:
+        if self.exhausted:
+            return ""
+        chunk = self._stream.read(self._chunk_size)
+        if not chunk:
+            self.exhausted = True
+            return self._decoder.decode(b"", final=True)
+        if isinstance(chunk, str):
+            return chunk
+        return self._decoder.decode(chunk)
+
+
+def iter_json_records(stream: BinaryIO, chunk_size: int = 64 * 1024,
+                      max_record_chars: int = 1024 * 1024) -> Iterator[JsonRecord]:
+    """
+    Lazily parses records from a stream holding either a JSON array or NDJSON.
+
+    The format is detected from the first non-whitespace character. Only one chunk
+    plus the record being parsed is held in memory at a time, and a record longer
+    than max_record_chars is rejected rather than buffered. An invalid NDJSON line
+    yields an error for that record and parsing continues with the next line; an
+    invalid array element yields an error and ends the stream, since the rest of the
+    array cannot be resynchronised.
+    """
+    reader = _ChunkReader(stream, chunk_size)
+    buffer = ""
+    while not reader.exhausted and not buffer.lstrip(_WHITESPACE):
+        buffer += reader.read()
+    buffer = buffer.lstrip(_WHITESPACE)
+    if not buffer:
+        return
+    if buffer[0] == "[":
+        yield from _iter_array(reader, buffer[1:], max_record_chars)
+    else:
+        yield from _iter_lines(reader, buffer, max_record_chars)
+
+
+def _iter_lines(reader: _ChunkReader, buffer: str, max_record_chars: int) -> Iterator[JsonRecord]:
+    index = 0
+    skipping = False # True while discarding the rest of an oversized line
+    while True:
+        lines = buffer.split("\n")
+        buffer = "" if reader.exhausted else lines.pop()
+        if skipping:
+            if lines:
+                lines.pop(0) # Tail of the oversized line
+                skipping = False
+            else:
+                buffer = ""
+        if not skipping and len(buffer) > max_record_chars:
+            lines.append(buffer)
+            buffer = ""
+            skipping = True
+        for line in lines:
+            if len(line) > max_record_chars:
+                yield index, None, f"Record exceeds {max_record_chars} characters"
+                index += 1
+                continue
+            if not line.strip(_WHITESPACE):
+                continue
+            try:
+                yield index, json.loads(line), None
+            except json.JSONDecodeError as e:
+                yield index, None, f"Invalid JSON: {e}"
+            index += 1
+        if reader.exhausted:
+            return
+        buffer += reader.read()
+
+
+def _iter_array(reader: _ChunkReader, buffer: str, max_record_chars: int) -> Iterator[JsonRecord]:
+    index = 0
+    position = 0
+    expect_value = True # False once a value has been read and a ',' or ']' must follow
+    while True:
+        while position < len(buffer) and buffer[position] in _WHITESPACE:
+            position += 1
+        if position >= len(buffer):
+            if reader.exhausted:
+                yield index, None, "Unexpected end of JSON array"
+                return
+            buffer = buffer[position:] + reader.read()
+            position = 0
+            continue
+
+        char = buffer[position]
+        if char == "]" and (not expect_value or index == 0):
+            return
+        if not expect_value:
+            if char != ",":
+                yield index, None, f"Expected ',' or ']' but found {char!r}"
+                return
+            position += 1
+            expect_value = True
+            continue
+
+        try:
+            value, end = _DECODER.raw_decode(buffer, position)
+        except json.JSONDecodeError as e:
+            if reader.exhausted:
+                yield index, None, f"Invalid JSON: {e}"
+                return
+            if len(buffer) - position > max_record_chars:
+                yield index, None, f"Record exceeds {max_record_chars} characters"
+                return
+            # The value is probably cut off by the chunk boundary; read more and retry.
+            buffer = buffer[position:] + reader.read()
+            position = 0
+            continue
+        if end == len(buffer) and not reader.exhausted:
+            # A bare number at the end of the buffer may continue in the next chunk.
+            buffer = buffer[position:] + reader.read()
+            position = 0
+            continue
+
+        yield index, value, None
+        index += 1
+        position = end
+        expect_value = False
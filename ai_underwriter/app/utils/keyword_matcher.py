@@ -0,0 +1,172 @@
+from bisect import bisect_left
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Names of the arrays produced by KeywordMatcher.tables() and accepted by FlatKeywordMatcher.
+TABLE_NAMES = ('fail', 'best', 'edge_start', 'edge_chars', 'edge_targets')
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick multi-pattern matcher.
+
+    Each keyword is registered with an integer priority (lower wins). A single pass
+    over the text finds every keyword occurring as a substring and returns the
+    lowest priority among them, which lets callers reproduce "first record in
+    list order whose keyword matches" without scanning the records.
+    """
+
+    def __init__(self, keywords: Iterable[Tuple[str, int]] = ()):
+        # State 0 is the root. Transitions are stored per state as small dicts.
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Best (lowest) priority of any keyword ending at this state, following fail links.
+        self._best: List[Optional[int]] = [None]
+        self._empty_keyword_priority: Optional[int] = None
+        self._keyword_count = 0
+        for keyword, priority in keywords:
+            self._add(keyword, priority)
+        self._build()
+
+    def __len__(self) -> int:
+        return self._keyword_count
+
+    def _add(self, keyword: str, priority: int) -> None:
+        self._keyword_count += 1
+        if not keyword:
+            # An empty keyword is a substring of every text.
+            if self._empty_keyword_priority is None or priority < self._empty_keyword_priority:
+                self._empty_keyword_priority = priority
+            return
+
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._best.append(None)
+            state = next_state
+        current = self._best[state]
+        if current is None or priority < current:
+            self._best[state] = priority
+
+    def _build(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail_state = self._fail[state]
+                while fail_state and char not in self._goto[fail_state]:
+                    fail_state = self._fail[fail_state]
+                self._fail[next_state] = self._goto[fail_state].get(char, 0)
+                inherited = self._best[self._fail[next_state]]
+                if inherited is not None:
+                    own = self._best[next_state]
+                    if own is None or inherited < own:
+                        self._best[next_state] = inherited
+
+    def tables(self) -> Dict[str, Any]:
+        """
+        Flattens the automaton into integer arrays that FlatKeywordMatcher can use
+        directly, e.g. from a memory-mapped file. Priorities must be non-negative.
+
+        fail and best have one entry per state (best is -1 where no keyword ends).
+        The transitions of state s are edge_chars/edge_targets[edge_start[s]:edge_start[s + 1]],
+        with the characters given as code points in ascending order.
+        """
+        edge_start, edge_chars, edge_targets = [], [], []
+        for transitions in self._goto:
+            edge_start.append(len(edge_chars))
+            for char in sorted(transitions):
+                edge_chars.append(ord(char))
+                edge_targets.append(transitions[char])
+        edge_start.append(len(edge_chars))
+        return {
+            'keyword_count': self._keyword_count,
+            'empty_keyword_priority': self._empty_keyword_priority,
+            'fail': list(self._fail),
+            'best': [-1 if best is None else best for best in self._best],
+            'edge_start': edge_start,
+            'edge_chars': edge_chars,
+            'edge_targets': edge_targets,
+        }
+
+    def best_match(self, text: str) -> Optional[int]:
+        """
+        Returns the lowest priority of any keyword contained in text, or None.
+        """
+        best = self._empty_keyword_priority
+        goto = self._goto
+        fail = self._fail
+        best_at = self._best
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            found = best_at[state]
+            if found is not None and (best is None or found < best):
+                best = found
+        return best
+
+
+class FlatKeywordMatcher:
+    """
+    KeywordMatcher over the flat arrays of KeywordMatcher.tables().
+
+    The arrays can be any integer sequences, such as memoryviews into a memory-mapped
+    file, so a prebuilt automaton is used in place without being copied into Python objects.
+    """
+
+    def __init__(self, keyword_count: int, empty_keyword_priority: Optional[int], fail: Sequence[int],
+                 best: Sequence[int], edge_start: Sequence[int], edge_chars: Sequence[int], edge_targets: Sequence[int]):
+        self._keyword_count = keyword_count
+        self._empty_keyword_priority = empty_keyword_priority
+        self._fail = fail
+        self._best = best
+        self._edge_start = edge_start
+        self._edge_chars = edge_chars
+        self._edge_targets = edge_targets
+
+    def __len__(self) -> int:
+        return self._keyword_count
+
+    def tables(self) -> Dict[str, Any]:
+        return {
+            'keyword_count': self._keyword_count,
+            'empty_keyword_priority': self._empty_keyword_priority,
+            **{name: list(getattr(self, '_' + name)) for name in TABLE_NAMES},
+        }
+
+    def _goto(self, state: int, code: int) -> int:
+        """Returns the transition of state on code, or -1."""
+        start = self._edge_start[state]
+        end = self._edge_start[state + 1]
+        position = bisect_left(self._edge_chars, code, start, end)
+        if position < end and self._edge_chars[position] == code:
+            return self._edge_targets[position]
+        return -1
+
+    def best_match(self, text: str) -> Optional[int]:
+        """
+        Returns the lowest priority of any keyword contained in text, or None.
+        """
+        best = self._empty_keyword_priority
+        fail = self._fail
+        best_at = self._best
+        state = 0
+        for char in text:
+            code = ord(char)
+            next_state = self._goto(state, code)
+            while next_state < 0 and state:
+                state = fail[state]
+                next_state = self._goto(state, code)
+            state = next_state if next_state >= 0 else 0
+            found = best_at[state]
+            if found >= 0 and (best is None or found < best):
+                best = found
+        return best
@@ -0,0 +1,74 @@
+import math
+from typing import List
+
+
+class P2Quantile:
+    """
+    Streaming estimate of one quantile of a series of observations (the P² algorithm,
+    Jain & Chlamtac, 1985).
+
+    Keeps five markers (minimum, q/2, q, (1+q)/2 and maximum) whose heights are
+    adjusted with a piecewise-parabolic fit as observations arrive, so memory and
+    per-observation cost are constant however many values are seen. The first five
+    observations are kept exactly. Not thread-safe; callers serialize add().
+    """
+    __slots__ = ('quantile', 'count', '_heights', '_positions', '_desired', '_increments')
+
+    def __init__(self, quantile: float):
+        if not 0.0 < quantile < 1.0:
+            raise ValueError(f"quantile must be between 0 and 1, got {quantile}")
+        self.quantile = quantile
+        self.count = 0
+        self._heights: List[float] = []
+        self._positions = [1, 2, 3, 4, 5]
+        self._desired = [1.0, 1.0 + 2 * quantile, 1.0 + 4 * quantile, 3.0 + 2 * quantile, 5.0]
+        self._increments = [0.0, quantile / 2, quantile, (1.0 + quantile) / 2, 1.0]
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        heights = self._heights
+        if self.count <= 5:
+            heights.append(value)
+            heights.sort()
+            return
+
+        if value < heights[0]:
+            heights[0] = value
+            cell = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            cell = 3
+        else:
+            cell = 0
+            while value >= heights[cell + 1]:
+                cell += 1
+        positions = self._positions
+        for i in range(cell + 1, 5):
+            positions[i] += 1
+        for i in range(5):
+            self._desired[i] += self._increments[i]
+
+        for i in (1, 2, 3):
+            offset = self._desired[i] - positions[i]
+            if (offset >= 1 and positions[i + 1] - positions[i] > 1) or (offset <= -1 and positions[i - 1] - positions[i] < -1):
+                step = 1 if offset > 0 else -1
+                height = self._parabolic(i, step)
+                if not heights[i - 1] < height < heights[i + 1]:
+                    height = heights[i] + step * (heights[i + step] - heights[i]) / (positions[i + step] - positions[i])
+                heights[i] = height
+                positions[i] += step
+
+    def _parabolic(self, i: int, step: int) -> float:
+        heights, positions = self._heights, self._positions
+        return heights[i] + step / (positions[i + 1] - positions[i - 1]) * (
+            (positions[i] - positions[i - 1] + step) * (heights[i + 1] - heights[i]) / (positions[i + 1] - positions[i])
+            + (positions[i + 1] - positions[i] - step) * (heights[i] - heights[i - 1]) / (positions[i] - positions[i - 1]))
+
+    def value(self) -> float:
+        """The current estimate; NaN before any observation."""
+        if self.count == 0:
+            return math.nan
+        if self.count <= 5:
+            # Exact quantile of the few values seen (nearest rank).
+            return self._heights[min(len(self._heights) - 1, max(0, math.ceil(self.quantile * self.count) - 1))]
+        return self._heights[2]
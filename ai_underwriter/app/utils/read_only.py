@@ -0,0 +1,25 @@
+from typing import Any, NoReturn
+
+
+class ReadOnlyDict(dict):
+    """
+    A dict that cannot be modified after construction.
+
+    Used for values that are built once and then shared between callers, such as
+    precomputed lookup results. It is still a dict, so it serializes with json and
+    Flask as usual; dict(value) gives a modifiable copy.
+    """
+    __slots__ = ()
+
+    def _read_only(self, *args: Any, **kwargs: Any) -> NoReturn:
+        raise TypeError(f"{type(self).__name__} is read-only; copy it with dict() to modify")
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self):
+        # Pickle and copy rebuild from a plain dict instead of item by item.
+        return type(self), (dict(self),)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict.__repr__(self)})"
@@ -0,0 +1,53 @@
+import math
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+METERS_PER_DEGREE_LATITUDE = 111_320.0
+
+# (latitude, longitude, value)
+GeoPoint = Tuple[float, float, Any]
+
+
+class GridIndex:
+    """
+    Bucket map of geographic points on a fixed latitude/longitude grid.
+
+    A radius query only visits the cells overlapping the circle's bounding box, so
+    its cost depends on the local point density, not on the total number of points.
+    Distances use an equirectangular projection around the query point, which is
+    accurate to well under 1% for radii of a few kilometres.
+    """
+
+    def __init__(self, points: Iterable[GeoPoint] = (), cell_size_degrees: float = 0.01):
+        self.cell_size = cell_size_degrees
+        self._cells: Dict[Tuple[int, int], List[GeoPoint]] = {}
+        self._count = 0
+        for point in points:
+            self.add(*point)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _cell(self, latitude: float, longitude: float) -> Tuple[int, int]:
+        return math.floor(latitude / self.cell_size), math.floor(longitude / self.cell_size)
+
+    def add(self, latitude: float, longitude: float, value: Any) -> None:
+        self._cells.setdefault(self._cell(latitude, longitude), []).append((latitude, longitude, value))
+        self._count += 1
+
+    def query_radius(self, latitude: float, longitude: float, radius_m: float) -> Iterator[GeoPoint]:
+        """Yields every point within radius_m metres of (latitude, longitude)."""
+        # Clamped so the longitude span stays finite at the poles.
+        meters_per_degree_longitude = max(METERS_PER_DEGREE_LATITUDE * math.cos(math.radians(latitude)), 1.0)
+        lat_span = radius_m / METERS_PER_DEGREE_LATITUDE
+        lon_span = radius_m / meters_per_degree_longitude
+        min_row, min_col = self._cell(latitude - lat_span, longitude - lon_span)
+        max_row, max_col = self._cell(latitude + lat_span, longitude + lon_span)
+        radius_squared = radius_m * radius_m
+        cells = self._cells
+        for row in range(min_row, max_row + 1):
+            for col in range(min_col, max_col + 1):
+                for point in cells.get((row, col), ()):
+                    dy = (point[0] - latitude) * METERS_PER_DEGREE_LATITUDE
+                    dx = (point[1] - longitude) * meters_per_degree_longitude
+                    if dx * dx + dy * dy <= radius_squared:
+                        yield point
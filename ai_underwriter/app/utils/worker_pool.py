@@ -0,0 +1,44 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class BoundedWorkerPool:
+    """
+    Thread pool with a bounded backlog.
+
+    At most max_workers tasks run at once and at most max_queue more wait for a
+    worker. submit() never blocks: once the backlog is full it returns False so the
+    caller can shed load instead of queueing without limit.
+    """
+
+    def __init__(self, max_workers: int = 4, max_queue: int = 100, thread_name_prefix: str = "worker"):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+        logger.info(f"BoundedWorkerPool initialized with {max_workers} workers and a backlog of {max_queue}.")
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> bool:
+        """Schedules fn(*args, **kwargs). Returns False without scheduling if the pool is full."""
+        if not self._slots.acquire(blocking=False):
+            logger.warning("Worker pool backlog is full; rejecting task.")
+            return False
+        try:
+            future = self._executor.submit(fn, *args, **kwargs)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(self._on_done)
+        return True
+
+    def _on_done(self, future) -> None:
+        self._slots.release()
+        if not future.cancelled() and future.exception() is not None:
+            logger.error(f"Background task failed: {future.exception()}", exc_info=future.exception())
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
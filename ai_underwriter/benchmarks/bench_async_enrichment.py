@@ -0,0 +1,81 @@
+"""
+Throughput benchmark for enrichment against slow upstream sources: threaded vs asyncio.
+
+Enriches the same submissions (health and crime lookups, no cache) through the
+threaded EnrichmentExecutor, whose pool size bounds the lookups in flight, and
+through the asyncio clients on one event loop. Each lookup waits the given
+stand-in upstream latency. Reports submissions per second for each path.
+
+Usage (from the project root):
+    python ai_underwriter/benchmarks/bench_async_enrichment.py [submissions] [latency_seconds] [pool_workers]
+"""
+import asyncio
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.clients.async_clients import (UpstreamLatency, SlowUpstreamClient,  # noqa: E402
+                                       AsyncSimulatedHealthInspectionClient, AsyncMockCrimeStatisticsClient)
+from app.clients.crime_statistics_client import MockCrimeStatisticsClient  # noqa: E402
+from app.clients.enrichment import EnrichmentExecutor  # noqa: E402
+from app.clients.health_inspection_client import SimulatedHealthInspectionClient  # noqa: E402
+
+
+def locations(count: int):
+    return [(f"Bench Bistro {i}", f"{i} Bench St, Loadville, FS 00000") for i in range(count)]
+
+
+def measure_threaded(submissions, latency: UpstreamLatency, health_client, pool_workers: int) -> float:
+    health = SlowUpstreamClient(health_client, latency)
+    crime = SlowUpstreamClient(MockCrimeStatisticsClient(), latency)
+    executor = EnrichmentExecutor(max_workers=pool_workers, default_timeout=600.0)
+    requests = [(name, {"health": lambda name=name, address=address: health.get_inspection_data(business_name=name, address=address),
+                        "crime": lambda address=address: crime.get_crime_data(address=address)})
+                for name, address in submissions]
+    started = time.perf_counter()
+    executor.enrich_many(requests)
+    elapsed = time.perf_counter() - started
+    executor.shutdown()
+    return len(submissions) / elapsed
+
+
+def measure_async(submissions, latency: UpstreamLatency, health_client) -> float:
+    health = AsyncSimulatedHealthInspectionClient(health_client, latency=latency)
+    crime = AsyncMockCrimeStatisticsClient(latency=latency)
+    executor = EnrichmentExecutor(max_workers=1, default_timeout=600.0) # Only its timeouts are used
+
+    async def run():
+        await asyncio.gather(*(executor.enrich_async(
+            {"health": lambda name=name, address=address: health.get_inspection_data(business_name=name, address=address),
+             "crime": lambda address=address: crime.get_crime_data(address=address)}, request_label=name)
+            for name, address in submissions))
+
+    started = time.perf_counter()
+    asyncio.run(run())
+    elapsed = time.perf_counter() - started
+    executor.shutdown()
+    return len(submissions) / elapsed
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    latency = UpstreamLatency(seconds=float(sys.argv[2]) if len(sys.argv) > 2 else 0.1)
+    pool_workers = int(sys.argv[3]) if len(sys.argv) > 3 else 8
+    logging.disable(logging.CRITICAL)
+    health_client = SimulatedHealthInspectionClient()
+    submissions = locations(count)
+
+    threaded = measure_threaded(submissions, latency, health_client, pool_workers)
+    asynchronous = measure_async(submissions, latency, health_client)
+
+    print(f"Enriching {count:,} submissions, {latency.seconds * 1000:.0f} ms per upstream lookup")
+    print(f"{f'threaded ({pool_workers} workers)':<22} {threaded:10,.0f} submissions/s")
+    print(f"{'asyncio (1 thread)':<22} {asynchronous:10,.0f} submissions/s")
+    print(f"asyncio is {asynchronous / threaded:.1f}x the threaded throughput.")
+
+
+if __name__ == '__main__':
+    main()
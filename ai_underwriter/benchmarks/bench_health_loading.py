@@ -0,0 +1,79 @@
+"""
+Load benchmark for the simulated health inspection dataset.
+
+Writes a synthetic dataset of the given size (as a JSON array and as NDJSON), then
+loads it with json.load and with the streaming loader, reporting load time, the
+memory retained by the loaded client and the peak traced memory during the load.
+
+Usage (from the project root):
+    python ai_underwriter/benchmarks/bench_health_loading.py [establishments]
+"""
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.clients.health_inspection_client import SimulatedHealthInspectionClient  # noqa: E402
+
+
+def synthetic_record(i: int) -> dict:
+    return {
+        "establishment_id": f"EST_{i:08d}", "business_name": f"Establishment {i}",
+        "address": f"{i} Benchmark Blvd, Loadville, FS 00000", "search_keywords": [f"{i} benchmark blvd"],
+        "last_inspection": {
+            "inspection_id": f"INSP_{i:08d}", "inspection_date": "2024-05-01", "inspection_type": "Routine",
+            "score": 60 + i % 40, "grade": "ABC"[i % 3], "status": "Pass",
+            "inspector_notes": "Synthetic inspection generated for load benchmarking.",
+            "violations": [
+                {"violation_code": f"{v:02d}A", "description": "Synthetic violation description.",
+                 "severity": "Critical" if v % 3 == 0 else "Minor", "corrective_action": "Corrected on site.",
+                 "repeat_offense": False}
+                for v in range(i % 8)
+            ]
+        },
+        "historical_summary": {"critical_violations_last_12_months": i % 5}
+    }
+
+
+def measure(path: str, streaming: bool):
+    tracemalloc.start()
+    started = time.perf_counter()
+    client = SimulatedHealthInspectionClient(api_key="bench", data_file_path=path, streaming=streaming,
+                                             keep_violations=False)
+    elapsed = time.perf_counter() - started
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(client.simulated_data), elapsed, retained, peak
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    logging.disable(logging.CRITICAL)
+    with tempfile.TemporaryDirectory() as directory:
+        array_path = os.path.join(directory, "health.json")
+        ndjson_path = os.path.join(directory, "health.ndjson")
+        with open(array_path, "w") as array_file, open(ndjson_path, "w") as ndjson_file:
+            array_file.write("[")
+            for i in range(count):
+                line = json.dumps(synthetic_record(i))
+                array_file.write(("," if i else "") + line)
+                ndjson_file.write(line + "\n")
+            array_file.write("]")
+        size_mb = os.path.getsize(array_path) / (1024 * 1024)
+        print(f"{count:,} establishments, {size_mb:.1f} MiB of JSON")
+
+        for label, path, streaming in (("json.load (array)", array_path, False),
+                                       ("streaming (array)", array_path, True),
+                                       ("streaming (NDJSON)", ndjson_path, True)):
+            loaded, elapsed, retained, peak = measure(path, streaming)
+            print(f"{label:<20} {loaded:>10,} records  {elapsed:7.2f}s  "
+                  f"retained {retained / (1024 * 1024):8.1f} MiB  peak {peak / (1024 * 1024):8.1f} MiB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+Cold-start and per-worker memory benchmark: JSON dataset vs compiled snapshot.
+
+Writes a synthetic dataset, compiles it into a snapshot, then starts several worker
+processes per format that each load the health client and look up every
+establishment once (touching all of its data). With all workers alive, each reports
+its load time and its memory from /proc/self/smaps_rollup: RSS, and PSS, which
+splits shared pages between the processes mapping them.
+
+Usage (from the project root, Linux only):
+    python ai_underwriter/benchmarks/bench_health_snapshot.py [establishments] [workers]
+"""
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from bench_health_loading import synthetic_record  # noqa: E402
+
+
+def memory_kib() -> dict:
+    values = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if parts[0] in ("Rss:", "Pss:"):
+                values[parts[0][:-1]] = int(parts[1])
+    return values
+
+
+def worker(path: str) -> None:
+    from app.clients.health_inspection_client import SimulatedHealthInspectionClient
+    logging.disable(logging.CRITICAL)
+    started = time.perf_counter()
+    client = SimulatedHealthInspectionClient(api_key="bench", data_file_path=path, keep_violations=False)
+    load_seconds = time.perf_counter() - started
+    for i in range(len(client.simulated_data)):
+        client.get_inspection_data(f"Establishment {i}", "")
+    print("ready", flush=True)
+    sys.stdin.readline() # Wait until every worker is alive, so shared pages are counted as shared
+    print(json.dumps({"load_seconds": load_seconds, **memory_kib()}), flush=True)
+
+
+def run_workers(path: str, count: int) -> list:
+    command = [sys.executable, os.path.abspath(__file__), "--worker", path]
+    processes = [subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+                 for _ in range(count)]
+    for process in processes:
+        if process.stdout.readline().strip() != "ready":
+            raise RuntimeError("worker failed to start")
+    results = []
+    for process in processes:
+        process.stdin.write("go\n")
+        process.stdin.flush()
+        results.append(json.loads(process.stdout.readline()))
+        process.stdin.close()
+    for process in processes:
+        process.wait()
+    return results
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    from app.clients.health_inspection_client import SimulatedHealthInspectionClient
+    logging.disable(logging.CRITICAL)
+    with tempfile.TemporaryDirectory() as directory:
+        json_path = os.path.join(directory, "health.json")
+        snapshot_path = os.path.join(directory, "health.snapshot")
+        with open(json_path, "w") as f:
+            json.dump([synthetic_record(i) for i in range(count)], f)
+        started = time.perf_counter()
+        SimulatedHealthInspectionClient(api_key="bench", data_file_path=json_path, streaming=True).write_snapshot(snapshot_path)
+        print(f"{count:,} establishments; JSON {os.path.getsize(json_path) / 2**20:.1f} MiB, "
+              f"snapshot {os.path.getsize(snapshot_path) / 2**20:.1f} MiB (compiled in {time.perf_counter() - started:.2f}s)")
+        print(f"{workers} concurrent workers per format, averages per worker:")
+
+        for label, path in (("JSON", json_path), ("snapshot", snapshot_path)):
+            results = run_workers(path, workers)
+            load = sum(r["load_seconds"] for r in results) / workers
+            rss = sum(r["Rss"] for r in results) / workers / 1024
+            pss = sum(r["Pss"] for r in results) / workers / 1024
+            print(f"{label:<10} load {load * 1000:9.1f} ms   RSS {rss:8.1f} MiB   PSS {pss:8.1f} MiB")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) == 3 and sys.argv[1] == "--worker":
+        worker(sys.argv[2])
+    else:
+        main()
@@ -0,0 +1,66 @@
+"""
+Memory benchmark for the application models.
+
+Measures the per-object footprint of RestaurantApplication compared with the previous
+__dict__-based layout, and projects the cost of holding a million stored applications.
+
+Usage (from the project root):
+    python ai_underwriter/benchmarks/bench_model_memory.py [count]
+"""
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.models.data_models import RestaurantApplication  # noqa: E402
+
+
+class DictRestaurantApplication:
+    """The previous layout: a plain class whose fields live in a per-instance __dict__."""
+    def __init__(self, **fields):
+        for name, value in fields.items():
+            setattr(self, name, value)
+
+
+TEMPLATE = {
+    "business_name": "Benchmark Bistro", "address": "1 Benchmark Way", "cuisine_type": "Italian",
+    "alcohol_sales_percentage": 0.3, "operating_hours": "11am-10pm", "square_footage": 2000,
+    "building_age": 10, "fire_suppression_system_type": "Ansul", "years_in_business": 5,
+    "management_experience_years": 8, "has_delivery_operations": True, "has_catering_operations": False,
+    "seating_capacity": 60, "annual_revenue": 800000.0, "health_inspection_score": 92.0,
+    "previous_claims_count": 1
+}
+
+
+def measure(factory, count: int) -> float:
+    """Returns the bytes allocated per object when count objects are kept alive."""
+    # Field values are shared between objects so only the object layout is measured.
+    ids = [f"{i:032x}" for i in range(count)]
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    objects = [factory(application_id=application_id, **TEMPLATE) for application_id in ids]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # The list holding the objects costs one pointer per object in both cases; exclude it.
+    per_object = (after - before - sys.getsizeof(objects)) / count
+    del objects
+    return per_object
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    print(f"Measuring {count:,} objects per layout...")
+    results = {
+        "__dict__ (previous)": measure(DictRestaurantApplication, count),
+        "__slots__ (current)": measure(RestaurantApplication, count),
+    }
+    for label, per_object in results.items():
+        projected_mb = per_object * 1_000_000 / (1024 * 1024)
+        print(f"{label:<22} {per_object:8.1f} bytes/object   {projected_mb:8.1f} MiB per million applications")
+    saving = 1 - results["__slots__ (current)"] / results["__dict__ (previous)"]
+    print(f"Slotted layout saves {saving:.0%} of per-object memory.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Throughput benchmark for the scoring hot path with and without step tracing.
+
+Scores the same applications with the app loggers at INFO (the production setting,
+where the per-factor trace is skipped entirely) and at DEBUG with a handler writing
+to os.devnull (tracing on, output discarded), and reports assessments per second.
+
+Usage (from the project root):
+    python ai_underwriter/benchmarks/bench_risk_tracing.py [iterations]
+"""
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.decision_engine import make_decision  # noqa: E402
+from app.core.premium_calculator import calculate_premium  # noqa: E402
+from app.core.risk_engine import calculate_risk_score  # noqa: E402
+from app.models.data_models import RestaurantApplication  # noqa: E402
+
+HEALTH = {"latest_score": 82, "critical_violations_last_year": 1}
+CRIME = {"crime_rate_index": 1.3, "recent_incidents_nearby": 4}
+
+
+def build_applications(count: int):
+    cuisines = ["Italian", "Mexican", "Sushi", "Cafe", "Bar & Grill"]
+    systems = ["Ansul", "Sprinkler", "None"]
+    return [
+        RestaurantApplication(
+            application_id=f"bench-{i}", business_name=f"Bench {i}", address=f"{i} Bench St",
+            cuisine_type=cuisines[i % len(cuisines)], alcohol_sales_percentage=(i % 7) / 10,
+            square_footage=1500 + i % 1000, fire_suppression_system_type=systems[i % len(systems)],
+            years_in_business=i % 12, previous_claims_count=i % 3, operating_hours="11am-10pm",
+            building_age=10, management_experience_years=5, has_delivery_operations=False,
+            has_catering_operations=False, seating_capacity=60, annual_revenue=750000.0,
+            health_inspection_score=90.0
+        )
+        for i in range(count)
+    ]
+
+
+def assess_all(applications) -> None:
+    for application in applications:
+        risk_score = calculate_risk_score(application, HEALTH, CRIME)
+        calculate_premium(application, risk_score)
+        make_decision(risk_score)
+
+
+def measure(applications, iterations: int) -> float:
+    """Returns assessments per second over the given number of passes."""
+    assess_all(applications) # Warm-up
+    started = time.perf_counter()
+    for _ in range(iterations):
+        assess_all(applications)
+    elapsed = time.perf_counter() - started
+    return len(applications) * iterations / elapsed
+
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    applications = build_applications(1000)
+    app_logger = logging.getLogger("app")
+    app_logger.propagate = False
+    with open(os.devnull, "w") as devnull:
+        app_logger.addHandler(logging.StreamHandler(devnull))
+
+        app_logger.setLevel(logging.INFO)
+        untraced = measure(applications, iterations)
+        app_logger.setLevel(logging.DEBUG)
+        traced = measure(applications, iterations)
+
+    print(f"Scoring {len(applications):,} applications x {iterations} passes")
+    print(f"{'INFO (tracing off)':<20} {untraced:12,.0f} assessments/s")
+    print(f"{'DEBUG (tracing on)':<20} {traced:12,.0f} assessments/s")
+    print(f"Tracing costs {1 - traced / untraced:.0%} of scoring throughput when enabled.")
+
+
+if __name__ == '__main__':
+    main()
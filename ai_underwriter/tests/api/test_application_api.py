@@ -2,13 +2,20 @@ import unittest
 import json
 import logging
 import os # Added
+import threading
+import time
+import tempfile
 from unittest.mock import patch, MagicMock # Added MagicMock for more complex mocks if needed
 from main import app # Import the Flask app instance
-from app.api.application_api import submitted_applications, assessment_results
+from app.api.application_api import (submitted_applications, assessment_results, assessment_status,
+                                     enrichment_executor, assessment_worker_pool, enrichment_cache, circuit_breakers,
+                                     assessment_cache, data_sources)
 # from app.core.risk_engine import calculate_risk_score # Not strictly needed for API tests if mocking client outputs
 
 # Import the actual client to check its instance type if needed, or for specific constants.
-from app.clients import SimulatedHealthInspectionClient
+from app.clients import SimulatedHealthInspectionClient, EnrichmentExecutor
+from app.storage import SQLiteApplicationStore
+from app.core import UnderwritingConfig, current_config, set_underwriting_config
 
 class TestApplicationAPI(unittest.TestCase):
 
@@ -17,6 +24,9 @@ class TestApplicationAPI(unittest.TestCase):
         self.client = app.test_client()
         submitted_applications.clear()
         assessment_results.clear()
+        assessment_status.clear()
+        enrichment_cache.clear()
+        assessment_cache.clear()
         logging.disable(logging.WARNING) # Suppress logs for cleaner test output
 
         self.valid_payload = {
@@ -86,6 +96,27 @@ class TestApplicationAPI(unittest.TestCase):
         # Expected risk_score = 5.0 + 0 + 0 = 5.0
         self.assertAlmostEqual(data["risk_score"], 5.0, places=2)
 
+    @patch('app.api.application_api.crime_statistics_client.get_crime_data')
+    @patch('app.api.application_api.health_inspection_client.get_inspection_data')
+    def test_factor_breakdown_stored_and_explanations_rendered_on_read(self, mock_health_get_data, mock_crime_get_data):
+        mock_health_get_data.return_value = {"latest_score": 80, "critical_violations_last_year": 0, "source": "mocked_health"}
+        mock_crime_get_data.return_value = {"crime_level_area": "Low", "safety_score": 9.0, "source": "mocked_crime"}
+
+        response = self.client.post('/applications/submit', data=json.dumps(self.valid_payload),
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 201, response.data)
+        data = json.loads(response.data)
+        self.assertEqual(data["factor_breakdown"], {
+            "base_score": 5.0, "cuisine": 0.0, "alcohol": 0.5, "years_in_business": 0.0,
+            "fire_suppression": -1.0, "previous_claims": 0.5, "health": 1.0, "crime": 0.0})
+        self.assertIn("Health inspection data: +1.00", data["explanation_factors"])
+
+        # Explanations are not stored; they are rendered again when the assessment is read.
+        stored = assessment_results[data["application_id"]]
+        self.assertNotIn("explanation_factors", stored)
+        fetched = json.loads(self.client.get(f'/applications/assessment/{data["application_id"]}').data)
+        self.assertEqual(fetched, data)
+
 
     @patch.dict(os.environ, {"HEALTH_API_KEY": "INVALID_KEY_TEST"}, clear=True)
     @patch('app.api.application_api.crime_statistics_client.get_crime_data')
@@ -188,5 +219,351 @@ class TestApplicationAPI(unittest.TestCase):
         # Expected score: 5.0 + 0.5 + 0 = 5.5
         self.assertAlmostEqual(data["risk_score"], 5.5, places=2)
 
+    @patch.dict(enrichment_executor.source_timeouts, {"health": 0.05})
+    @patch('app.api.application_api.crime_statistics_client.get_crime_data')
+    @patch('app.api.application_api.health_inspection_client.get_inspection_data')
+    def test_submit_application_slow_health_source_times_out(self, mock_health_get_data, mock_crime_get_data):
+        release = threading.Event()
+        mock_health_get_data.side_effect = lambda **kwargs: release.wait(2.0) or {"latest_score": 99}
+        mock_crime_get_data.return_value = {"crime_level_area": "Low", "safety_score": 9.0, "source": "mocked_crime"}
+
+        response = self.client.post('/applications/submit', data=json.dumps(self.valid_payload), content_type='application/json')
+        release.set()
+        self.assertEqual(response.status_code, 201)
+        data = json.loads(response.data)
+
+        self.assertIsNone(data.get("health_inspection_summary"))
+        self.assertEqual(data["crime_statistics_summary"]["source"], "mocked_crime")
+        # Timed-out health source is treated as missing data: 5.0 + 0.5 penalty
+        self.assertAlmostEqual(data["risk_score"], 5.5, places=2)
+
+    def _post_bulk(self, body, content_type='application/x-ndjson'):
+        response = self.client.post('/applications/submit/bulk', data=body, content_type=content_type)
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        return [json.loads(line) for line in response.data.decode('utf-8').splitlines()]
+
+    @patch('app.api.application_api.crime_statistics_client.get_crime_data')
+    @patch('app.api.application_api.health_inspection_client.get_inspection_data')
+    def test_bulk_submit_ndjson_with_per_record_errors(self, mock_health_get_data, mock_crime_get_data):
+        mock_health_get_data.return_value = {"latest_score": 95, "critical_violations_last_year": 0, "source": "mocked_health"}
+        mock_crime_get_data.return_value = {"crime_level_area": "Low", "safety_score": 9.0, "source": "mocked_crime"}
+        incomplete = {k: v for k, v in self.valid_payload.items() if k != 'address'}
+        body = "\n".join([json.dumps(self.valid_payload), "{not json", json.dumps(incomplete),
+                          json.dumps({**self.valid_payload, "business_name": "Second Taverna"})]) + "\n"
+
+        lines = self._post_bulk(body)
+
+        self.assertEqual([line["record"] for line in lines], [0, 1, 2, 3])
+        self.assertAlmostEqual(lines[0]["risk_score"], 5.0, places=2)
+        self.assertIn("Invalid JSON", lines[1]["error"])
+        self.assertEqual(lines[2]["error"], "Missing required fields: address")
+        self.assertAlmostEqual(lines[3]["risk_score"], 5.0, places=2)
+
+        # Successful records are stored exactly like single submissions
+        for line in (lines[0], lines[3]):
+            stored = assessment_results[line["application_id"]]
+            self.assertEqual(stored["recommended_premium"], line["recommended_premium"])
+            self.assertIn(line["application_id"], submitted_applications)
+        self.assertEqual(len(assessment_results), 2)
+
+    @patch('app.api.application_api.crime_statistics_client.get_crime_data')
+    @patch('app.api.application_api.health_inspection_client.get_inspection_data')
+    def test_bulk_submit_json_array_matches_single_submit(self, mock_health_get_data, mock_crime_get_data):
+        mock_health_get_data.return_value = {"latest_score": 80, "critical_violations_last_year": 1, "source": "mocked_health"}
+        mock_crime_get_data.return_value = {"crime_level_area": "Medium", "safety_score": 6.0, "source": "mocked_crime"}
+
+        single = json.loads(self.client.post('/applications/submit', data=json.dumps(self.valid_payload),
+                                             content_type='application/json').data)
+        payloads = [self.valid_payload, {**self.valid_payload, "alcohol_sales_percentage": 0.7}, 42]
+        lines = self._post_bulk(json.dumps(payloads), content_type='application/json')
+
+        self.assertEqual(len(lines), 3)
+        for key in ("risk_score", "decision", "recommended_premium", "premium_breakdown", "explanation_factors",
+                    "factor_breakdown"):
+            self.assertEqual(lines[0][key], single[key], key)
+        self.assertGreater(lines[1]["risk_score"], lines[0]["risk_score"])
+        self.assertEqual(lines[2]["error"], "Application data must be a JSON object")
+
+    @patch('app.api.application_api.crime_statistics_client.get_crime_data')
+    @patch('app.api.application_api.health_inspection_client.get_inspection_data')
+    def test_bulk_submit_bad_record_does_not_fail_batch(self, mock_health_get_data, mock_crime_get_data):
+        mock_health_get_data.return_value = None
+        mock_crime_get_data.return_value = None
+        bad = {**self.valid_payload, "square_footage": "very large"}
+        lines = self._post_bulk("\n".join([json.dumps(self.valid_payload), json.dumps(bad)]))
+
+        self.assertAlmostEqual(lines[0]["risk_score"], 5.75, places=2) # Missing-data penalties 0.5 + 0.25
+        self.assertIn("Error during assessment process", lines[1]["error"])
+        self.assertEqual(lines[1]["record"], 1)
+
+    @patch('app.api.application_api.crime_statistics_client.get_crime_data')
+    @patch('app.api.application_api.health_inspection_client.get_inspection_data')
+    def test_bulk_submit_score_does_not_depend_on_position_with_slow_source(self, mock_health_get_data, mock_crime_get_data):
+        def slow_health(**kwargs):
+            time.sleep(0.03)
+            return {"latest_score": 95, "critical_violations_last_year": 0, "source": "mocked_health"}
+        mock_health_get_data.side_effect = slow_health
+        mock_crime_get_data.return_value = {"crime_level_area": "Low", "safety_score": 9.0, "source": "mocked_crime"}
+        # Twelve 0.03s health lookups, two at a time, take about 0.2s: more than the 0.1s timeout.
+        executor = EnrichmentExecutor(max_workers=2, default_timeout=0.1)
+        self.addCleanup(executor.shutdown, False)
+        payloads = [{**self.valid_payload, "business_name": f"Taverna {i}"} for i in range(12)]
+
+        with patch('app.api.application_api.bulk_enrichment_executor', executor):
+            lines = self._post_bulk("\n".join(json.dumps(payload) for payload in payloads))
+
+        self.assertEqual(len(lines), 12)
+        for line in lines:
+            self.assertEqual(line["health_inspection_summary"]["source"], "mocked_health")
+            self.assertAlmostEqual(line["risk_score"], 5.0, places=2)
+
+    def test_submit_non_string_address_is_scored_with_missing_data(self):
+        for address in (None, 12345):
+            response = self.client.post('/applications/submit', data=json.dumps({**self.valid_payload, "address": address}),
+                                        content_type='application/json')
+            self.assertEqual(response.status_code, 201, response.data)
+            data = json.loads(response.data)
+            # No source can look up the address: 5.0 + 0.5 health and 0.25 crime missing-data penalties
+            self.assertAlmostEqual(data["risk_score"], 5.75, places=2)
+            self.assertIsNone(data.get("health_inspection_summary"))
+
+    def test_bulk_submit_non_string_address_fails_only_its_sources(self):
+        payloads = [self.valid_payload, {**self.valid_payload, "address": None},
+                    {**self.valid_payload, "address": 42}, {**self.valid_payload, "business_name": "Second Taverna"}]
+        lines = self._post_bulk("\n".join(json.dumps(payload) for payload in payloads))
+
+        self.assertEqual([line["record"] for line in lines], [0, 1, 2, 3])
+        for line in lines:
+            self.assertNotIn("error", line)
+        for line in lines[1:3]:
+            self.assertAlmostEqual(line["risk_score"], 5.75, places=2)
+            self.assertIsNone(line.get("health_inspection_summary"))
+
+    def test_bulk_submit_empty_body(self):
+        self.assertEqual(self._post_bulk(""), [])
+
+    @patch('app.api.application_api.crime_statistics_client.get_crime_data')
+    @patch('app.api.application_api.health_inspection_client.get_inspection_data')
+    def test_async_submit_returns_202_then_completes(self, mock_health_get_data, mock_crime_get_data):
+        release = threading.Event()
+        mock_health_get_data.side_effect = lambda **kwargs: release.wait(2.0) and {"latest_score": 95, "critical_violations_last_year": 0}
+        mock_crime_get_data.return_value = {"crime_level_area": "Low", "safety_score": 9.0}
+
+        response = self.client.post('/applications/submit?mode=async', data=json.dumps(self.valid_payload),
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 202)
+        application_id = json.loads(response.data)["application_id"]
+        self.assertIn(application_id, submitted_applications)
+
+        pending = self.client.get(f'/applications/assessment/{application_id}')
+        self.assertEqual(pending.status_code, 202)
+        self.assertEqual(json.loads(pending.data)["status"], "pending")
+
+        release.set()
+        for _ in range(200):
+            if assessment_status[application_id]["status"] != "pending":
+                break
+            threading.Event().wait(0.01)
+
+        complete = self.client.get(f'/applications/assessment/{application_id}')
+        self.assertEqual(complete.status_code, 200)
+        self.assertEqual(assessment_status[application_id]["status"], "complete")
+        self.assertAlmostEqual(json.loads(complete.data)["risk_score"], 5.0, places=2)
+
+    @patch('app.api.application_api._assess_application')
+    def test_async_submit_failure_is_reported(self, mock_assess):
+        mock_assess.side_effect = RuntimeError("scoring exploded")
+        response = self.client.post('/applications/submit?mode=async', data=json.dumps(self.valid_payload),
+                                    content_type='application/json')
+        application_id = json.loads(response.data)["application_id"]
+        for _ in range(200):
+            if assessment_status[application_id]["status"] != "pending":
+                break
+            threading.Event().wait(0.01)
+
+        failed = self.client.get(f'/applications/assessment/{application_id}')
+        self.assertEqual(failed.status_code, 500)
+        body = json.loads(failed.data)
+        self.assertEqual(body["status"], "failed")
+        self.assertIn("scoring exploded", body["error"])
+
+    def test_async_submit_rejected_when_queue_full(self):
+        with patch.object(assessment_worker_pool, 'submit', return_value=False):
+            response = self.client.post('/applications/submit?mode=async', data=json.dumps(self.valid_payload),
+                                        content_type='application/json')
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(submitted_applications, {})
+        self.assertEqual(assessment_status, {})
+
+    @patch('app.api.application_api.crime_statistics_client.get_crime_data')
+    @patch('app.api.application_api.health_inspection_client.get_inspection_data')
+    def test_submit_and_fetch_with_sqlite_store(self, mock_health_get_data, mock_crime_get_data):
+        mock_health_get_data.return_value = {"latest_score": 95, "critical_violations_last_year": 0}
+        mock_crime_get_data.return_value = {"crime_level_area": "Low", "safety_score": 9.0}
+        with tempfile.TemporaryDirectory() as tmp:
+            store = SQLiteApplicationStore(os.path.join(tmp, "store.db"))
+            with patch('app.api.application_api.application_store', store):
+                response = self.client.post('/applications/submit', data=json.dumps(self.valid_payload),
+                                            content_type='application/json')
+                application_id = json.loads(response.data)["application_id"]
+                assessment = self.client.get(f'/applications/assessment/{application_id}')
+                raw = self.client.get(f'/applications/{application_id}')
+                lines = self._post_bulk(json.dumps([self.valid_payload] * 3))
+            store.close()
+
+        self.assertEqual(assessment.status_code, 200)
+        self.assertAlmostEqual(json.loads(assessment.data)["risk_score"], 5.0, places=2)
+        self.assertEqual(json.loads(raw.data)["business_name"], "The Testy Taverna")
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(submitted_applications, {}) # Nothing leaked into the in-memory default
+
+    @patch('app.api.application_api.crime_statistics_client.get_crime_data')
+    @patch('app.api.application_api.health_inspection_client.get_inspection_data')
+    def test_submit_passes_parsed_address_components(self, mock_health_get_data, mock_crime_get_data):
+        mock_health_get_data.return_value = {"latest_score": 95, "critical_violations_last_year": 0}
+        mock_crime_get_data.return_value = {"crime_level_area": "Low", "safety_score": 9.0}
+        payload = dict(self.valid_payload, address="789 Test Lane, Testville, FS 12345-6789")
+        response = self.client.post('/applications/submit', data=json.dumps(payload), content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        mock_health_get_data.assert_called_once_with(
+            business_name="The Testy Taverna", address="789 Test Lane, Testville, FS 12345-6789",
+            city="testville", state="FS", zip_code="12345"
+        )
+
+    @unittest.skipIf(enrichment_cache.ttl_seconds <= 0, "enrichment cache disabled by ENRICHMENT_CACHE_TTL_SECONDS")
+    @patch('app.api.application_api.crime_statistics_client.client.get_crime_data')
+    @patch('app.api.application_api.health_inspection_client.client.get_inspection_data')
+    def test_repeat_submission_served_from_enrichment_cache(self, mock_health_get_data, mock_crime_get_data):
+        mock_health_get_data.return_value = {"latest_score": 95, "critical_violations_last_year": 0}
+        mock_crime_get_data.return_value = {"crime_level_area": "Low", "safety_score": 9.0}
+        resubmission = dict(self.valid_payload, business_name="THE TESTY TAVERNA")
+        first = self.client.post('/applications/submit', data=json.dumps(self.valid_payload), content_type='application/json')
+        second = self.client.post('/applications/submit', data=json.dumps(resubmission), content_type='application/json')
+
+        self.assertEqual(mock_health_get_data.call_count, 1)
+        self.assertEqual(mock_crime_get_data.call_count, 1)
+        self.assertEqual(json.loads(second.data)["health_inspection_summary"],
+                         json.loads(first.data)["health_inspection_summary"])
+        self.assertGreaterEqual(enrichment_cache.stats()["hits"], 2)
+
+    @unittest.skipIf(assessment_cache.ttl_seconds <= 0, "assessment cache disabled by ASSESSMENT_CACHE_TTL_SECONDS")
+    @patch('app.api.application_api.crime_statistics_client.get_crime_data')
+    @patch('app.api.application_api.health_inspection_client.get_inspection_data')
+    def test_identical_resubmission_served_from_assessment_cache(self, mock_health_get_data, mock_crime_get_data):
+        mock_health_get_data.return_value = {"latest_score": 95, "critical_violations_last_year": 0}
+        mock_crime_get_data.return_value = {"crime_level_area": "Low", "safety_score": 9.0}
+        resubmission = dict(self.valid_payload, square_footage=2000.0) # Same value, different JSON number
+        hits = assessment_cache.stats()["hits"] # clear() keeps the counters
+        first = json.loads(self.client.post('/applications/submit', data=json.dumps(self.valid_payload),
+                                            content_type='application/json').data)
+        response = self.client.post('/applications/submit', data=json.dumps(resubmission), content_type='application/json')
+
+        self.assertEqual(response.status_code, 201)
+        second = json.loads(response.data)
+        self.assertEqual(mock_health_get_data.call_count, 1)
+        self.assertEqual(mock_crime_get_data.call_count, 1)
+        self.assertNotEqual(second["application_id"], first["application_id"])
+        self.assertEqual({**second, "application_id": None}, {**first, "application_id": None})
+        stored = self.client.get(f'/applications/assessment/{second["application_id"]}')
+        self.assertEqual(json.loads(stored.data)["application_id"], second["application_id"])
+        self.assertEqual(assessment_cache.stats()["hits"], hits + 1)
+
+    @patch('app.api.application_api.crime_statistics_client.get_crime_data')
+    @patch('app.api.application_api.health_inspection_client.get_inspection_data')
+    def test_assessment_cache_misses_on_new_ruleset_or_dataset(self, mock_health_get_data, mock_crime_get_data):
+        mock_health_get_data.return_value = {"latest_score": 95, "critical_violations_last_year": 0}
+        mock_crime_get_data.return_value = {"crime_level_area": "Low", "safety_score": 9.0}
+        submit = lambda: self.client.post('/applications/submit', data=json.dumps(self.valid_payload),
+                                          content_type='application/json')
+        submit()
+        stricter = UnderwritingConfig(**{**current_config().to_dict(), "approve_threshold": 3.0, "version": "stricter"})
+        previous = set_underwriting_config(stricter)
+        self.addCleanup(set_underwriting_config, previous)
+        response = submit()
+        self.assertEqual(json.loads(response.data)["config_version"], "stricter")
+        set_underwriting_config(previous)
+        self.assertEqual(mock_health_get_data.call_count, 2)
+
+        health_source = data_sources["health"]
+        with patch.object(health_source, 'data_version', health_source.data_version + 1):
+            submit()
+        self.assertEqual(mock_health_get_data.call_count, 3)
+
+    @patch('app.api.application_api.crime_statistics_client.get_crime_data')
+    @patch('app.api.application_api.health_inspection_client.get_inspection_data')
+    def test_assessment_missing_source_data_not_cached(self, mock_health_get_data, mock_crime_get_data):
+        mock_health_get_data.side_effect = ConnectionError("upstream down")
+        mock_crime_get_data.return_value = {"crime_level_area": "Low", "safety_score": 9.0}
+        for _ in range(2):
+            self.client.post('/applications/submit', data=json.dumps(self.valid_payload), content_type='application/json')
+        self.assertEqual(mock_health_get_data.call_count, 2)
+        self.assertEqual(len(assessment_cache), 0)
+
+    @patch('app.api.application_api.crime_statistics_client.get_crime_data')
+    @patch('app.api.application_api.health_inspection_client.get_inspection_data')
+    def test_assessment_with_source_error_not_cached(self, mock_health_get_data, mock_crime_get_data):
+        mock_crime_get_data.return_value = {"crime_level_area": "Low", "safety_score": 9.0}
+        mock_health_get_data.return_value = {"error": "Invalid API Key", "source": "simulated_health_api_error"}
+        for _ in range(2):
+            self.client.post('/applications/submit', data=json.dumps(self.valid_payload), content_type='application/json')
+        self.assertEqual(mock_health_get_data.call_count, 2)
+        self.assertEqual(len(assessment_cache), 0)
+
+        mock_health_get_data.return_value = {"error": "Establishment not found", "latest_score": None,
+                                             "critical_violations_last_year": None}
+        for _ in range(2):
+            self.client.post('/applications/submit', data=json.dumps(self.valid_payload), content_type='application/json')
+        self.assertEqual(mock_health_get_data.call_count, 3) # A "not found" answer is a valid basis for reuse
+        self.assertEqual(len(assessment_cache), 1)
+
+    @unittest.skipIf(assessment_cache.ttl_seconds <= 0 or enrichment_cache.ttl_seconds <= 0, "caches disabled")
+    @patch('app.api.application_api.crime_statistics_client.get_crime_data')
+    def test_dataset_reload_is_not_answered_from_either_cache(self, mock_crime_get_data):
+        mock_crime_get_data.return_value = {"crime_level_area": "Low", "safety_score": 9.0}
+        health_source = data_sources["health"]
+        hits = assessment_cache.stats()["hits"]
+        submit = lambda: json.loads(self.client.post('/applications/submit', data=json.dumps(self.valid_payload),
+                                                     content_type='application/json').data)
+        with patch.object(health_source, 'get_inspection_data',
+                          return_value={"latest_score": 65, "critical_violations_last_year": 0}) as lookup:
+            self.assertEqual(submit()["health_inspection_summary"]["latest_score"], 65)
+            self.assertEqual(submit()["health_inspection_summary"]["latest_score"], 65)
+            self.assertEqual(lookup.call_count, 1)
+
+            self.assertTrue(health_source.reload())
+            lookup.return_value = {"latest_score": 99, "critical_violations_last_year": 0}
+            after_reload = submit()
+            self.assertEqual(after_reload["health_inspection_summary"]["latest_score"], 99)
+            resubmitted = submit() # Cached under the new dataset version
+            self.assertEqual({**resubmitted, "application_id": None}, {**after_reload, "application_id": None})
+        self.assertEqual(lookup.call_count, 2)
+        self.assertEqual(assessment_cache.stats()["hits"], hits + 2)
+
+    @patch('app.api.application_api.crime_statistics_client.get_crime_data')
+    @patch('app.api.application_api.health_inspection_client.client.client.get_inspection_data')
+    def test_open_circuit_skips_source_as_missing_data(self, mock_health_get_data, mock_crime_get_data):
+        mock_crime_get_data.return_value = {"crime_level_area": "Low", "safety_score": 9.0, "source": "mocked_crime"}
+        with patch.object(circuit_breakers["health"], 'allow', return_value=False):
+            response = self.client.post('/applications/submit', data=json.dumps(self.valid_payload), content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        data = json.loads(response.data)
+        mock_health_get_data.assert_not_called()
+        self.assertIsNone(data.get("health_inspection_summary"))
+        self.assertAlmostEqual(data["risk_score"], 5.5, places=2) # 5.0 base + 0.5 missing health data
+
+    @patch('app.api.application_api.REQUEST_DEADLINE_SECONDS', 0.05)
+    @patch('app.api.application_api.crime_statistics_client.get_crime_data')
+    @patch('app.api.application_api.health_inspection_client.get_inspection_data')
+    def test_request_deadline_skips_slow_source(self, mock_health_get_data, mock_crime_get_data):
+        release = threading.Event()
+        mock_health_get_data.side_effect = lambda **kwargs: release.wait(2.0) or {"latest_score": 99}
+        mock_crime_get_data.return_value = {"crime_level_area": "Low", "safety_score": 9.0, "source": "mocked_crime"}
+        response = self.client.post('/applications/submit', data=json.dumps(self.valid_payload), content_type='application/json')
+        release.set()
+        data = json.loads(response.data)
+        self.assertIsNone(data.get("health_inspection_summary"))
+        self.assertEqual(data["crime_statistics_summary"]["source"], "mocked_crime")
+
 if __name__ == '__main__':
     unittest.main()
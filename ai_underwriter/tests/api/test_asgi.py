@@ -0,0 +1,132 @@
+import unittest
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import threading
+from unittest.mock import patch
+from app.api import application_api
+from app.api.asgi import app
+from app.api.application_api import (submitted_applications, assessment_results, assessment_status, enrichment_cache,
+                                     assessment_cache)
+from app.storage.sqlite import SQLiteApplicationStore
+
+
+def call(method, path, body=b""):
+    """Runs one request through the ASGI app and returns (status, decoded JSON body)."""
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(app({"type": "http", "method": method, "path": path}, receive, send))
+    return sent[0]["status"], json.loads(sent[1]["body"])
+
+
+class TestAsgiApplicationAPI(unittest.TestCase):
+
+    def setUp(self):
+        submitted_applications.clear()
+        assessment_results.clear()
+        assessment_status.clear()
+        enrichment_cache.clear()
+        assessment_cache.clear()
+        logging.disable(logging.WARNING)
+        self.valid_payload = {
+            "business_name": "The Testy Taverna", "address": "789 Test Lane", "cuisine_type": "Greek",
+            "alcohol_sales_percentage": 0.35, "operating_hours": "12pm-11pm", "square_footage": 2000,
+            "building_age": 15, "fire_suppression_system_type": "Ansul", "years_in_business": 7,
+            "management_experience_years": 5, "has_delivery_operations": True, "has_catering_operations": True,
+            "seating_capacity": 70, "annual_revenue": 600000.00, "health_inspection_score": 92.0,
+            "previous_claims_count": 1
+        }
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def test_submit_matches_flask_pipeline_and_is_readable(self):
+        async def health(**kwargs):
+            return {"latest_score": 80, "critical_violations_last_year": 1, "source": "async_mock"}
+
+        async def crime(**kwargs):
+            return {"crime_level_area": "Low", "safety_score": 9.0, "source": "async_mock"}
+
+        with patch.object(application_api.async_health_inspection_client, 'get_inspection_data', side_effect=health), \
+                patch.object(application_api.async_crime_statistics_client, 'get_crime_data', side_effect=crime):
+            status, data = call("POST", "/applications/submit", json.dumps(self.valid_payload).encode())
+
+        self.assertEqual(status, 201, data)
+        self.assertAlmostEqual(data["risk_score"], 6.5, places=2) # 5.0 base + 1.5 health, as in the Flask tests
+        self.assertEqual(data["health_inspection_summary"]["source"], "async_mock")
+        application_id = data["application_id"]
+        self.assertEqual(call("GET", f"/applications/assessment/{application_id}"), (200, data))
+        status, raw = call("GET", f"/applications/{application_id}")
+        self.assertEqual((status, raw["business_name"]), (200, "The Testy Taverna"))
+
+    def test_failing_source_is_missing_data(self):
+        async def broken(**kwargs):
+            raise ConnectionError("upstream down")
+
+        with patch.object(application_api.async_health_inspection_client, 'get_inspection_data', side_effect=broken):
+            status, data = call("POST", "/applications/submit", json.dumps(self.valid_payload).encode())
+        self.assertEqual(status, 201, data)
+        self.assertIsNone(data.get("health_inspection_summary")) # None fields are left out of the output
+
+    def test_non_string_address_is_missing_data(self):
+        status, data = call("POST", "/applications/submit", json.dumps({**self.valid_payload, "address": None}).encode())
+        self.assertEqual(status, 201, data)
+        self.assertIsNone(data.get("health_inspection_summary"))
+        self.assertAlmostEqual(data["risk_score"], 5.75, places=2) # Both missing-data penalties
+
+    def test_assessment_status_matches_flask_views(self):
+        from main import app as flask_app
+        flask_client = flask_app.test_client()
+        assessment_status["queued"] = {"status": application_api.ASSESSMENT_PENDING}
+        assessment_status["broken"] = {"status": application_api.ASSESSMENT_FAILED, "error": "boom"}
+        for application_id, status in (("queued", 202), ("broken", 500), ("unknown", 404)):
+            path = f"/applications/assessment/{application_id}"
+            flask_response = flask_client.get(path)
+            self.assertEqual(call("GET", path), (status, json.loads(flask_response.data)))
+            self.assertEqual(flask_response.status_code, status)
+
+    def test_sqlite_store_calls_run_off_the_loop(self):
+        loop_thread = threading.get_ident()
+        calling_threads = []
+
+        class RecordingStore(SQLiteApplicationStore):
+            def _connection(self):
+                calling_threads.append(threading.get_ident())
+                return super()._connection()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            store = RecordingStore(os.path.join(tmp, "store.db"))
+            calling_threads.clear()
+            with patch('app.api.application_api.application_store', store):
+                status, data = call("POST", "/applications/submit", json.dumps(self.valid_payload).encode())
+                application_id = data["application_id"]
+                self.assertEqual(call("GET", f"/applications/assessment/{application_id}"), (200, data))
+                self.assertEqual(call("GET", f"/applications/{application_id}")[0], 200)
+            store.close()
+
+        self.assertEqual(status, 201, data)
+        self.assertTrue(calling_threads)
+        self.assertNotIn(loop_thread, calling_threads) # asyncio.run runs the loop on this thread
+        self.assertEqual(submitted_applications, {})
+
+    def test_bad_requests(self):
+        self.assertEqual(call("POST", "/applications/submit", b"{not json")[0], 400)
+        status, data = call("POST", "/applications/submit", json.dumps({"business_name": "x"}).encode())
+        self.assertEqual(status, 400)
+        self.assertIn("Missing required fields", data["error"])
+        self.assertEqual(call("GET", "/applications/submit")[0], 405)
+        self.assertEqual(call("GET", "/applications/assessment/unknown")[0], 404)
+        self.assertEqual(call("GET", "/elsewhere")[0], 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+import asyncio
+import logging
+import random
+import time
+from unittest.mock import patch
+from app.clients.async_clients import (UpstreamLatency, SlowUpstreamClient, AsyncSimulatedHealthInspectionClient,
+                                       AsyncMockCrimeStatisticsClient)
+from app.clients.crime_statistics_client import MockCrimeStatisticsClient
+from app.clients.health_inspection_client import SimulatedHealthInspectionClient
+
+
+class TestUpstreamLatency(unittest.TestCase):
+
+    def test_samples_within_jitter_and_zero_is_falsy(self):
+        latency = UpstreamLatency(seconds=0.1, jitter_seconds=0.05, rng=random.Random(7))
+        samples = [latency.sample() for _ in range(100)]
+        self.assertTrue(all(0.1 <= sample < 0.15 for sample in samples))
+        self.assertTrue(latency)
+        self.assertFalse(UpstreamLatency())
+
+    def test_slow_client_blocks_before_delegating(self):
+        client = SlowUpstreamClient(MockCrimeStatisticsClient(), UpstreamLatency(seconds=0.03))
+        started = time.monotonic()
+        data = client.get_crime_data(address="123 Main St")
+        self.assertGreaterEqual(time.monotonic() - started, 0.03)
+        self.assertEqual(data["crime_level_area"], "Low")
+        self.assertIsNone(client.api_key)
+
+
+class TestAsyncClients(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+        cls.health_client = SimulatedHealthInspectionClient()
+
+    @classmethod
+    def tearDownClass(cls):
+        logging.disable(logging.NOTSET)
+
+    def test_answers_match_the_sync_clients(self):
+        health = AsyncSimulatedHealthInspectionClient(self.health_client)
+        crime = AsyncMockCrimeStatisticsClient()
+
+        async def run():
+            return await asyncio.gather(
+                health.get_inspection_data(business_name="The Risky Diner", address="101 Danger Path"),
+                crime.get_crime_data(address="999 Danger Ave"))
+
+        health_data, crime_data = asyncio.run(run())
+        self.assertEqual(health_data, self.health_client.get_inspection_data("The Risky Diner", "101 Danger Path"))
+        self.assertEqual(crime_data, MockCrimeStatisticsClient().get_crime_data("999 Danger Ave"))
+        self.assertIs(health.simulated_data, self.health_client.simulated_data)
+
+    def test_slow_lookups_overlap_on_one_event_loop(self):
+        crime = AsyncMockCrimeStatisticsClient(latency=UpstreamLatency(seconds=0.1))
+
+        async def run():
+            started = time.monotonic()
+            results = await asyncio.gather(*(crime.get_crime_data(address=f"{i} Elm St") for i in range(50)))
+            return results, time.monotonic() - started
+
+        results, elapsed = asyncio.run(run())
+        self.assertEqual(len(results), 50)
+        self.assertLess(elapsed, 1.0) # 50 sequential lookups would take 5s
+
+    def test_coroutine_clients_are_awaited_on_the_loop(self):
+        class AsyncUpstream:
+            async def get_crime_data(self, address, **location):
+                await asyncio.sleep(0.01)
+                return {"crime_level_area": "Low", "address": address}
+
+        crime = AsyncMockCrimeStatisticsClient(AsyncUpstream(), offload=True)
+        with patch("asyncio.to_thread", side_effect=AssertionError("offloaded")):
+            data = asyncio.run(crime.get_crime_data(address="1 Elm St"))
+        self.assertEqual(data, {"crime_level_area": "Low", "address": "1 Elm St"})
+
+
+if __name__ == '__main__':
+    unittest.main()
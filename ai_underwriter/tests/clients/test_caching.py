@@ -0,0 +1,268 @@
+import unittest
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock
+from app.clients.caching import (TTLCache, SingleFlight, AsyncSingleFlight, CachedHealthInspectionClient,
+                                 CachedCrimeStatisticsClient, AsyncCachedHealthInspectionClient)
+from app.clients.health_inspection_client import SimulatedHealthInspectionClient
+from app.utils.deadline import Deadline, DeadlineExceeded, deadline_scope
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTTLCache(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = TTLCache(max_entries=2, ttl_seconds=10.0, clock=self.clock)
+
+    def test_hit_and_miss_counters(self):
+        self.assertEqual(self.cache.get("a"), (False, None))
+        self.cache.put("a", 1)
+        self.assertEqual(self.cache.get("a"), (True, 1))
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["entries"]), (1, 1, 1))
+        self.assertAlmostEqual(stats["hit_rate"], 0.5)
+
+    def test_entries_expire_after_ttl(self):
+        self.cache.put("a", 1)
+        self.cache.put("b", 2, ttl_seconds=30.0)
+        self.clock.now += 10.0
+        self.assertEqual(self.cache.get("a"), (False, None))
+        self.assertEqual(self.cache.get("b"), (True, 2))
+        self.assertEqual(self.cache.stats()["expirations"], 1)
+        self.assertEqual(len(self.cache), 1)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        self.cache.put("a", 1)
+        self.cache.put("b", 2)
+        self.cache.get("a") # "b" is now the least recently used
+        self.cache.put("c", 3)
+        self.assertEqual(self.cache.get("b"), (False, None))
+        self.assertEqual(self.cache.get("a"), (True, 1))
+        self.assertEqual(self.cache.get("c"), (True, 3))
+        self.assertEqual(self.cache.stats()["evictions"], 1)
+
+    def test_zero_ttl_or_size_disables_storing(self):
+        self.cache.put("a", 1, ttl_seconds=0)
+        self.assertEqual(len(self.cache), 0)
+        empty = TTLCache(max_entries=0)
+        empty.put("a", 1)
+        self.assertEqual(len(empty), 0)
+
+
+class TestCachedClients(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = TTLCache(max_entries=100, ttl_seconds=300.0, clock=self.clock)
+
+    def test_health_lookups_cached_case_insensitively(self):
+        client = CachedHealthInspectionClient(SimulatedHealthInspectionClient(api_key="TEST_KEY"), self.cache)
+        first = client.get_inspection_data(business_name="Risky Diner", address="101 Danger Path")
+        client.client.get_inspection_data = MagicMock(side_effect=AssertionError("should be cached"))
+        second = client.get_inspection_data(business_name="RISKY DINER", address="101 danger path")
+        self.assertIs(second, first)
+        self.assertEqual(second["latest_score"], first["latest_score"])
+
+    def test_address_spellings_share_an_entry(self):
+        inner = MagicMock()
+        inner.get_crime_data.return_value = {"crime_level_area": "Low"}
+        client = CachedCrimeStatisticsClient(inner, self.cache)
+        client.get_crime_data(address="303 Normal Street, Midburg")
+        client.get_crime_data(address="303 normal st., MIDBURG")
+        client.get_crime_data(address="303 Normal St Midburg") # Parses differently: no city
+        self.assertEqual(inner.get_crime_data.call_count, 2)
+
+    def test_not_found_cached_for_negative_ttl_only(self):
+        inner = MagicMock()
+        inner.get_inspection_data.return_value = {"error": "Establishment not found", "source": "simulated_health_api"}
+        client = CachedHealthInspectionClient(inner, self.cache, negative_ttl_seconds=30.0)
+        client.get_inspection_data("Nowhere Cafe", "1 Missing St")
+        client.get_inspection_data("Nowhere Cafe", "1 Missing St")
+        self.assertEqual(inner.get_inspection_data.call_count, 1)
+        self.clock.now += 30.0
+        client.get_inspection_data("Nowhere Cafe", "1 Missing St")
+        self.assertEqual(inner.get_inspection_data.call_count, 2)
+
+    def test_other_errors_and_missing_results_not_cached(self):
+        inner = MagicMock()
+        inner.get_inspection_data.side_effect = [{"error": "Invalid API Key"}, None, {"latest_score": 90}]
+        client = CachedHealthInspectionClient(inner, self.cache)
+        self.assertEqual(client.get_inspection_data("Cafe", "1 Main St"), {"error": "Invalid API Key"})
+        self.assertIsNone(client.get_inspection_data("Cafe", "1 Main St"))
+        self.assertEqual(client.get_inspection_data("Cafe", "1 Main St"), {"latest_score": 90})
+        self.assertEqual(client.get_inspection_data("Cafe", "1 Main St"), {"latest_score": 90})
+        self.assertEqual(inner.get_inspection_data.call_count, 3)
+
+    def test_entries_not_served_after_dataset_reload(self):
+        inner = SimulatedHealthInspectionClient(api_key="TEST_KEY")
+        client = CachedHealthInspectionClient(inner, self.cache, negative_ttl_seconds=60.0)
+        before = client.get_inspection_data(business_name="Risky Diner", address="101 Danger Path")
+        missing = client.get_inspection_data(business_name="Nowhere Cafe", address="1 Missing St")
+        self.assertEqual(missing["error"], "Establishment not found")
+
+        inner.reload()
+        inner.get_inspection_data = MagicMock(side_effect=[{"latest_score": 99}, {"latest_score": 75}])
+        self.assertEqual(client.get_inspection_data(business_name="Risky Diner", address="101 Danger Path"),
+                         {"latest_score": 99})
+        self.assertEqual(client.get_inspection_data(business_name="Nowhere Cafe", address="1 Missing St"),
+                         {"latest_score": 75})
+        self.assertNotEqual(before["latest_score"], 99)
+
+    def test_crime_results_are_read_only_and_keyed_on_coordinates(self):
+        inner = MagicMock()
+        inner.get_crime_data.return_value = {"crime_level_area": "Low", "safety_score": 9.0}
+        client = CachedCrimeStatisticsClient(inner, self.cache)
+        result = client.get_crime_data(address="1 Main St")
+        with self.assertRaises(TypeError):
+            result["safety_score"] = 1.0
+        client.get_crime_data(address="1 MAIN ST")
+        client.get_crime_data(address="1 Main St", latitude=40.0, longitude=-74.0)
+        self.assertEqual(inner.get_crime_data.call_count, 2)
+
+    def test_other_attributes_delegate_to_wrapped_client(self):
+        inner = SimulatedHealthInspectionClient(api_key="TEST_KEY")
+        client = CachedHealthInspectionClient(inner, self.cache)
+        self.assertIs(client.simulated_data, inner.simulated_data)
+
+
+class TestRequestCoalescing(unittest.TestCase):
+    CALLERS = 5
+
+    def setUp(self):
+        self.release = threading.Event()
+        self.calls = 0
+        self.single_flight = SingleFlight()
+
+    def _blocking(self, outcome):
+        def fetch(**kwargs):
+            self.calls += 1
+            self.release.wait(2.0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+        return fetch
+
+    def _run_concurrently(self, call):
+        results = [None] * self.CALLERS
+
+        def run(i):
+            try:
+                results[i] = call()
+            except Exception as e:
+                results[i] = e
+
+        threads = [threading.Thread(target=run, args=(i,)) for i in range(self.CALLERS)]
+        for thread in threads:
+            thread.start()
+        deadline = time.monotonic() + 2.0
+        while self.single_flight.coalesced < self.CALLERS - 1 and time.monotonic() < deadline:
+            time.sleep(0.005)
+        self.release.set()
+        for thread in threads:
+            thread.join(2.0)
+        return results
+
+    def test_concurrent_lookups_share_one_fetch(self):
+        inner = MagicMock()
+        inner.get_inspection_data.side_effect = self._blocking({"latest_score": 88})
+        client = CachedHealthInspectionClient(inner, TTLCache(), single_flight=self.single_flight)
+        results = self._run_concurrently(lambda: client.get_inspection_data("Chain Cafe", "5 Market St"))
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(results, [{"latest_score": 88}] * self.CALLERS)
+        self.assertEqual(self.single_flight.coalesced, self.CALLERS - 1)
+
+    def test_error_reaches_every_waiter_and_is_not_cached(self):
+        inner = MagicMock()
+        inner.get_crime_data.side_effect = self._blocking(ConnectionError("upstream down"))
+        cache = TTLCache()
+        client = CachedCrimeStatisticsClient(inner, cache, single_flight=self.single_flight)
+        results = self._run_concurrently(lambda: client.get_crime_data(address="5 Market St"))
+        self.assertEqual(self.calls, 1)
+        self.assertTrue(all(isinstance(result, ConnectionError) for result in results))
+        self.assertEqual(len(cache), 0)
+
+        inner.get_crime_data.side_effect = None
+        inner.get_crime_data.return_value = {"crime_level_area": "Low"}
+        self.assertEqual(client.get_crime_data(address="5 Market St"), {"crime_level_area": "Low"})
+
+    def test_waiter_gives_up_at_its_deadline(self):
+        leader = threading.Thread(target=self.single_flight.do, args=("a", lambda: self.release.wait(2.0)))
+        leader.start()
+        self.addCleanup(leader.join, 2.0)
+        self.addCleanup(self.release.set)
+        while not self.single_flight._flights:
+            time.sleep(0.001)
+
+        started = time.monotonic()
+        with deadline_scope(Deadline(0.05)), self.assertRaises(DeadlineExceeded):
+            self.single_flight.do("a", lambda: self.fail("should wait for the leader"))
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertTrue(leader.is_alive())
+
+    def test_flights_are_per_key(self):
+        seen = []
+        self.assertEqual(self.single_flight.do("a", lambda: seen.append("a") or 1), 1)
+        self.assertEqual(self.single_flight.do("a", lambda: seen.append("a") or 2), 2)
+        self.assertEqual(seen, ["a", "a"])
+        self.assertEqual(self.single_flight.coalesced, 0)
+
+
+class TestAsyncRequestCoalescing(unittest.TestCase):
+
+    def test_concurrent_lookups_share_one_fetch_and_the_cache(self):
+        calls = []
+        cache = TTLCache()
+
+        class Upstream:
+            async def get_inspection_data(self, **kwargs):
+                calls.append(kwargs["business_name"])
+                await asyncio.sleep(0.02)
+                return {"latest_score": 88}
+
+        single_flight = AsyncSingleFlight()
+        client = AsyncCachedHealthInspectionClient(Upstream(), cache, single_flight=single_flight)
+
+        async def run():
+            return await asyncio.gather(*(client.get_inspection_data("Chain Cafe", "5 Market St") for _ in range(5)))
+
+        self.assertEqual(asyncio.run(run()), [{"latest_score": 88}] * 5)
+        self.assertEqual(calls, ["Chain Cafe"])
+        self.assertEqual(single_flight.coalesced, 4)
+        # The entry is shared with the sync wrapper, which is answered without calling its client.
+        sync_client = CachedHealthInspectionClient(MagicMock(spec=["get_inspection_data"]), cache) # No data_version, like Upstream
+        self.assertEqual(sync_client.get_inspection_data("chain cafe", "5 Market Street"), {"latest_score": 88})
+        sync_client.client.get_inspection_data.assert_not_called()
+
+    def test_error_reaches_every_waiter_and_cancelled_waiter_does_not_cancel_flight(self):
+        single_flight = AsyncSingleFlight()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.02)
+            raise ConnectionError("upstream down")
+
+        async def run():
+            impatient = asyncio.ensure_future(asyncio.wait_for(single_flight.do("k", fetch), 0.001))
+            results = await asyncio.gather(single_flight.do("k", fetch), single_flight.do("k", fetch),
+                                           impatient, return_exceptions=True)
+            return results
+
+        results = asyncio.run(run())
+        self.assertEqual(len(calls), 1)
+        self.assertIsInstance(results[0], ConnectionError)
+        self.assertIsInstance(results[1], ConnectionError)
+        self.assertIsInstance(results[2], asyncio.TimeoutError)
+
+
+if __name__ == '__main__':
+    unittest.main()
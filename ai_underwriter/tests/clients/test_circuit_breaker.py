@@ -0,0 +1,139 @@
+import unittest
+import asyncio
+import logging
+from unittest.mock import MagicMock
+from app.clients.circuit_breaker import (CircuitBreaker, CircuitBreakerClient, AsyncCircuitBreakerClient,
+                                         CircuitOpenError, CLOSED, OPEN, HALF_OPEN)
+from app.utils.deadline import Deadline, DeadlineExceeded, deadline_scope
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCircuitBreaker(unittest.TestCase):
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker("health", failure_rate_threshold=0.5, slow_call_seconds=1.0,
+                                      slow_call_rate_threshold=0.5, window_size=10, min_calls=4,
+                                      open_seconds=30.0, clock=self.clock)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def fail(self):
+        def broken():
+            raise ConnectionError("upstream down")
+        with self.assertRaises(ConnectionError):
+            self.breaker.call(broken)
+
+    def test_opens_on_failure_rate_after_min_calls(self):
+        self.breaker.call(lambda: "ok")
+        self.fail()
+        self.fail()
+        self.assertEqual(self.breaker.state, CLOSED) # Only 3 calls, below min_calls
+        self.fail()
+        self.assertEqual(self.breaker.state, OPEN)
+
+        upstream = MagicMock()
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.call(upstream)
+        upstream.assert_not_called()
+        self.assertEqual(self.breaker.stats()["rejected"], 1)
+
+    def test_opens_on_slow_call_rate(self):
+        def slow():
+            self.clock.now += 1.5
+            return "late"
+        for _ in range(2):
+            self.breaker.call(lambda: "ok")
+            self.breaker.call(slow)
+        self.assertEqual(self.breaker.state, OPEN)
+
+    def test_half_open_trial_closes_or_reopens(self):
+        for _ in range(4):
+            self.fail()
+        self.clock.now += 30.0
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+        self.fail() # Failed trial
+        self.assertEqual(self.breaker.state, OPEN)
+
+        self.clock.now += 30.0
+        self.assertTrue(self.breaker.allow())
+        self.assertFalse(self.breaker.allow()) # One trial at a time
+        self.breaker.record(0.01, failed=False)
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.assertEqual(self.breaker.stats()["window_calls"], 0)
+
+    def test_expired_deadline_skips_call_without_counting(self):
+        upstream = MagicMock()
+        with deadline_scope(Deadline(0.0)):
+            with self.assertRaises(DeadlineExceeded):
+                self.breaker.call(upstream)
+        upstream.assert_not_called()
+        self.assertEqual(self.breaker.stats()["window_calls"], 0)
+
+    def test_deadline_exceeded_counts_as_slow_not_failed(self):
+        def out_of_budget(seconds):
+            def call():
+                self.clock.now += seconds
+                raise DeadlineExceeded("request deadline passed")
+            return call
+        for _ in range(4):
+            with self.assertRaises(DeadlineExceeded):
+                self.breaker.call(out_of_budget(0.1))
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.assertEqual(self.breaker.stats()["window_failures"], 0)
+        for _ in range(4):
+            with self.assertRaises(DeadlineExceeded):
+                self.breaker.call(out_of_budget(1.5))
+        self.assertEqual(self.breaker.state, OPEN) # Slow calls still count
+
+    def test_client_wrapper_counts_raised_errors_only(self):
+        inner = MagicMock()
+        inner.get_inspection_data.return_value = {"error": "Establishment not found"}
+        client = CircuitBreakerClient(inner, self.breaker)
+        for _ in range(5):
+            client.get_inspection_data("Nowhere Cafe", "1 Nowhere St")
+        self.assertEqual(self.breaker.state, CLOSED)
+        inner.get_crime_data.side_effect = TimeoutError()
+        for _ in range(5):
+            with self.assertRaises(TimeoutError):
+                client.get_crime_data(address="1 Nowhere St")
+        self.assertEqual(self.breaker.state, OPEN)
+
+    def test_async_client_counts_failures_but_not_cancellations(self):
+        class Upstream:
+            async def get_crime_data(self, address):
+                raise ConnectionError("upstream down")
+
+            async def get_inspection_data(self, business_name, address):
+                await asyncio.sleep(10)
+
+        client = AsyncCircuitBreakerClient(Upstream(), self.breaker)
+
+        async def run():
+            for _ in range(4):
+                lookup = asyncio.ensure_future(client.get_inspection_data("Slow Cafe", "1 Slow St"))
+                await asyncio.sleep(0)
+                lookup.cancel() # A hedge that lost, or a source timeout
+                with self.assertRaises(asyncio.CancelledError):
+                    await lookup
+            self.assertEqual(self.breaker.stats()["window_failures"], 0)
+            self.assertEqual(self.breaker.state, CLOSED)
+            for _ in range(4):
+                with self.assertRaises(ConnectionError):
+                    await client.get_crime_data(address="1 Nowhere St")
+
+        asyncio.run(run())
+        self.assertEqual(self.breaker.state, OPEN)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,11 @@
 import unittest
 import logging
-from app.clients.crime_statistics_client import MockCrimeStatisticsClient
+import math
+import os
+import random
+import tempfile
+from app.clients.crime_statistics_client import MockCrimeStatisticsClient, SimulatedCrimeStatisticsClient
+from app.utils.spatial_index import GridIndex, METERS_PER_DEGREE_LATITUDE
 
 class TestMockCrimeStatisticsClient(unittest.TestCase):
 
@@ -42,5 +47,85 @@ class TestMockCrimeStatisticsClient(unittest.TestCase):
         data_upper = self.client.get_crime_data(address="penthouse, 999 DANGER AVE, RISKY CITY")
         self.assertEqual(data_upper["crime_level_area"], "High")
 
+    def test_address_keywords_match_whole_tokens_only(self):
+        self.assertEqual(self.client.get_crime_data(address="1123 Main St")["crime_level_area"], "Medium")
+        self.assertEqual(self.client.get_crime_data(address="123 Main Street, Anytown")["crime_level_area"], "Low")
+
+class TestSimulatedCrimeStatisticsClient(unittest.TestCase):
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.client = SimulatedCrimeStatisticsClient(api_key="test_crime_key")
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def test_high_crime_address_matches_mock_profile(self):
+        data = self.client.get_crime_data(address="Unit A, 999 Danger Ave, Risky City")
+        self.assertEqual(data["crime_level_area"], "High")
+        self.assertEqual(data["theft_incidents_last_year_nearby"], 25)
+        self.assertEqual(data["vandalism_incidents_last_year_nearby"], 10)
+        self.assertEqual(data["assault_incidents_last_year_nearby"], 7)
+        self.assertLess(data["safety_score"], 4.0)
+        self.assertEqual(data["source"], "simulated_crime_statistics_api")
+
+    def test_low_and_medium_areas(self):
+        self.assertEqual(self.client.get_crime_data("123 MAIN ST., Safeville")["crime_level_area"], "Low")
+        medium = self.client.get_crime_data("789 Test Lane")
+        self.assertEqual(medium["crime_level_area"], "Medium")
+        self.assertEqual(medium["safety_score"], 6.0)
+
+    def test_coordinates_take_precedence(self):
+        by_coordinates = self.client.get_crime_data("Nowhere", latitude=40.05, longitude=-75.05)
+        self.assertEqual(by_coordinates, self.client.get_crime_data("999 Danger Ave"))
+        quiet = self.client.get_crime_data("999 Danger Ave", latitude=41.0, longitude=-76.0)
+        self.assertEqual(quiet["crime_level_area"], "Low")
+        self.assertEqual(quiet["theft_incidents_last_year_nearby"], 0)
+
+    def test_unknown_address(self):
+        data = self.client.get_crime_data("1 Unknown Rd, Nowhere")
+        self.assertEqual(data["error"], "Location not found")
+        self.assertIsNone(data["crime_level_area"])
+
+    def test_locations_partitioned_by_city(self):
+        # Street suffixes and punctuation are normalized, and the city must agree when given.
+        self.assertEqual(self.client.locate("Suite 2, 123 Main Street, Safeville"), (40.0, -75.0))
+        self.assertEqual(self.client.locate("789 Test Lane, TESTVILLE, FS 12345"), (40.02, -75.02))
+        self.assertIsNone(self.client.locate("123 Main St, Otherville"))
+        self.assertEqual(self.client.get_crime_data("123 Main St, Otherville")["error"], "Location not found")
+
+    def test_radius_controls_counts(self):
+        wide = self.client.count_incidents(40.0, -75.0, radius_m=50_000)
+        self.assertEqual(sum(wide.values()), len(self.client.incident_index))
+        self.assertEqual(self.client.count_incidents(40.0, -75.0, radius_m=1), {})
+
+    def test_csv_incidents_and_missing_file(self):
+        handle, path = tempfile.mkstemp(suffix=".csv")
+        self.addCleanup(os.remove, path)
+        with os.fdopen(handle, "w") as f:
+            f.write("type,latitude,longitude\nTheft,10.0,20.0\nassault,10.001,20.0\nassault,11.0,20.0\n")
+        client = SimulatedCrimeStatisticsClient(data_file_path=path)
+        self.assertEqual(client.count_incidents(10.0, 20.0), {"theft": 1, "assault": 1})
+        self.assertEqual(client.get_crime_data("anywhere")["error"], "Location not found")
+
+        missing = SimulatedCrimeStatisticsClient(data_file_path="non_existent_crime_data.json")
+        self.assertEqual(missing.get_crime_data("123 Main St")["error"], "Simulated data not loaded")
+
+class TestGridIndex(unittest.TestCase):
+
+    def test_matches_brute_force(self):
+        rng = random.Random(5)
+        points = [(rng.uniform(39.9, 40.1), rng.uniform(-75.1, -74.9), i) for i in range(2000)]
+        index = GridIndex(points, cell_size_degrees=0.005)
+        self.assertEqual(len(index), 2000)
+        for _ in range(50):
+            latitude, longitude = rng.uniform(39.9, 40.1), rng.uniform(-75.1, -74.9)
+            radius = rng.choice([10, 300, 1500, 8000])
+            meters_per_degree_longitude = METERS_PER_DEGREE_LATITUDE * math.cos(math.radians(latitude))
+            expected = {value for lat, lon, value in points
+                        if ((lat - latitude) * METERS_PER_DEGREE_LATITUDE) ** 2
+                        + ((lon - longitude) * meters_per_degree_longitude) ** 2 <= radius ** 2}
+            self.assertEqual({value for _, _, value in index.query_radius(latitude, longitude, radius)}, expected)
+
 if __name__ == '__main__':
     unittest.main()
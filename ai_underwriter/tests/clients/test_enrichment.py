@@ -0,0 +1,155 @@
+import unittest
+import asyncio
+import logging
+import time
+import threading
+from app.clients.enrichment import EnrichmentExecutor
+from app.utils.deadline import Deadline, current_deadline
+
+class TestEnrichmentExecutor(unittest.TestCase):
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.executor = EnrichmentExecutor(max_workers=4, default_timeout=1.0)
+
+    def tearDown(self):
+        self.executor.shutdown(wait=False)
+        logging.disable(logging.NOTSET)
+
+    def test_sources_run_concurrently(self):
+        barrier = threading.Barrier(2, timeout=1.0)
+
+        def fetch(value):
+            def _fetch():
+                barrier.wait() # Only passes if both fetchers are running at the same time
+                return {"value": value}
+            return _fetch
+
+        results = self.executor.enrich({"health": fetch(1), "crime": fetch(2)}, request_label="test")
+        self.assertEqual(results, {"health": {"value": 1}, "crime": {"value": 2}})
+
+    def test_failing_source_falls_back_to_none(self):
+        def broken():
+            raise RuntimeError("upstream down")
+
+        results = self.executor.enrich({"health": broken, "crime": lambda: {"ok": True}})
+        self.assertIsNone(results["health"])
+        self.assertEqual(results["crime"], {"ok": True})
+
+    def test_per_source_timeout(self):
+        release = threading.Event()
+        self.executor.source_timeouts["health"] = 0.05
+
+        def slow():
+            release.wait(2.0)
+            return {"late": True}
+
+        started = time.monotonic()
+        results = self.executor.enrich({"health": slow, "crime": lambda: {"ok": True}})
+        elapsed = time.monotonic() - started
+        release.set()
+
+        self.assertIsNone(results["health"])
+        self.assertEqual(results["crime"], {"ok": True})
+        self.assertLess(elapsed, 0.5)
+        self.assertEqual(self.executor.timeout_for("crime"), 1.0)
+
+    def test_batch_lookups_time_out_from_their_own_start(self):
+        executor = EnrichmentExecutor(max_workers=2, default_timeout=0.15)
+        self.addCleanup(executor.shutdown, False)
+        in_flight, peak, lock = [0], [0], threading.Lock()
+
+        def slow(value):
+            def _fetch():
+                with lock:
+                    in_flight[0] += 1
+                    peak[0] = max(peak[0], in_flight[0])
+                time.sleep(0.05)
+                with lock:
+                    in_flight[0] -= 1
+                return {"value": value}
+            return _fetch
+
+        # 24 lookups at 2 in flight take about 0.6s, well past the 0.15s timeout; none may time out.
+        requests = [(f"r{i}", {"health": slow(i), "crime": slow(-i)}) for i in range(12)]
+        results = executor.enrich_many(requests)
+
+        self.assertEqual(results, [{"health": {"value": i}, "crime": {"value": -i}} for i in range(12)])
+        self.assertLessEqual(peak[0], executor.max_in_flight)
+
+    def test_batch_requests_get_their_own_deadlines(self):
+        executor = EnrichmentExecutor(max_workers=1, default_timeout=1.0)
+        self.addCleanup(executor.shutdown, False)
+        created, seen = [], []
+
+        def new_deadline():
+            created.append(Deadline(0.1))
+            return created[-1]
+
+        def fetch():
+            seen.append(current_deadline())
+            time.sleep(0.04)
+            return {"ok": True}
+
+        # Five 0.04s lookups run one at a time: a single 0.1s deadline would skip the last ones.
+        results = executor.enrich_many([(f"r{i}", {"health": fetch}) for i in range(5)], new_deadline=new_deadline)
+
+        self.assertEqual(results, [{"health": {"ok": True}}] * 5)
+        self.assertEqual(seen, created)
+        self.assertEqual(len(created), 5)
+
+    def test_async_sources_run_concurrently_with_timeouts_and_failures(self):
+        self.executor.source_timeouts["slow"] = 0.05
+
+        async def fetch(value, delay=0.1):
+            await asyncio.sleep(delay)
+            return {"value": value}
+
+        async def broken():
+            raise RuntimeError("upstream down")
+
+        async def run():
+            started = time.monotonic()
+            results = await self.executor.enrich_async({
+                "health": lambda: fetch(1), "crime": lambda: fetch(2), "slow": lambda: fetch(3, delay=2.0),
+                "broken": broken}, request_label="test")
+            return results, time.monotonic() - started
+
+        results, elapsed = asyncio.run(run())
+        self.assertEqual(results, {"health": {"value": 1}, "crime": {"value": 2}, "slow": None, "broken": None})
+        self.assertLess(elapsed, 0.18) # Concurrent, so about one 0.1s delay rather than two
+
+    def test_deadline_caps_timeouts_and_reaches_fetchers(self):
+        release = threading.Event()
+        seen = []
+
+        def slow():
+            seen.append(current_deadline())
+            release.wait(2.0)
+            return {"late": True}
+
+        deadline = Deadline(0.05)
+        started = time.monotonic()
+        results = self.executor.enrich({"health": slow, "crime": lambda: current_deadline() and {"ok": True}},
+                                       deadline=deadline)
+        elapsed = time.monotonic() - started
+        release.set()
+
+        self.assertEqual(results, {"health": None, "crime": {"ok": True}})
+        self.assertEqual(seen, [deadline])
+        self.assertLess(elapsed, 0.5) # The 1s source timeout was capped by the deadline
+
+    def test_sources_skipped_once_deadline_has_passed(self):
+        calls = []
+        results = self.executor.enrich({"health": lambda: calls.append(1)}, deadline=Deadline(0.0))
+        self.assertEqual(results, {"health": None})
+        self.assertEqual(calls, [])
+
+        async def fetch():
+            calls.append(1)
+        self.assertEqual(asyncio.run(self.executor.enrich_async({"health": fetch}, deadline=Deadline(0.0))),
+                         {"health": None})
+        self.assertEqual(calls, [])
+
+if __name__ == '__main__':
+    unittest.main()
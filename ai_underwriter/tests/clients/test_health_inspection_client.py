@@ -2,6 +2,7 @@ import unittest
 import logging
 import os # For manipulating file paths if needed for test data
 import json # For creating temporary test data files if needed
+import time
 from app.clients.health_inspection_client import MockHealthInspectionClient, SimulatedHealthInspectionClient
 
 # Get the directory where this test script is located
@@ -139,6 +140,121 @@ class TestSimulatedHealthInspectionClient(unittest.TestCase):
         self.assertIsNotNone(found_by_addr2)
         self.assertEqual(found_by_addr2["establishment_id"], "EST_SC002")
 
+    def test_address_keywords_match_canonical_spelling(self):
+        found = self.client_default_data._find_establishment_data(business_name="Unrelated",
+                                                                  address="303 NORMAL STREET., Midburg")
+        self.assertIsNotNone(found)
+        self.assertEqual(found["establishment_id"], "EST_AV003")
+
+    def test_address_keywords_match_whole_tokens_only(self):
+        client = self.client_default_data
+        client.simulated_data = [{"establishment_id": "N", "business_name": "North Cafe", "search_keywords": ["12 N St"]}]
+        client._build_index()
+        self.assertIsNone(client._find_establishment_data("Unrelated", "12 North Star Rd"))
+        self.assertIsNone(client._find_establishment_data("Unrelated", "112 North St"))
+        self.assertEqual(client._find_establishment_data("Unrelated", "12 North Street, Midburg")["establishment_id"], "N")
+
+    def test_find_establishment_index_keeps_linear_scan_precedence(self):
+        client = self.client_default_data
+        client.simulated_data = [
+            {"establishment_id": "A", "business_name": "Alpha Grill", "search_keywords": ["1 first st"]},
+            {"establishment_id": "B", "business_name": "Beta Bistro", "search_keywords": ["2 second st", "first"]},
+            {"establishment_id": "C", "business_name": "Alpha Grill", "search_keywords": []},
+            {"establishment_id": "D", "business_name": "Delta Deli", "search_keywords": ["4 fourth ave"]},
+        ]
+        client._build_index()
+
+        def linear_scan(business_name, address):
+            for record in client.simulated_data:
+                if record.get('business_name', '').lower() == business_name.lower():
+                    return record
+                for kw in record.get('search_keywords', []):
+                    if kw.lower() in address.lower():
+                        return record
+            return None
+
+        queries = [
+            ("Delta Deli", "1 First St"),     # Earlier keyword match beats later name match
+            ("alpha grill", "4 Fourth Ave"),  # Duplicate names resolve to the first record
+            ("Nobody", "The First Place"),    # Keyword from second record
+            ("Beta Bistro", ""),
+            ("Nobody", "Nowhere"),
+        ]
+        for business_name, address in queries:
+            self.assertIs(client._find_establishment_data(business_name, address),
+                          linear_scan(business_name, address), (business_name, address))
+
+    def test_reload_swaps_dataset_and_keeps_it_on_bad_file(self):
+        client = self.client_default_data
+        data_file = os.path.join(self._test_data_dir, "reload_sim_data.json")
+        self.addCleanup(os.remove, data_file)
+        client.data_file_path = data_file
+        with open(data_file, 'w') as f:
+            json.dump([{"establishment_id": "NEW1", "business_name": "Fresh Feed Cafe", "search_keywords": [],
+                        "last_inspection": {"score": 77}}], f)
+        old_dataset = client._dataset
+        old_version = client.data_version
+
+        self.assertTrue(client.reload())
+        self.assertEqual(client.data_version, old_version + 1)
+        self.assertEqual(client.get_inspection_data("Fresh Feed Cafe", "")["latest_score"], 77)
+        self.assertEqual(client.get_inspection_data("The Risky Diner", "").get("error"), "Establishment not found")
+        self.assertEqual(len(old_dataset.records), 3) # The previous snapshot is left intact for in-flight lookups
+
+        with open(data_file, 'w') as f:
+            f.write('[{"business_name": "Half written')
+        self.assertFalse(client.reload())
+        self.assertEqual(client.get_inspection_data("Fresh Feed Cafe", "")["latest_score"], 77)
+        self.assertEqual(client.data_version, old_version + 1)
+
+    def test_auto_reload_picks_up_changed_file(self):
+        client = self.client_default_data
+        data_file = os.path.join(self._test_data_dir, "auto_reload_sim_data.json")
+        self.addCleanup(os.remove, data_file)
+        with open(data_file, 'w') as f:
+            json.dump([], f)
+        client.data_file_path = data_file
+        client._data_signature = None
+        client.start_auto_reload(interval=0.01)
+        self.addCleanup(client.stop_auto_reload)
+
+        with open(data_file, 'w') as f:
+            json.dump([{"business_name": "Watched Cafe", "last_inspection": {"score": 88}}], f)
+        os.utime(data_file, ns=(2_000_000_000, 2_000_000_000))
+        deadline = time.monotonic() + 2.0
+        while client.get_inspection_data("Watched Cafe", "").get("error"):
+            self.assertLess(time.monotonic(), deadline, "Data file change was not picked up")
+            time.sleep(0.01)
+        self.assertEqual(client.get_inspection_data("Watched Cafe", "")["latest_score"], 88)
+
+    def test_streaming_load_matches_full_load(self):
+        with open(self.client_default_data.data_file_path) as f:
+            records = json.load(f)
+        ndjson_file = os.path.join(self._test_data_dir, "stream_sim_data.ndjson")
+        self.addCleanup(os.remove, ndjson_file)
+        with open(ndjson_file, 'w') as f:
+            f.write("\n".join(json.dumps(record) for record in records) + "\n")
+
+        streamed_ndjson = SimulatedHealthInspectionClient(api_key="test_api_key", data_file_path=ndjson_file)
+        streamed_array = SimulatedHealthInspectionClient(api_key="test_api_key", streaming=True,
+                                                         data_file_path=self.client_default_data.data_file_path)
+        self.assertTrue(streamed_ndjson.streaming)
+        for client in (streamed_ndjson, streamed_array):
+            self.assertEqual(len(client.simulated_data), 3)
+            self.assertEqual(set(client.simulated_data[0]), {"establishment_id", "business_name", "search_keywords"})
+            for business_name, address in (("The Risky Diner", ""), ("Nobody", "202 Sparkle Ave"),
+                                           ("Average Joe's Diner", ""), ("Unknown Cafe", "000 Nowhere Dr")):
+                self.assertEqual(client.get_inspection_data(business_name, address),
+                                 self.client_default_data.get_inspection_data(business_name, address))
+
+    def test_streaming_load_rejects_malformed_records(self):
+        ndjson_file = os.path.join(self._test_data_dir, "bad_stream_sim_data.ndjson")
+        self.addCleanup(os.remove, ndjson_file)
+        with open(ndjson_file, 'w') as f:
+            f.write('{"business_name": "Good Cafe"}\n{"business_name": \n')
+        client = SimulatedHealthInspectionClient(api_key="test_api_key", data_file_path=ndjson_file)
+        self.assertEqual(client.simulated_data, [])
+
     def test_find_establishment_not_found(self):
         # Using the client with default data
         not_found = self.client_default_data._find_establishment_data(business_name="Unknown Cafe", address="000 Nowhere Dr")
@@ -172,6 +288,22 @@ class TestSimulatedHealthInspectionClient(unittest.TestCase):
         self.assertEqual(summary["source"], "simulated_health_api_v2")
 
 
+    def test_get_inspection_data_returns_precomputed_read_only_summary(self):
+        first = self.client_default_data.get_inspection_data(business_name="The Risky Diner", address="")
+        second = self.client_default_data.get_inspection_data(business_name="Someone Else", address="101 Danger Path")
+        self.assertIs(first, second)
+        self.assertIsInstance(first, dict)
+        with self.assertRaises(TypeError):
+            first["latest_score"] = 100
+        self.assertEqual(json.loads(json.dumps(first))["latest_score"], 65)
+
+    def test_dropping_violations_keeps_summaries(self):
+        client = SimulatedHealthInspectionClient(base_url="test_base_url", api_key="test_api_key", keep_violations=False)
+        self.assertTrue(all("violations" not in record.get("last_inspection", {}) for record in client.simulated_data))
+        for business_name in ("The Risky Diner", "Super Clean Eats", "Average Joe's Diner"):
+            self.assertEqual(client.get_inspection_data(business_name, ""),
+                             self.client_default_data.get_inspection_data(business_name, ""))
+
     def test_get_inspection_data_establishment_not_found_response(self):
         summary = self.client_default_data.get_inspection_data(business_name="Unknown Cafe", address="000 Nowhere Dr")
         self.assertIsNotNone(summary)
@@ -0,0 +1,93 @@
+import unittest
+import logging
+import os
+import shutil
+import struct
+import tempfile
+from app.clients.health_inspection_client import SimulatedHealthInspectionClient
+from app.clients.health_snapshot import HealthSnapshot, SnapshotError, main as compile_main
+
+QUERIES = [
+    ("The Risky Diner", ""), ("SUPER CLEAN EATS", ""), ("Someone Else", "Contains 202 Sparkle Ave"),
+    ("Average Joe's Diner", "303 Normal St"), ("Unknown Cafe", "000 Nowhere Dr"), ("", ""),
+]
+
+class TestHealthSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.directory = tempfile.mkdtemp()
+        self.snapshot_path = os.path.join(self.directory, "health.snapshot")
+        self.json_client = SimulatedHealthInspectionClient(api_key="test_api_key")
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+        shutil.rmtree(self.directory)
+
+    def test_snapshot_lookups_match_json_load(self):
+        self.json_client.write_snapshot(self.snapshot_path)
+        client = SimulatedHealthInspectionClient(api_key="test_api_key", data_file_path=self.snapshot_path)
+
+        self.assertEqual(len(client.simulated_data), 3)
+        for business_name, address in QUERIES:
+            self.assertEqual(client.get_inspection_data(business_name, address),
+                             self.json_client.get_inspection_data(business_name, address), business_name)
+        found = client._find_establishment_data("The Risky Diner", "")
+        self.assertEqual(found, {"establishment_id": "EST_RN001", "business_name": "The Risky Diner",
+                                 "search_keywords": ["101 danger path"]})
+        with self.assertRaises(TypeError):
+            client.get_inspection_data("The Risky Diner", "")["latest_score"] = 100
+
+    def test_snapshot_keeps_linear_scan_precedence(self):
+        client = self.json_client
+        client.simulated_data = [
+            {"establishment_id": "A", "business_name": "Alpha Grill", "search_keywords": ["1 first st"]},
+            {"establishment_id": "B", "business_name": "Beta Bistro", "search_keywords": ["2 second st", "first"]},
+            {"establishment_id": "C", "business_name": "Alpha Grill", "search_keywords": []},
+            {"establishment_id": "D", "business_name": "Délice Deli", "search_keywords": ["4 fourth ave", ""]},
+        ]
+        client._build_index()
+        client.write_snapshot(self.snapshot_path)
+        snapshot_client = SimulatedHealthInspectionClient(api_key="test_api_key", data_file_path=self.snapshot_path)
+
+        for business_name, address in [("Délice Deli", "1 First St"), ("alpha grill", "4 Fourth Ave"),
+                                       ("Nobody", "The First Place"), ("Beta Bistro", ""), ("Nobody", "Nowhere")]:
+            self.assertEqual(snapshot_client._find_establishment_data(business_name, address),
+                             client._find_establishment_data(business_name, address), (business_name, address))
+
+    def test_rejects_foreign_or_newer_files(self):
+        self.json_client.write_snapshot(self.snapshot_path)
+        with open(self.snapshot_path, "r+b") as f:
+            f.seek(8)
+            f.write(struct.pack("<I", 999))
+        with self.assertRaises(SnapshotError):
+            HealthSnapshot(self.snapshot_path)
+
+        with open(self.snapshot_path, "wb") as f:
+            f.write(b"[]" * 100)
+        with self.assertRaises(SnapshotError):
+            HealthSnapshot(self.snapshot_path)
+        client = SimulatedHealthInspectionClient(api_key="test_api_key", data_file_path=self.snapshot_path)
+        self.assertEqual(client.simulated_data, [])
+
+    def test_reload_swaps_in_recompiled_snapshot(self):
+        self.json_client.write_snapshot(self.snapshot_path)
+        client = SimulatedHealthInspectionClient(api_key="test_api_key", data_file_path=self.snapshot_path)
+        old_dataset = client._dataset
+
+        self.json_client.simulated_data = [{"business_name": "Fresh Feed Cafe", "last_inspection": {"score": 77}}]
+        self.json_client._build_index()
+        self.json_client.write_snapshot(self.snapshot_path)
+        self.assertTrue(client.reload())
+
+        self.assertEqual(client.get_inspection_data("Fresh Feed Cafe", "")["latest_score"], 77)
+        self.assertEqual(old_dataset.summaries[0]["latest_score"], 65) # Old mapping still readable
+
+    def test_compile_command(self):
+        source = self.json_client.data_file_path
+        self.assertEqual(compile_main([source, self.snapshot_path]), 0)
+        self.assertEqual(HealthSnapshot(self.snapshot_path).record_count, 3)
+        self.assertEqual(compile_main([os.path.join(self.directory, "missing.json"), self.snapshot_path]), 1)
+
+if __name__ == '__main__':
+    unittest.main()
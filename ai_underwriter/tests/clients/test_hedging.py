@@ -0,0 +1,197 @@
+import asyncio
+import threading
+import time
+import unittest
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+from app.clients.hedging import HedgePolicy, HedgedClient, AsyncHedgedClient
+from app.utils.deadline import Deadline, DeadlineExceeded, deadline_scope
+
+
+def warmed_policy(latency=0.01, samples=20, **kwargs):
+    """A policy that has seen `samples` lookups of `latency` seconds and has budget for hedges."""
+    policy = HedgePolicy("health", min_samples=samples, **kwargs)
+    for _ in range(samples):
+        policy.observe(latency)
+    return policy
+
+
+class SlowFirstClient:
+    """Answers the first lookup after first_delay seconds and later ones immediately."""
+
+    def __init__(self, first_delay=0.5, fail_first=False):
+        self.first_delay = first_delay
+        self.fail_first = fail_first
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def get_inspection_data(self, business_name, address):
+        with self._lock:
+            self.calls += 1
+            call = self.calls
+        if call == 1:
+            time.sleep(self.first_delay)
+            if self.fail_first:
+                raise ConnectionError("upstream down")
+            return {"attempt": 1}
+        return {"attempt": call}
+
+
+class TestHedgePolicy(unittest.TestCase):
+
+    def test_no_delay_until_min_samples(self):
+        policy = HedgePolicy("health", min_samples=3)
+        policy.observe(0.1)
+        policy.observe(0.1)
+        self.assertIsNone(policy.hedge_delay())
+        policy.observe(0.1)
+        self.assertAlmostEqual(policy.hedge_delay(), 0.1)
+
+    def test_delay_follows_the_latest_complete_window(self):
+        policy = HedgePolicy("health", percentile=0.5, min_samples=5, window_size=10)
+        for _ in range(10):
+            policy.observe(1.0)
+        for _ in range(9):
+            policy.observe(0.01)
+        self.assertAlmostEqual(policy.hedge_delay(), 1.0)
+        policy.observe(0.01)
+        self.assertAlmostEqual(policy.hedge_delay(), 0.01)
+
+    def test_hedges_are_capped_as_a_fraction_of_requests(self):
+        policy = HedgePolicy("health", max_hedge_fraction=0.25, burst=1.0)
+        hedges = 0
+        for _ in range(100):
+            policy.request_started()
+            if policy.try_hedge():
+                hedges += 1
+        self.assertEqual(hedges, 25)
+        self.assertEqual(policy.stats()["hedges"], 25)
+        self.assertAlmostEqual(policy.stats()["hedge_rate"], 0.25)
+
+
+class TestHedgedClient(unittest.TestCase):
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def test_calls_inline_without_latency_history(self):
+        inner = MagicMock()
+        inner.get_inspection_data.return_value = {"score": 90}
+        policy = HedgePolicy("health", min_samples=5)
+        client = HedgedClient(inner, policy)
+        self.assertEqual(client.get_inspection_data("Cafe", "1 Main St"), {"score": 90})
+        self.assertEqual(policy.stats()["requests"], 1)
+        self.assertEqual(policy.stats()["hedges"], 0)
+
+    def test_slow_lookup_is_hedged_and_first_answer_wins(self):
+        inner = SlowFirstClient(first_delay=0.5)
+        policy = warmed_policy(max_hedge_fraction=1.0)
+        client = HedgedClient(inner, policy)
+        started = time.monotonic()
+        self.assertEqual(client.get_inspection_data("Cafe", "1 Main St"), {"attempt": 2})
+        self.assertLess(time.monotonic() - started, 0.4)
+        self.assertEqual(inner.calls, 2)
+        self.assertEqual(policy.stats()["hedges_won"], 1)
+
+    def test_no_hedge_without_budget(self):
+        inner = SlowFirstClient(first_delay=0.1)
+        policy = warmed_policy(max_hedge_fraction=0.0)
+        client = HedgedClient(inner, policy)
+        self.assertEqual(client.get_inspection_data("Cafe", "1 Main St"), {"attempt": 1})
+        self.assertEqual(inner.calls, 1)
+
+    def test_failed_primary_falls_back_to_hedge(self):
+        class SlowHedge(SlowFirstClient):
+            def get_inspection_data(self, business_name, address):
+                result = super().get_inspection_data(business_name, address)
+                time.sleep(0.2) # Hedge answers after the primary fails
+                return result
+
+        client = HedgedClient(SlowHedge(first_delay=0.05, fail_first=True), warmed_policy(max_hedge_fraction=1.0))
+        self.assertEqual(client.get_inspection_data("Cafe", "1 Main St"), {"attempt": 2})
+
+    def test_error_raised_when_both_attempts_fail(self):
+        inner = MagicMock()
+        def broken(**kwargs):
+            time.sleep(0.05)
+            raise ConnectionError("upstream down")
+        inner.get_inspection_data.side_effect = broken
+        client = HedgedClient(inner, warmed_policy(max_hedge_fraction=1.0))
+        with self.assertRaises(ConnectionError):
+            client.get_inspection_data("Cafe", "1 Main St")
+        self.assertEqual(inner.get_inspection_data.call_count, 2)
+
+
+    def test_waits_are_bounded_by_the_request_deadline(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        inner = MagicMock()
+        inner.get_inspection_data.side_effect = lambda **kwargs: release.wait(2.0) and {"late": True}
+        for max_hedge_fraction, attempts in ((1.0, 2), (0.0, 1)): # Waiting on both attempts, or on the primary
+            inner.get_inspection_data.reset_mock()
+            client = HedgedClient(inner, warmed_policy(max_hedge_fraction=max_hedge_fraction))
+            started = time.monotonic()
+            with deadline_scope(Deadline(0.1)), self.assertRaises(DeadlineExceeded):
+                client.get_inspection_data("Cafe", "1 Main St")
+            self.assertLess(time.monotonic() - started, 0.5)
+            self.assertEqual(inner.get_inspection_data.call_count, attempts)
+
+    def test_clients_share_the_given_executor(self):
+        executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="shared-hedge")
+        self.addCleanup(executor.shutdown, False)
+        threads = []
+
+        def lookup(**kwargs):
+            threads.append(threading.current_thread().name)
+            return {"ok": True}
+        inner = MagicMock()
+        inner.get_inspection_data.side_effect = lookup
+        inner.get_crime_data.side_effect = lookup
+        health = HedgedClient(inner, warmed_policy(), executor)
+        crime = HedgedClient(inner, warmed_policy(), executor)
+        health.get_inspection_data("Cafe", "1 Main St")
+        crime.get_crime_data("1 Main St")
+        self.assertIs(health.executor, crime.executor)
+        self.assertTrue(all(name.startswith("shared-hedge") for name in threads), threads)
+
+
+class TestAsyncHedgedClient(unittest.TestCase):
+
+    def test_slow_lookup_is_hedged_and_loser_cancelled(self):
+        cancelled = []
+
+        class AsyncSlowFirstClient:
+            def __init__(self):
+                self.calls = 0
+
+            async def get_inspection_data(self, business_name, address):
+                self.calls += 1
+                if self.calls == 1:
+                    try:
+                        await asyncio.sleep(1.0)
+                    except asyncio.CancelledError:
+                        cancelled.append(True)
+                        raise
+                    return {"attempt": 1}
+                return {"attempt": self.calls}
+
+        inner = AsyncSlowFirstClient()
+        policy = warmed_policy(max_hedge_fraction=1.0)
+        client = AsyncHedgedClient(inner, policy)
+
+        async def run():
+            result = await client.get_inspection_data("Cafe", "1 Main St")
+            await asyncio.sleep(0) # Let the cancellation be delivered
+            return result
+
+        self.assertEqual(asyncio.run(run()), {"attempt": 2})
+        self.assertEqual(cancelled, [True])
+        self.assertEqual(policy.stats()["hedges_won"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,267 @@
+import unittest
+import asyncio
+import logging
+import random
+import threading
+import time
+from app.clients.async_clients import UpstreamLatency
+from app.clients.crime_statistics_client import MockCrimeStatisticsClient
+from app.clients.health_inspection_client import SimulatedHealthInspectionClient
+from app.clients.http_clients import (HttpHealthInspectionClient, HttpCrimeStatisticsClient,
+                                     AsyncHttpHealthInspectionClient, AsyncHttpCrimeStatisticsClient)
+from app.clients.http_transport import AsyncPooledHttpTransport, HttpTransportError, PooledHttpTransport, RetryPolicy
+from app.clients.stand_in_server import StandInServer
+from app.clients.circuit_breaker import CircuitBreaker, CircuitBreakerClient, CLOSED
+from app.utils.deadline import Deadline, DeadlineExceeded, deadline_scope
+
+
+class TestPooledHttpTransport(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+        cls.health_data = SimulatedHealthInspectionClient(keep_violations=False)
+
+    @classmethod
+    def tearDownClass(cls):
+        logging.disable(logging.NOTSET)
+
+    def start_server(self, **kwargs):
+        server = StandInServer(health_client=self.health_data, **kwargs).start()
+        self.addCleanup(server.stop)
+        return server
+
+    def transport(self, **kwargs):
+        kwargs.setdefault("retry", RetryPolicy(max_retries=2, backoff_base=0.001, rng=random.Random(1)))
+        transport = PooledHttpTransport(**kwargs)
+        self.addCleanup(transport.close)
+        return transport
+
+    def test_clients_match_simulated_answers_over_one_connection(self):
+        server = self.start_server()
+        transport = self.transport()
+        health = HttpHealthInspectionClient(server.url, api_key="key", transport=transport)
+        crime = HttpCrimeStatisticsClient(server.url, transport=transport)
+
+        self.assertEqual(health.get_inspection_data("The Risky Diner", "101 Danger Path"),
+                         self.health_data.get_inspection_data("The Risky Diner", "101 Danger Path"))
+        not_found = health.get_inspection_data("Non Existent Cafe", "000 Nowhere Land")
+        self.assertEqual(not_found["error"], "Establishment not found")
+        self.assertIsNone(not_found["latest_score"])
+        self.assertEqual(crime.get_crime_data("999 Danger Ave"), MockCrimeStatisticsClient().get_crime_data("999 Danger Ave"))
+
+        self.assertEqual(transport.requests, 3)
+        self.assertEqual(transport.connections_opened, 1) # Keep-alive: every request reused the first connection
+        self.assertEqual(server.connections_accepted, 1)
+
+    def test_invalid_key_is_an_answer_not_an_error(self):
+        server = self.start_server()
+        health = HttpHealthInspectionClient(server.url, api_key="INVALID_KEY_TEST", transport=self.transport())
+        self.assertEqual(health.get_inspection_data("The Risky Diner", "101 Danger Path")["error"], "Invalid API Key")
+
+    def test_keep_alive_off_opens_a_connection_per_request(self):
+        server = self.start_server()
+        transport = self.transport(keep_alive=False)
+        crime = HttpCrimeStatisticsClient(server.url, transport=transport)
+        for _ in range(3):
+            crime.get_crime_data("123 Main St")
+        self.assertEqual(transport.connections_opened, 3)
+
+    def test_failures_are_retried_then_raised(self):
+        server = self.start_server(error_rate=1.0)
+        transport = self.transport()
+        crime = HttpCrimeStatisticsClient(server.url, transport=transport)
+        with self.assertRaises(HttpTransportError) as raised:
+            crime.get_crime_data("123 Main St")
+        self.assertEqual(raised.exception.status, 503)
+        self.assertEqual(server.requests_served, 3) # The first attempt and two retries
+        self.assertEqual(transport.retries, 2)
+
+    def test_transient_failures_recover(self):
+        server = self.start_server(error_rate=0.5, rng=random.Random(3))
+        crime = HttpCrimeStatisticsClient(server.url, transport=self.transport(
+            retry=RetryPolicy(max_retries=10, backoff_base=0.001)))
+        for _ in range(10):
+            self.assertEqual(crime.get_crime_data("123 Main St")["crime_level_area"], "Low")
+
+    def test_read_timeout(self):
+        server = self.start_server(latency=UpstreamLatency(seconds=0.5))
+        transport = self.transport(read_timeout=0.05, retry=RetryPolicy(max_retries=0))
+        started = time.monotonic()
+        with self.assertRaises(HttpTransportError):
+            HttpCrimeStatisticsClient(server.url, transport=transport).get_crime_data("123 Main St")
+        self.assertLess(time.monotonic() - started, 0.4)
+
+    def test_deadline_bounds_reads_and_retries(self):
+        server = self.start_server(latency=UpstreamLatency(seconds=0.5))
+        transport = self.transport(read_timeout=5.0, retry=RetryPolicy(max_retries=5, backoff_base=0.001))
+        crime = HttpCrimeStatisticsClient(server.url, transport=transport)
+        started = time.monotonic()
+        with deadline_scope(Deadline(0.1)):
+            with self.assertRaises(DeadlineExceeded):
+                crime.get_crime_data("123 Main St")
+        self.assertLess(time.monotonic() - started, 0.4)
+        self.assertLessEqual(server.requests_served, 1)
+
+    def test_deadline_timeouts_do_not_trip_the_circuit_breaker(self):
+        server = self.start_server(latency=UpstreamLatency(seconds=0.2))
+        breaker = CircuitBreaker("crime", window_size=4, min_calls=4, slow_call_seconds=1.0)
+        crime = CircuitBreakerClient(HttpCrimeStatisticsClient(server.url, transport=self.transport()), breaker)
+        for _ in range(4):
+            with deadline_scope(Deadline(0.02)):
+                with self.assertRaises(DeadlineExceeded):
+                    crime.get_crime_data("123 Main St")
+        self.assertEqual(breaker.state, CLOSED)
+        self.assertEqual(breaker.stats()["window_failures"], 0)
+        self.assertEqual(crime.get_crime_data("123 Main St")["crime_level_area"], "Low")
+
+    def test_connections_per_host_are_capped(self):
+        server = self.start_server(latency=UpstreamLatency(seconds=0.02))
+        transport = self.transport(max_connections_per_host=2)
+        crime = HttpCrimeStatisticsClient(server.url, transport=transport)
+        threads = [threading.Thread(target=crime.get_crime_data, args=("123 Main St",)) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5.0)
+        self.assertEqual(transport.requests, 10)
+        self.assertLessEqual(transport.connections_opened, 2)
+
+    def test_backoff_is_jittered_and_capped(self):
+        policy = RetryPolicy(backoff_base=0.1, backoff_max=0.3, rng=random.Random(5))
+        delays = [policy.backoff(retry) for retry in (1, 2, 3, 4) for _ in range(50)]
+        self.assertTrue(all(0.0 <= delay <= 0.3 for delay in delays))
+        self.assertGreater(len(set(delays)), 100)
+
+
+class TestAsyncPooledHttpTransport(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+        cls.health_data = SimulatedHealthInspectionClient(keep_violations=False)
+
+    @classmethod
+    def tearDownClass(cls):
+        logging.disable(logging.NOTSET)
+
+    def start_server(self, **kwargs):
+        server = StandInServer(health_client=self.health_data, **kwargs).start()
+        self.addCleanup(server.stop)
+        return server
+
+    def transport(self, **kwargs):
+        kwargs.setdefault("retry", RetryPolicy(max_retries=2, backoff_base=0.001, rng=random.Random(1)))
+        return AsyncPooledHttpTransport(**kwargs)
+
+    def run_closing(self, transport, lookups):
+        """Runs lookups() on a new event loop, closing the transport's connections before the loop ends."""
+        async def run():
+            try:
+                return await lookups()
+            finally:
+                transport.close()
+        return asyncio.run(run())
+
+    def test_clients_match_the_sync_clients_over_one_connection(self):
+        server = self.start_server()
+        transport = self.transport()
+        health = AsyncHttpHealthInspectionClient(server.url, api_key="key", transport=transport)
+        crime = AsyncHttpCrimeStatisticsClient(server.url, transport=transport)
+
+        async def lookups():
+            return (await health.get_inspection_data("The Risky Diner", "101 Danger Path"),
+                    await health.get_inspection_data("Non Existent Cafe", "000 Nowhere Land"),
+                    await crime.get_crime_data("999 Danger Ave"))
+
+        found, not_found, crime_data = self.run_closing(transport, lookups)
+        self.assertEqual(found, self.health_data.get_inspection_data("The Risky Diner", "101 Danger Path"))
+        self.assertEqual(not_found["error"], "Establishment not found")
+        self.assertEqual(crime_data, MockCrimeStatisticsClient().get_crime_data("999 Danger Ave"))
+        self.assertEqual(transport.requests, 3)
+        self.assertEqual(transport.connections_opened, 1)
+        self.assertEqual(server.connections_accepted, 1)
+
+    def test_lookups_in_flight_are_not_bounded_by_threads(self):
+        server = self.start_server(latency=UpstreamLatency(seconds=0.3))
+        transport = self.transport(max_connections_per_host=100)
+        crime = AsyncHttpCrimeStatisticsClient(server.url, transport=transport)
+        started_threads = threading.active_count()
+
+        async def lookups():
+            return await asyncio.gather(*(crime.get_crime_data(f"{i} Elm St") for i in range(100)))
+
+        started = time.monotonic()
+        results = self.run_closing(transport, lookups)
+        self.assertEqual(len(results), 100)
+        # 100 lookups of 0.3s overlap on the loop's thread; on a 32-thread pool they would take 1.2s.
+        self.assertLess(time.monotonic() - started, 1.0)
+        # Only the stand-in server's handler threads were added; the client used none.
+        self.assertLessEqual(threading.active_count() - started_threads, server.connections_accepted)
+
+    def test_connections_per_host_are_capped(self):
+        server = self.start_server(latency=UpstreamLatency(seconds=0.02))
+        transport = self.transport(max_connections_per_host=2)
+        crime = AsyncHttpCrimeStatisticsClient(server.url, transport=transport)
+
+        async def lookups():
+            return await asyncio.gather(*(crime.get_crime_data("123 Main St") for _ in range(10)))
+
+        self.run_closing(transport, lookups)
+        self.assertEqual(transport.requests, 10)
+        self.assertEqual(transport.connections_opened, 2)
+
+    def test_failures_are_retried_then_raised(self):
+        server = self.start_server(error_rate=1.0)
+        transport = self.transport()
+        crime = AsyncHttpCrimeStatisticsClient(server.url, transport=transport)
+
+        async def lookups():
+            with self.assertRaises(HttpTransportError) as raised:
+                await crime.get_crime_data("123 Main St")
+            return raised.exception
+
+        self.assertEqual(self.run_closing(transport, lookups).status, 503)
+        self.assertEqual(server.requests_served, 3)
+        self.assertEqual(transport.retries, 2)
+
+    def test_read_timeout_and_deadline(self):
+        server = self.start_server(latency=UpstreamLatency(seconds=0.5))
+        transport = self.transport(read_timeout=0.05, retry=RetryPolicy(max_retries=0))
+        crime = AsyncHttpCrimeStatisticsClient(server.url, transport=transport)
+        patient = self.transport(read_timeout=5.0, retry=RetryPolicy(max_retries=5, backoff_base=0.001))
+        patient_crime = AsyncHttpCrimeStatisticsClient(server.url, transport=patient)
+
+        async def lookups():
+            with self.assertRaises(HttpTransportError):
+                await crime.get_crime_data("123 Main St")
+            with deadline_scope(Deadline(0.1)):
+                with self.assertRaises(DeadlineExceeded):
+                    await patient_crime.get_crime_data("123 Main St")
+            patient.close()
+
+        started = time.monotonic()
+        self.run_closing(transport, lookups)
+        self.assertLess(time.monotonic() - started, 0.6)
+
+    def test_stale_keep_alive_connection_is_replaced(self):
+        server = self.start_server()
+        transport = self.transport(retry=RetryPolicy(max_retries=0))
+        crime = AsyncHttpCrimeStatisticsClient(server.url, transport=transport)
+
+        async def lookups():
+            await crime.get_crime_data("123 Main St")
+            for pools in transport._pools.values():
+                for pool in pools.values():
+                    for _, writer in pool._idle:
+                        writer.transport.abort() # As if the server had dropped the idle connection
+            await asyncio.sleep(0)
+            return await crime.get_crime_data("123 Main St")
+
+        self.assertEqual(self.run_closing(transport, lookups)["crime_level_area"], "Low")
+        self.assertEqual(transport.connections_opened, 2)
+        self.assertEqual(transport.retries, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
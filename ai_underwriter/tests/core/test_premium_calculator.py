@@ -1,6 +1,8 @@
 import unittest
+import random
+import numpy as np
 from app.models.data_models import RestaurantApplication
-from app.core.premium_calculator import calculate_premium
+from app.core.premium_calculator import calculate_premium, calculate_premiums_batch
 
 class TestPremiumCalculator(unittest.TestCase):
 
@@ -96,6 +98,30 @@ class TestPremiumCalculator(unittest.TestCase):
 
         self.assertAlmostEqual(premiums["property_premium"], 900.0, places=2)
         self.assertAlmostEqual(premiums["total_premium"], 2437.5, places=2)
+    def test_batch_matches_scalar(self):
+        rng = random.Random(7)
+        risk_scores = [rng.choice([0.5, 1.0, 2.675, 3.3333, 5.25, 10.0, rng.uniform(1.0, 10.0)]) for _ in range(2000)]
+        alcohol = [rng.choice([None, 0.0, 0.05, 0.33, 0.6, rng.random()]) for _ in risk_scores]
+        sq_feet = [rng.choice([None, 0, -5, 800, 1234, rng.randint(1, 10000)]) for _ in risk_scores]
+
+        batch = calculate_premiums_batch(risk_scores, alcohol, sq_feet)
+
+        for i, risk_score in enumerate(risk_scores):
+            app = self._create_base_application_data(alcohol_sales_percentage=alcohol[i], square_footage=sq_feet[i])
+            expected = calculate_premium(app, risk_score)
+            for key, value in expected.items():
+                self.assertEqual(batch[key][i], value, f"{key} mismatch at index {i}")
+
+    def test_batch_defaults(self):
+        batch = calculate_premiums_batch([5.0, 0.2], [None, float("nan")], [None, 0])
+        np.testing.assert_array_equal(batch["general_liability_premium"], [2500.0, 500.0])
+        np.testing.assert_array_equal(batch["property_premium"], [1500.0, 300.0])
+        np.testing.assert_array_equal(batch["total_premium"], [4000.0, 800.0])
+
+    def test_batch_rejects_misaligned_columns(self):
+        with self.assertRaises(ValueError):
+            calculate_premiums_batch([1.0, 2.0], [0.1], [1000, 1000])
+
 
 if __name__ == '__main__':
     unittest.main()
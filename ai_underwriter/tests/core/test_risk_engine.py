@@ -1,8 +1,13 @@
 import unittest
 import logging
+import random
 from typing import Dict, Any, Optional # Added
-from app.models.data_models import RestaurantApplication
-from app.core.risk_engine import calculate_risk_score
+from app.models.data_models import RestaurantApplication, RiskFactorBreakdown
+import copy
+import json
+from app.core import risk_engine
+from app.core.risk_engine import calculate_risk_score, calculate_risk_scores_batch, set_risk_rules
+from app.core.rules import DEFAULT_RULES_PATH, RiskRules
 
 class TestRiskEngine(unittest.TestCase):
 
@@ -176,5 +181,117 @@ class TestRiskEngine(unittest.TestCase):
         self.assertLessEqual(score, 10.0)
 
 
+    def test_crime_location_not_found_scores_like_missing_crime_data(self):
+        app = self._create_base_application_data() # Base app score part: 4.5
+        health_input = {"latest_score": 90, "critical_violations_last_year": 0} # Health impact: 0
+        not_found = {"error": "Location not found", "crime_level_area": None, "safety_score": None,
+                     "source": "simulated_crime_api_not_found"}
+        missing = calculate_risk_score(app, health_data=health_input, crime_data=None)
+        for crime_input in (not_found, {"error": "Simulated data not loaded"}):
+            score, breakdown = calculate_risk_score(app, health_data=health_input, crime_data=crime_input,
+                                                    return_breakdown=True)
+            self.assertEqual(score, missing) # 4.5 + 0 + 0.25 missing penalty
+            self.assertEqual(breakdown.crime, 0.25)
+        self.assertEqual(list(calculate_risk_scores_batch([app], [health_input], [not_found])), [missing])
+
+class TestRiskEngineBatch(unittest.TestCase):
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def _random_application(self, rng: random.Random, index: int) -> RestaurantApplication:
+        return RestaurantApplication(
+            application_id=f"batch_{index}", business_name=f"Batch Cafe {index}", address=f"{index} Batch St",
+            cuisine_type=rng.choice(["Sushi", "ITALIAN", "Fast Food", "Greek", "food truck", "", None]),
+            alcohol_sales_percentage=rng.choice([0.0, 0.25, 0.3, 0.5, 0.51, 0.9]),
+            operating_hours="9am-5pm", square_footage=1000, building_age=5,
+            fire_suppression_system_type=rng.choice(["None", "sprinkler", "Ansul System", "Kitchen Hood", "Foam", "", None]),
+            years_in_business=rng.choice([None, 0, 1, 2, 10, 11, 30]),
+            management_experience_years=3, has_delivery_operations=False, has_catering_operations=False,
+            seating_capacity=40, annual_revenue=100000.0, health_inspection_score=90.0,
+            previous_claims_count=rng.choice([None, 0, 1, 2, 3, 8]))
+
+    def _random_health(self, rng: random.Random) -> Optional[Dict[str, Any]]:
+        return rng.choice([
+            None, {},
+            {"error": "Establishment not found", "latest_score": None, "critical_violations_last_year": None},
+            {"latest_score": rng.choice([50, 69.9, 70, 84, 85, 99]),
+             "critical_violations_last_year": rng.choice([0, 1, 3, 4, 2.0, None])},
+        ])
+
+    def _random_crime(self, rng: random.Random) -> Optional[Dict[str, Any]]:
+        return rng.choice([
+            None, {},
+            {"error": "Location not found", "crime_level_area": None, "safety_score": None},
+            {"crime_level_area": rng.choice(["High", "MEDIUM", "Low", "", None]),
+             "safety_score": rng.choice([3.9, 4.0, 6.99, 7.0, None])},
+        ])
+
+    def test_batch_matches_scalar(self):
+        rng = random.Random(42)
+        applications = [self._random_application(rng, i) for i in range(500)]
+        health = [self._random_health(rng) for _ in applications]
+        crime = [self._random_crime(rng) for _ in applications]
+
+        batch_scores = calculate_risk_scores_batch(applications, health, crime)
+
+        self.assertEqual(batch_scores.shape, (500,))
+        for i, app in enumerate(applications):
+            expected = calculate_risk_score(app, health_data=health[i], crime_data=crime[i])
+            self.assertEqual(batch_scores[i], expected, f"Mismatch at index {i}")
+
+    def test_batch_breakdown_matches_scalar_breakdown(self):
+        rng = random.Random(7)
+        applications = [self._random_application(rng, i) for i in range(200)]
+        health = [self._random_health(rng) for _ in applications]
+        crime = [self._random_crime(rng) for _ in applications]
+
+        scores, columns = calculate_risk_scores_batch(applications, health, crime, return_breakdown=True)
+
+        self.assertEqual(set(columns), {"base_score", *RiskFactorBreakdown.FACTORS})
+        for i, app in enumerate(applications):
+            score, breakdown = calculate_risk_score(app, health[i], crime[i], return_breakdown=True)
+            self.assertEqual(scores[i], score)
+            self.assertEqual({name: columns[name][i] for name in columns}, breakdown.to_dict(), f"Mismatch at index {i}")
+            self.assertEqual(score, max(1.0, min(breakdown.raw_score(), 10.0)))
+
+    def test_batch_without_external_data_applies_missing_penalties(self):
+        app = RestaurantApplication(
+            application_id="b", business_name="B", address="1 B St", cuisine_type="Italian",
+            alcohol_sales_percentage=0.1, operating_hours="9-5", square_footage=1500, building_age=5,
+            fire_suppression_system_type="Ansul", years_in_business=5, management_experience_years=5,
+            has_delivery_operations=False, has_catering_operations=False, seating_capacity=50,
+            annual_revenue=300000.0, health_inspection_score=90.0, previous_claims_count=0)
+        scores = calculate_risk_scores_batch([app, app])
+        self.assertEqual(list(scores), [5.25, 5.25])
+
+    def test_batch_empty_and_misaligned_inputs(self):
+        self.assertEqual(len(calculate_risk_scores_batch([])), 0)
+        with self.assertRaises(ValueError):
+            calculate_risk_scores_batch([], health_data=[None])
+
+    def test_swapped_rule_set_used_by_scalar_and_batch_paths(self):
+        with open(DEFAULT_RULES_PATH) as f:
+            definition = json.load(f)
+        changed = copy.deepcopy(definition)
+        changed["application"]["cuisine"]["equals"]["italian"] = 2.0
+        original = risk_engine.risk_rules
+        self.addCleanup(set_risk_rules, original)
+        set_risk_rules(RiskRules(changed))
+
+        app = RestaurantApplication(
+            application_id="r", business_name="R", address="1 R St", cuisine_type="Italian",
+            alcohol_sales_percentage=0.1, operating_hours="9-5", square_footage=1500, building_age=5,
+            fire_suppression_system_type="Ansul", years_in_business=5, management_experience_years=5,
+            has_delivery_operations=False, has_catering_operations=False, seating_capacity=50,
+            annual_revenue=300000.0, health_inspection_score=90.0, previous_claims_count=0)
+        self.assertAlmostEqual(calculate_risk_score(app), 5.25 - 0.5 + 2.0) # Italian now +2.0 instead of +0.5
+        self.assertEqual(calculate_risk_scores_batch([app])[0], calculate_risk_score(app))
+        self.assertNotEqual(risk_engine.risk_rules.fingerprint, original.fingerprint)
+
+
 if __name__ == '__main__':
     unittest.main()
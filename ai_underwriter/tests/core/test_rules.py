@@ -0,0 +1,97 @@
+import copy
+import json
+import math
+import os
+import tempfile
+import unittest
+import numpy as np
+from app.core.rules import BandRule, CategoricalRule, RiskRules, DEFAULT_RULES_PATH, load_risk_rules
+
+
+def default_definition():
+    with open(DEFAULT_RULES_PATH) as f:
+        return json.load(f)
+
+
+class TestBandRule(unittest.TestCase):
+
+    def test_boundaries_follow_each_condition(self):
+        rule = BandRule([("above", 10.0, -0.5), ("below", 2.0, 1.0)])
+        self.assertEqual([rule(value) for value in (1, 1.999, 2, 10, 10.001, 11)], [1.0, 1.0, 0.0, 0.0, -0.5, -0.5])
+        rule = BandRule([("at_most", 5.0, 1.0), ("at_least", 8.0, 2.0)])
+        self.assertEqual([rule(value) for value in (5, 5.0001, 7.999, 8)], [1.0, 0.0, 0.0, 2.0])
+
+    def test_first_matching_band_wins(self):
+        rule = BandRule([("above", 2.0, 1.5), ("at_least", 1.0, 0.5)])
+        self.assertEqual([rule(value) for value in (0, 1, 2, 3)], [0.0, 0.5, 0.5, 1.5])
+
+    def test_long_tables_and_missing_values(self):
+        rule = BandRule([("below", bound, float(bound)) for bound in (1.0, 2.0, 3.0, 4.0)], default=-1.0)
+        self.assertEqual([rule(value) for value in (0.5, 1.5, 3.5, 4)], [1.0, 2.0, 4.0, -1.0])
+        self.assertEqual(rule(None), -1.0)
+        self.assertEqual(rule(math.nan), -1.0)
+
+    def test_array_evaluation_matches_scalar(self):
+        for bands in ([("below", 70.0, 2.0), ("below", 85.0, 1.0)],
+                      [("above", 0.5, 1.5)],
+                      [("at_least", float(bound), float(bound)) for bound in range(5)]):
+            rule = BandRule(bands, default=0.25)
+            values = np.array([-1, 0, 0.5, 0.5000001, 3, 69.9, 70, 84.99, 85, 100, np.nan])
+            self.assertEqual(list(rule.evaluate_array(values)), [rule(value) for value in values])
+
+
+class TestCategoricalRule(unittest.TestCase):
+
+    def test_exact_then_contains_then_default(self):
+        rule = CategoricalRule({"None": 2.0, "sprinkler": -0.5}, [(["ansul", "kitchen hood"], -1.0)],
+                               default=0.0, missing=2.0)
+        self.assertEqual(rule("NONE"), 2.0)
+        self.assertEqual(rule("Sprinkler"), -0.5)
+        self.assertEqual(rule("Wet Kitchen Hood System"), -1.0)
+        self.assertEqual(rule("foam"), 0.0)
+        self.assertEqual(rule(""), 2.0)
+        self.assertEqual(rule(None), 2.0)
+
+    def test_missing_defaults_to_default(self):
+        self.assertEqual(CategoricalRule({"high": 1.5}, default=0.1)(None), 0.1)
+
+
+class TestRiskRules(unittest.TestCase):
+
+    def test_default_rules_load(self):
+        rules = load_risk_rules()
+        self.assertEqual(rules.base_score, 5.0)
+        self.assertEqual([factor for factor, _, _ in rules.application_rules],
+                         ['cuisine', 'alcohol', 'years_in_business', 'fire_suppression', 'previous_claims'])
+        self.assertEqual(rules.fingerprint, RiskRules(default_definition()).fingerprint)
+
+    def test_fingerprint_changes_with_content(self):
+        changed = default_definition()
+        changed["crime"]["missing"] = 0.3
+        self.assertNotEqual(RiskRules(changed).fingerprint, load_risk_rules().fingerprint)
+
+    def test_invalid_definitions_raise_value_error(self):
+        unknown_field = default_definition()
+        unknown_field["application"]["alcohol"]["field"] = "alcohol_share"
+        missing_factor = default_definition()
+        del missing_factor["application"]["cuisine"]
+        bad_band = default_definition()
+        bad_band["health"]["latest_score"]["bands"][0] = {"below": 70, "above": 90, "value": 1.0}
+        wrong_type = default_definition()
+        wrong_type["crime"]["safety_score"] = copy.deepcopy(wrong_type["crime"]["crime_level_area"])
+        missing_key = default_definition()
+        del missing_key["base_score"]
+        for definition in (unknown_field, missing_factor, bad_band, wrong_type, missing_key):
+            with self.assertRaises(ValueError):
+                RiskRules(definition)
+
+    def test_load_rejects_malformed_file(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as f:
+            f.write('{"base_score": ')
+        self.addCleanup(os.remove, f.name)
+        with self.assertRaises(ValueError):
+            load_risk_rules(f.name)
+
+
+if __name__ == '__main__':
+    unittest.main()
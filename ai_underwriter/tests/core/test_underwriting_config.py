@@ -0,0 +1,121 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+import unittest
+from app.core.decision_engine import make_decision
+from app.core.premium_calculator import calculate_premium, calculate_premiums_batch
+from app.core.underwriting_config import (UnderwritingConfig, current_config, load_underwriting_config,
+                                          reload_underwriting_config, set_underwriting_config)
+from app.models.data_models import RestaurantApplication
+from app.utils.file_watcher import FileWatcher
+
+SETTINGS = {"approve_threshold": 3.5, "refer_threshold": 6.5,
+            "base_general_liability_rate": 500.0, "base_property_rate": 300.0}
+
+
+class TestUnderwritingConfig(unittest.TestCase):
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.previous = current_config()
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "underwriting_config.json")
+
+    def tearDown(self):
+        set_underwriting_config(self.previous)
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        os.rmdir(self.temp_dir)
+        logging.disable(logging.NOTSET)
+
+    def write(self, data):
+        with open(self.path, 'w') as f:
+            f.write(data if isinstance(data, str) else json.dumps(data))
+
+    def test_default_config_matches_built_in_values(self):
+        config = load_underwriting_config()
+        self.assertEqual(config.to_dict(), {"version": "1", **SETTINGS})
+
+    def test_version_defaults_to_fingerprint_of_settings(self):
+        config = UnderwritingConfig(**SETTINGS)
+        self.assertEqual(config.version, config.fingerprint)
+        self.assertEqual(UnderwritingConfig(**SETTINGS, version="2").fingerprint, config.fingerprint)
+        self.assertNotEqual(UnderwritingConfig(**{**SETTINGS, "base_property_rate": 310.0}).fingerprint,
+                            config.fingerprint)
+
+    def test_invalid_configs_raise_value_error(self):
+        for data in ({**SETTINGS, "approve_threshold": 7.0}, {**SETTINGS, "base_property_rate": 0},
+                     {"approve_threshold": 3.5}, {**SETTINGS, "decline_threshold": 9.0},
+                     {**SETTINGS, "refer_threshold": "high"}, [SETTINGS]):
+            with self.assertRaises(ValueError):
+                UnderwritingConfig.from_dict(data)
+        self.write('{"approve_threshold": ')
+        with self.assertRaises(ValueError):
+            load_underwriting_config(self.path)
+
+    def test_engines_use_the_config_in_effect_or_the_one_given(self):
+        application = RestaurantApplication(
+            application_id="c", business_name="C", address="1 C St", cuisine_type="Cafe",
+            alcohol_sales_percentage=0.0, operating_hours="7-3", square_footage=1000, building_age=3,
+            fire_suppression_system_type="Sprinkler", years_in_business=3, management_experience_years=3,
+            has_delivery_operations=False, has_catering_operations=False, seating_capacity=20,
+            annual_revenue=100000.0, health_inspection_score=95.0, previous_claims_count=0)
+        doubled = UnderwritingConfig(approve_threshold=2.0, refer_threshold=4.0,
+                                     base_general_liability_rate=1000.0, base_property_rate=600.0, version="doubled")
+        self.assertEqual(make_decision(3.0), "Approved")
+        self.assertEqual(make_decision(3.0, doubled), "Refer to manual underwriter")
+        self.assertEqual(calculate_premium(application, 2.0)["total_premium"], 1600.0)
+        self.assertEqual(calculate_premium(application, 2.0, doubled)["total_premium"], 3200.0)
+
+        set_underwriting_config(doubled)
+        self.assertEqual(make_decision(3.0), "Refer to manual underwriter")
+        self.assertEqual(list(calculate_premiums_batch([2.0], [0.0], [1000.0])["total_premium"]), [3200.0])
+
+    def test_reload_swaps_config_and_keeps_it_on_bad_file(self):
+        self.write({**SETTINGS, "approve_threshold": 3.0, "version": "2026-10"})
+        self.assertTrue(reload_underwriting_config(self.path))
+        self.assertEqual(current_config().version, "2026-10")
+        self.assertEqual(current_config().approve_threshold, 3.0)
+
+        self.write({**SETTINGS, "approve_threshold": 9.0, "version": "broken"})
+        self.assertFalse(reload_underwriting_config(self.path))
+        self.assertEqual(current_config().version, "2026-10")
+        self.assertFalse(reload_underwriting_config(os.path.join(self.temp_dir, "missing.json")))
+
+    def test_file_watcher_picks_up_edits(self):
+        self.write({**SETTINGS, "version": "a"})
+        watcher = FileWatcher(self.path, reload_underwriting_config, signature=None)
+        self.write({**SETTINGS, "refer_threshold": 7.0, "version": "b"})
+        os.utime(self.path, ns=(2_000_000_000, 2_000_000_000))
+        self.assertTrue(watcher.check())
+        self.assertEqual(current_config().version, "b")
+        self.assertEqual(current_config().refer_threshold, 7.0)
+
+    def test_readers_never_see_a_mix_of_two_configs(self):
+        configs = [UnderwritingConfig(approve_threshold=float(i), refer_threshold=float(i) + 1,
+                                      base_general_liability_rate=100.0 + i, base_property_rate=50.0 + i,
+                                      version=str(i)) for i in range(1, 4)]
+        stop = threading.Event()
+        mixed = []
+
+        def read():
+            while not stop.is_set():
+                config = current_config()
+                if config.refer_threshold - config.approve_threshold != 1 and config is not self.previous:
+                    mixed.append(config)
+
+        readers = [threading.Thread(target=read) for _ in range(4)]
+        for reader in readers:
+            reader.start()
+        for i in range(2000):
+            set_underwriting_config(configs[i % len(configs)])
+        stop.set()
+        for reader in readers:
+            reader.join()
+        self.assertEqual(mixed, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+from app.models.data_models import RestaurantApplication, RiskAssessmentOutput, RiskFactorBreakdown
+
+APPLICATION_DATA = {
+    "application_id": "model_test", "business_name": "Model Cafe", "address": "1 Model Rd",
+    "cuisine_type": "Cafe", "alcohol_sales_percentage": 0.1, "operating_hours": "7am-3pm",
+    "square_footage": 900, "building_age": 4, "fire_suppression_system_type": "Sprinkler",
+    "years_in_business": 3, "management_experience_years": 6, "has_delivery_operations": False,
+    "has_catering_operations": True, "seating_capacity": 30, "annual_revenue": 250000.0,
+    "health_inspection_score": 93.0, "previous_claims_count": 0
+}
+
+class TestRestaurantApplication(unittest.TestCase):
+
+    def test_slotted_without_instance_dict(self):
+        app = RestaurantApplication(**APPLICATION_DATA)
+        self.assertFalse(hasattr(app, "__dict__"))
+        with self.assertRaises(AttributeError):
+            app.unexpected_attribute = 1
+
+    def test_to_dict_returns_copy(self):
+        app = RestaurantApplication(**APPLICATION_DATA)
+        data = app.to_dict()
+        self.assertEqual(data, APPLICATION_DATA)
+        self.assertEqual(list(data), list(RestaurantApplication.FIELDS))
+        data["business_name"] = "Changed"
+        self.assertEqual(app.business_name, "Model Cafe")
+        self.assertIsNot(app.to_dict(), app.to_dict())
+
+    def test_from_dict_round_trip(self):
+        app = RestaurantApplication.from_dict(APPLICATION_DATA)
+        self.assertEqual(app.to_dict(), APPLICATION_DATA)
+        with self.assertRaises(TypeError):
+            RestaurantApplication.from_dict({**APPLICATION_DATA, "unknown_field": 1})
+
+    def test_content_hash_ignores_application_id_and_number_types(self):
+        app = RestaurantApplication(**APPLICATION_DATA)
+        same = RestaurantApplication(**dict(APPLICATION_DATA, application_id="other", square_footage=900.0))
+        different = RestaurantApplication(**dict(APPLICATION_DATA, seating_capacity=31))
+        self.assertEqual(app.content_hash(), same.content_hash())
+        self.assertNotEqual(app.content_hash(), different.content_hash())
+
+class TestRiskAssessmentOutput(unittest.TestCase):
+
+    def _output(self, **overrides):
+        data = dict(application_id="model_test", risk_score=4.0, confidence_level=0.7, decision="Refer to manual underwriter",
+                    recommended_premium=3000.0, premium_breakdown={"general_liability": 2000.0, "property": 1000.0},
+                    risk_mitigation_recommendations=["Review safety protocols."], required_documentation=["License"],
+                    explanation_factors=["Calculated risk score: 4.00"])
+        data.update(overrides)
+        return RiskAssessmentOutput(**data)
+
+    def test_to_dict_copies_nested_containers(self):
+        output = self._output(health_inspection_summary={"latest_score": 90})
+        data = output.to_dict()
+        data["premium_breakdown"]["property"] = 0.0
+        data["explanation_factors"].append("extra")
+        data["health_inspection_summary"]["latest_score"] = 10
+        self.assertEqual(output.premium_breakdown["property"], 1000.0)
+        self.assertEqual(output.explanation_factors, ["Calculated risk score: 4.00"])
+        self.assertEqual(output.health_inspection_summary["latest_score"], 90)
+
+    def test_optional_summaries_omitted_and_round_trip(self):
+        output = self._output()
+        data = output.to_dict()
+        self.assertNotIn("health_inspection_summary", data)
+        self.assertNotIn("crime_statistics_summary", data)
+        self.assertNotIn("config_version", data)
+        self.assertEqual(RiskAssessmentOutput.from_dict(data).to_dict(), data)
+        self.assertFalse(hasattr(output, "__dict__"))
+
+    def test_config_version_round_trip(self):
+        data = self._output(config_version="2026-10").to_dict()
+        self.assertEqual(data["config_version"], "2026-10")
+        self.assertEqual(RiskAssessmentOutput.from_dict(data).config_version, "2026-10")
+
+    def test_explanations_rendered_from_factor_breakdown(self):
+        breakdown = RiskFactorBreakdown(base_score=5.0, cuisine=-0.5, alcohol=0.0, years_in_business=1.0,
+                                        fire_suppression=0.0, previous_claims=0.0, health=0.5, crime=0.25)
+        output = self._output(explanation_factors=None, factor_breakdown=breakdown,
+                              crime_statistics_summary={"error": "Timeout"})
+        self.assertEqual(output.explanation_factors, [
+            "Calculated risk score: 4.00", "Decision based on risk score: Refer to manual underwriter",
+            "Cuisine type: -0.50", "Years in business: +1.00", "Health inspection data: +0.50",
+            "Area crime data: +0.25", "Crime data error: Timeout"])
+        self.assertEqual(breakdown.raw_score(), 6.25)
+
+        compact = output.to_dict(render_explanations=False)
+        self.assertNotIn("explanation_factors", compact)
+        self.assertEqual(compact["factor_breakdown"]["cuisine"], -0.5)
+        self.assertEqual(RiskAssessmentOutput.from_dict(compact).to_dict(), output.to_dict())
+
+    def test_explicit_explanations_are_kept(self):
+        output = self._output()
+        self.assertIn("explanation_factors", output.to_dict(render_explanations=False))
+        self.assertNotIn("factor_breakdown", output.to_dict())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import unittest
+import os
+import tempfile
+import threading
+import sqlite3
+from app.storage import InMemoryApplicationStore, SQLiteApplicationStore, create_store
+
+class _StoreContract:
+    """Behaviour every ApplicationStore backend must provide."""
+
+    def make_store(self):
+        raise NotImplementedError
+
+    def setUp(self):
+        self.store = self.make_store()
+
+    def test_application_round_trip_and_delete(self):
+        self.assertIsNone(self.store.get_application("missing"))
+        self.store.save_application("a1", {"business_name": "Cafe", "square_footage": 1000})
+        self.assertEqual(self.store.get_application("a1"), {"business_name": "Cafe", "square_footage": 1000})
+        self.store.delete_application("a1")
+        self.assertIsNone(self.store.get_application("a1"))
+
+    def test_assessment_and_status(self):
+        self.store.save_assessment("a1", {"application_id": "a1", "risk_score": 4.2, "decision": "Refer to manual underwriter"})
+        self.assertEqual(self.store.get_assessment("a1")["risk_score"], 4.2)
+        self.store.set_status("a1", {"status": "pending"})
+        self.store.set_status("a1", {"status": "failed", "error": "boom"})
+        self.assertEqual(self.store.get_status("a1"), {"status": "failed", "error": "boom"})
+        self.store.delete_status("a1")
+        self.assertIsNone(self.store.get_status("a1"))
+
+    def test_batch_writes_are_visible_after_block(self):
+        with self.store.batch():
+            for i in range(10):
+                self.store.save_application(f"b{i}", {"i": i})
+        self.assertEqual(self.store.get_application("b9"), {"i": 9})
+
+
+class TestInMemoryApplicationStore(_StoreContract, unittest.TestCase):
+
+    def make_store(self):
+        self.applications = {}
+        return InMemoryApplicationStore(applications=self.applications)
+
+    def test_uses_supplied_dicts(self):
+        self.store.save_application("x", {"v": 1})
+        self.assertEqual(self.applications, {"x": {"v": 1}})
+
+
+class TestSQLiteApplicationStore(_StoreContract, unittest.TestCase):
+
+    def make_store(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmp.name, "store.db")
+        return SQLiteApplicationStore(self.path)
+
+    def tearDown(self):
+        self.store.close()
+        self._tmp.cleanup()
+
+    def test_wal_mode_and_indexes(self):
+        connection = sqlite3.connect(self.path)
+        self.assertEqual(connection.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        indexes = {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        self.assertTrue({"idx_assessments_decision", "idx_assessments_risk_score"} <= indexes)
+        connection.close()
+
+    def test_data_shared_between_store_instances(self):
+        # A second store on the same file stands in for another worker process.
+        other = SQLiteApplicationStore(self.path)
+        self.store.save_assessment("shared", {"decision": "Approved", "risk_score": 2.0})
+        self.assertEqual(other.get_assessment("shared")["decision"], "Approved")
+        other.close()
+
+    def test_failed_batch_rolls_back(self):
+        with self.assertRaises(RuntimeError):
+            with self.store.batch():
+                self.store.save_application("rolled_back", {"v": 1})
+                raise RuntimeError("abort")
+        self.assertIsNone(self.store.get_application("rolled_back"))
+
+    def test_concurrent_writers(self):
+        def write(prefix):
+            for i in range(25):
+                self.store.save_application(f"{prefix}{i}", {"i": i})
+
+        threads = [threading.Thread(target=write, args=(f"t{n}_",)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        count = sqlite3.connect(self.path).execute("SELECT COUNT(*) FROM applications").fetchone()[0]
+        self.assertEqual(count, 100)
+
+
+class TestCreateStore(unittest.TestCase):
+
+    def test_urls(self):
+        self.assertIsInstance(create_store(None), InMemoryApplicationStore)
+        self.assertIsInstance(create_store("memory"), InMemoryApplicationStore)
+        with tempfile.TemporaryDirectory() as tmp:
+            store = create_store(f"sqlite:///{os.path.join(tmp, 's.db')}")
+            self.assertIsInstance(store, SQLiteApplicationStore)
+            store.close()
+        with self.assertRaises(ValueError):
+            create_store("postgres://nope")
+
+if __name__ == '__main__':
+    unittest.main()
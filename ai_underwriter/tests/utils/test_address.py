@@ -0,0 +1,56 @@
+import unittest
+from app.utils.address import ParsedAddress, address_match_text, normalize_address_text, parse_address
+
+
+class TestAddressParsing(unittest.TestCase):
+
+    def test_normalize_address_text(self):
+        self.assertEqual(normalize_address_text("  303 Normal  Street. "), "303 normal st")
+        self.assertEqual(normalize_address_text("12 North Oak Avenue"), "12 n oak ave")
+        self.assertEqual(normalize_address_text(""), "")
+
+    def test_match_text_only_matches_whole_tokens(self):
+        self.assertEqual(address_match_text("12 North St."), " 12 n st ")
+        self.assertIn(address_match_text("12 N St"), address_match_text("Unit 4, 12 North Street, Midburg"))
+        self.assertNotIn(address_match_text("12 N St"), address_match_text("12 North Star Rd")) # "12 n st" prefixes "12 n star"
+        self.assertNotIn(address_match_text("2 Oak Ave"), address_match_text("12 Oak Avenue"))
+        self.assertEqual(address_match_text(""), "")
+
+    def test_full_address(self):
+        self.assertEqual(parse_address("101 Danger Path, Badtown, FS 54321"),
+                         ParsedAddress("101 danger path", "badtown", "FS", "54321"))
+
+    def test_street_only_has_no_components(self):
+        parsed = parse_address("789 Test Lane")
+        self.assertEqual(parsed, ParsedAddress("789 test ln"))
+        self.assertEqual((parsed.city, parsed.state, parsed.zip_code), (None, None, None))
+
+    def test_state_and_zip_variants(self):
+        self.assertEqual(parse_address("5 Elm Rd, Salt Lake City, UT 84101-1234"),
+                         ParsedAddress("5 elm rd", "salt lake city", "UT", "84101"))
+        self.assertEqual(parse_address("1 Main St, Boston, MA, 02110"), ParsedAddress("1 main st", "boston", "MA", "02110"))
+        self.assertEqual(parse_address("1 Main St, Springfield IL 62701"), ParsedAddress("1 main st", "springfield", "IL", "62701"))
+        self.assertEqual(parse_address("1 Main St, Austin, TX"), ParsedAddress("1 main st", "austin", "TX"))
+        self.assertEqual(parse_address("1 Main St, 84101"), ParsedAddress("1 main st", zip_code="84101"))
+
+    def test_leading_unit_is_separated(self):
+        parsed = parse_address("Unit A, 999 Danger Ave, Risky City")
+        self.assertEqual(parsed.street, "999 danger ave")
+        self.assertEqual(parsed.city, "risky city")
+        self.assertEqual(parsed.unit, "unit a")
+
+    def test_canonical_key_ignores_spelling(self):
+        self.assertEqual(parse_address("303 Normal Street, Midburg, FS 67890").key,
+                         parse_address("303 normal st.,  MIDBURG, fs 67890").key)
+        self.assertEqual(parse_address("789 Test Lane").key, "789 test ln|||")
+
+    def test_parse_is_memoized(self):
+        address = "42 Memo Blvd, Cachetown, CA 90001"
+        first = parse_address(address)
+        hits = parse_address.cache_info().hits
+        self.assertIs(parse_address(address), first)
+        self.assertEqual(parse_address.cache_info().hits, hits + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
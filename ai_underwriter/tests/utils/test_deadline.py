@@ -0,0 +1,25 @@
+import unittest
+from app.utils.deadline import Deadline, current_deadline, deadline_scope
+
+
+class TestDeadline(unittest.TestCase):
+
+    def test_remaining_and_cap(self):
+        now = [100.0]
+        deadline = Deadline(2.0, clock=lambda: now[0])
+        self.assertEqual(deadline.cap(5.0), 2.0)
+        self.assertEqual(deadline.cap(1.0), 1.0)
+        now[0] = 103.0
+        self.assertEqual(deadline.remaining(), 0.0)
+        self.assertTrue(deadline.expired())
+
+    def test_scope_sets_and_restores_current_deadline(self):
+        deadline = Deadline(1.0)
+        self.assertIsNone(current_deadline())
+        with deadline_scope(deadline):
+            self.assertIs(current_deadline(), deadline)
+        self.assertIsNone(current_deadline())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+import logging
+import os
+import tempfile
+import threading
+from app.utils.file_watcher import FileWatcher, file_signature
+
+class TestFileWatcher(unittest.TestCase):
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        handle, self.path = tempfile.mkstemp()
+        os.close(handle)
+        self._write("v1")
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def _write(self, content: str, mtime_ns: int = 1_000_000_000) -> None:
+        with open(self.path, "w") as f:
+            f.write(content)
+        # Explicit mtimes so changes are detected regardless of filesystem timestamp resolution.
+        os.utime(self.path, ns=(mtime_ns, mtime_ns))
+
+    def test_change_detected_once(self):
+        seen = []
+        watcher = FileWatcher(self.path, lambda path: seen.append(path) or True)
+        self.assertFalse(watcher.check())
+        self._write("v2", mtime_ns=2_000_000_000)
+        self.assertTrue(watcher.check())
+        self.assertFalse(watcher.check())
+        self.assertEqual(seen, [self.path])
+
+    def test_same_mtime_different_size_detected(self):
+        watcher = FileWatcher(self.path, lambda path: True)
+        self._write("longer content")
+        self.assertTrue(watcher.check())
+
+    def test_unhandled_change_is_retried(self):
+        results = [False, RuntimeError("boom"), True]
+        def on_change(path):
+            result = results.pop(0)
+            if isinstance(result, Exception):
+                raise result
+            return result
+        watcher = FileWatcher(self.path, on_change)
+        self._write("v2", mtime_ns=2_000_000_000)
+        self.assertFalse(watcher.check())
+        self.assertFalse(watcher.check())
+        self.assertTrue(watcher.check())
+        self.assertFalse(watcher.check())
+
+    def test_missing_file_ignored(self):
+        watcher = FileWatcher(self.path, lambda path: self.fail("should not be called"))
+        os.remove(self.path)
+        self.assertIsNone(file_signature(self.path))
+        self.assertFalse(watcher.check())
+
+    def test_background_thread_calls_on_change(self):
+        changed = threading.Event()
+        watcher = FileWatcher(self.path, lambda path: changed.set() or True, interval=0.01)
+        watcher.start()
+        try:
+            self._write("v2", mtime_ns=2_000_000_000)
+            self.assertTrue(changed.wait(2.0))
+        finally:
+            watcher.stop(timeout=1.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+import io
+import json
+from app.utils.json_stream import iter_json_records
+
+def _parse(text, chunk_size=7, **kwargs):
+    return list(iter_json_records(io.BytesIO(text.encode("utf-8")), chunk_size=chunk_size, **kwargs))
+
+class TestIterJsonRecords(unittest.TestCase):
+
+    def test_ndjson(self):
+        text = '{"a": 1}\n\n{"b": "x\\ny"}\r\n{"c": [1, 2]}'
+        self.assertEqual(_parse(text), [(0, {"a": 1}, None), (1, {"b": "x\ny"}, None), (2, {"c": [1, 2]}, None)])
+
+    def test_ndjson_invalid_line_does_not_stop_stream(self):
+        records = _parse('{"a": 1}\n{oops\n{"b": 2}\n')
+        self.assertEqual(records[0], (0, {"a": 1}, None))
+        self.assertIsNone(records[1][1])
+        self.assertIn("Invalid JSON", records[1][2])
+        self.assertEqual(records[2], (2, {"b": 2}, None))
+
+    def test_json_array_across_chunk_boundaries(self):
+        values = [{"name": "café %d" % i, "n": 12345.678 + i, "nested": {"k": [i, None, True]}} for i in range(20)]
+        text = "  \n" + json.dumps(values, indent=1, ensure_ascii=False)
+        for chunk_size in (1, 3, 16, 4096):
+            records = _parse(text, chunk_size=chunk_size)
+            self.assertEqual([value for _, value, _ in records], values)
+            self.assertTrue(all(error is None for _, _, error in records))
+
+    def test_json_array_bare_numbers(self):
+        self.assertEqual([v for _, v, _ in _parse("[1234567, 89]", chunk_size=2)], [1234567, 89])
+
+    def test_empty_inputs(self):
+        self.assertEqual(_parse(""), [])
+        self.assertEqual(_parse("   []  "), [])
+
+    def test_json_array_malformed_element_stops_stream(self):
+        records = _parse('[{"a": 1}, {"b": }, {"c": 3}]')
+        self.assertEqual(records[0], (0, {"a": 1}, None))
+        self.assertEqual(len(records), 2)
+        self.assertIn("Invalid JSON", records[1][2])
+
+    def test_json_array_truncated(self):
+        records = _parse('[{"a": 1},')
+        self.assertEqual(records[-1][2], "Unexpected end of JSON array")
+
+    def test_oversized_records_are_rejected(self):
+        big = json.dumps({"blob": "x" * 200})
+        records = _parse('{"a": 1}\n' + big + '\n{"b": 2}\n', max_record_chars=50)
+        self.assertEqual([(i, v) for i, v, _ in records], [(0, {"a": 1}), (1, None), (2, {"b": 2})])
+        self.assertIn("exceeds", records[1][2])
+
+        records = _parse('[' + big + ']', max_record_chars=50)
+        self.assertEqual(len(records), 1)
+        self.assertIn("exceeds", records[0][2])
+
+if __name__ == '__main__':
+    unittest.main()
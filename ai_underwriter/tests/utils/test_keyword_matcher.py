@@ -0,0 +1,55 @@
+import unittest
+import random
+from app.utils.keyword_matcher import FlatKeywordMatcher, KeywordMatcher
+
+class TestKeywordMatcher(unittest.TestCase):
+
+    def test_no_keywords(self):
+        matcher = KeywordMatcher()
+        self.assertIsNone(matcher.best_match("101 danger path"))
+        self.assertEqual(len(matcher), 0)
+
+    def test_lowest_priority_wins(self):
+        matcher = KeywordMatcher([("danger path", 3), ("101", 1), ("path", 2)])
+        self.assertEqual(matcher.best_match("101 danger path"), 1)
+        self.assertEqual(matcher.best_match("9 danger path"), 2)
+        self.assertIsNone(matcher.best_match("202 sparkle ave"))
+
+    def test_overlapping_keywords_found_via_fail_links(self):
+        # "she" ends inside "ushers" and "he"/"hers" overlap it.
+        matcher = KeywordMatcher([("hers", 4), ("his", 3), ("she", 2), ("he", 5)])
+        self.assertEqual(matcher.best_match("ushers"), 2)
+        self.assertEqual(matcher.best_match("xhe"), 5)
+
+    def test_empty_keyword_matches_everything(self):
+        matcher = KeywordMatcher([("abc", 0), ("", 7)])
+        self.assertEqual(matcher.best_match("zzz"), 7)
+        self.assertEqual(matcher.best_match(""), 7)
+        self.assertEqual(matcher.best_match("xabcx"), 0)
+
+    def test_matches_brute_force_substring_scan(self):
+        rng = random.Random(1234)
+        alphabet = "ab c"
+        for _ in range(200):
+            keywords = [("".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))), rng.randint(0, 20))
+                        for _ in range(rng.randint(1, 8))]
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 15)))
+            expected = min((p for kw, p in keywords if kw in text), default=None)
+            self.assertEqual(KeywordMatcher(keywords).best_match(text), expected, (keywords, text))
+
+    def test_flat_tables_match_original(self):
+        rng = random.Random(99)
+        alphabet = "ab cé"
+        for _ in range(200):
+            keywords = [("".join(rng.choice(alphabet) for _ in range(rng.randint(0, 4))), rng.randint(0, 20))
+                        for _ in range(rng.randint(0, 8))]
+            matcher = KeywordMatcher(keywords)
+            flat = FlatKeywordMatcher(**matcher.tables())
+            self.assertEqual(len(flat), len(matcher))
+            self.assertEqual(flat.tables(), matcher.tables())
+            for _ in range(5):
+                text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 15)))
+                self.assertEqual(flat.best_match(text), matcher.best_match(text), (keywords, text))
+
+if __name__ == '__main__':
+    unittest.main()
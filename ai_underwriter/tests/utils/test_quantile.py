@@ -0,0 +1,47 @@
+import math
+import random
+import unittest
+from app.utils.quantile import P2Quantile
+
+
+def exact_quantile(values, quantile):
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(quantile * len(ordered)) - 1)]
+
+
+class TestP2Quantile(unittest.TestCase):
+
+    def test_rejects_quantile_outside_zero_one(self):
+        for quantile in (0.0, 1.0, -0.5, 1.5):
+            with self.assertRaises(ValueError):
+                P2Quantile(quantile)
+
+    def test_empty_estimator_is_nan(self):
+        self.assertTrue(math.isnan(P2Quantile(0.5).value()))
+
+    def test_first_observations_are_exact(self):
+        estimator = P2Quantile(0.5)
+        for value in (5.0, 1.0, 3.0):
+            estimator.add(value)
+        self.assertEqual(estimator.value(), 3.0)
+        self.assertEqual(estimator.count, 3)
+
+    def test_tracks_quantiles_of_a_stream(self):
+        rng = random.Random(7)
+        values = [rng.expovariate(10.0) for _ in range(20000)]
+        for quantile in (0.5, 0.9, 0.95, 0.99):
+            estimator = P2Quantile(quantile)
+            for value in values:
+                estimator.add(value)
+            expected = exact_quantile(values, quantile)
+            self.assertAlmostEqual(estimator.value(), expected, delta=expected * 0.05)
+
+    def test_handles_sorted_input(self):
+        estimator = P2Quantile(0.9)
+        for value in range(1, 1001):
+            estimator.add(float(value))
+        self.assertAlmostEqual(estimator.value(), 900.0, delta=10.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
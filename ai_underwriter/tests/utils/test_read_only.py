@@ -0,0 +1,41 @@
+import copy
+import json
+import pickle
+import unittest
+from app.utils.read_only import ReadOnlyDict
+
+
+class TestReadOnlyDict(unittest.TestCase):
+
+    def setUp(self):
+        self.value = ReadOnlyDict({"score": 90, "grade": "A"})
+
+    def test_behaves_like_dict(self):
+        self.assertIsInstance(self.value, dict)
+        self.assertEqual(self.value, {"score": 90, "grade": "A"})
+        self.assertEqual(self.value.get("score"), 90)
+        self.assertEqual(json.loads(json.dumps(self.value)), {"score": 90, "grade": "A"})
+
+    def test_mutation_raises(self):
+        mutations = [
+            lambda d: d.__setitem__("score", 1), lambda d: d.__delitem__("score"), lambda d: d.update(score=1),
+            lambda d: d.pop("score"), lambda d: d.popitem(), lambda d: d.clear(), lambda d: d.setdefault("new", 1),
+        ]
+        for mutate in mutations:
+            with self.assertRaises(TypeError):
+                mutate(self.value)
+        with self.assertRaises(TypeError):
+            self.value |= {"score": 1}
+        self.assertEqual(self.value, {"score": 90, "grade": "A"})
+
+    def test_copies(self):
+        modifiable = dict(self.value)
+        modifiable["score"] = 1
+        self.assertEqual(self.value["score"], 90)
+        for clone in (copy.copy(self.value), copy.deepcopy(self.value), pickle.loads(pickle.dumps(self.value))):
+            self.assertIsInstance(clone, ReadOnlyDict)
+            self.assertEqual(clone, self.value)
+
+
+if __name__ == '__main__':
+    unittest.main()
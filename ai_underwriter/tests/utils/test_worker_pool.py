@@ -0,0 +1,41 @@
+import unittest
+import logging
+import threading
+from app.utils.worker_pool import BoundedWorkerPool
+
+class TestBoundedWorkerPool(unittest.TestCase):
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def test_rejects_when_backlog_full_and_recovers(self):
+        pool = BoundedWorkerPool(max_workers=1, max_queue=1)
+        release = threading.Event()
+        self.assertTrue(pool.submit(release.wait, 2.0)) # Running
+        self.assertTrue(pool.submit(release.wait, 2.0)) # Queued
+        self.assertFalse(pool.submit(release.wait, 2.0)) # Rejected
+
+        release.set()
+        pool.shutdown(wait=True)
+        pool = BoundedWorkerPool(max_workers=1, max_queue=0)
+        done = threading.Event()
+        self.assertTrue(pool.submit(done.set))
+        self.assertTrue(done.wait(1.0))
+        pool.shutdown(wait=True)
+        self.assertTrue(pool._slots.acquire(blocking=False)) # Slot released after completion
+
+    def test_failing_task_releases_slot(self):
+        pool = BoundedWorkerPool(max_workers=1, max_queue=0)
+
+        def broken():
+            raise RuntimeError("boom")
+
+        self.assertTrue(pool.submit(broken))
+        pool.shutdown(wait=True)
+        self.assertTrue(pool._slots.acquire(blocking=False))
+
+if __name__ == '__main__':
+    unittest.main()